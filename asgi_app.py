@@ -0,0 +1,259 @@
+"""
+This module provides an asynchronous (ASGI) way of serving the Covid Data Dashboard, serving the
+same / and /index pages, /api/ resources, /events stream and /metrics as the Flask app in main.
+Pages are served from the in memory snapshot held by dashboard_snapshot, and any work a request
+causes which may block, such as scheduling updates, deleting articles or reading static files, is
+run in a worker thread such that one slow request never holds up the others. It can be run by any
+ASGI server, e.g. uvicorn asgi_app:app
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    static_folder (str): The folder from which static files are served
+"""
+
+import asyncio
+import logging
+import mimetypes
+import os
+import time
+from urllib.parse import parse_qs
+import main
+from dashboard_api import get_resource, etag_matches
+from dashboard_events import add_listener, remove_listener, changed_events
+from dashboard_metrics import observe, render_metrics
+from dashboard_snapshot import get_snapshot, render_snapshot
+
+logger = logging.getLogger(__name__)
+static_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+
+def render_in_app_context(current_snapshot, updates: list) -> str:
+    """
+    A function that renders the dashboard template outside of a Flask request by entering the Flask
+    app's context. The page always listens for pushed changes, as streams served by this app hold no
+    thread.
+
+    Args:
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+
+    Returns:
+        page (str): The rendered dashboard
+    """
+    with main.app.app_context():
+        return main.render_dashboard(current_snapshot, updates, push_updates=True)
+
+
+def render_current_dashboard() -> str:
+    """
+    A function that renders the dashboard from the current snapshot and scheduled updates, building
+    the snapshot first should the data have changed.
+
+    Args:
+        None
+
+    Returns:
+        page (str): The rendered dashboard
+    """
+    toasts, toasts_version = main.updates.toasts()
+    return render_snapshot(get_snapshot(), toasts, render_in_app_context, toasts_version)
+
+
+def read_static_file(path: str) -> bytes:
+    """
+    A function that reads a static file, refusing any path outside of the static folder.
+
+    Args:
+        path (str): The path of the file within the static folder
+
+    Returns:
+        content (bytes): The content of the file, None should it not exist
+    """
+    full_path = os.path.realpath(os.path.join(static_folder, path))
+    if not full_path.startswith(static_folder + os.sep) or not os.path.isfile(full_path):
+        return None
+    with open(full_path, "rb") as static_file:
+        return static_file.read()
+
+
+async def send_response(send, status: int, body: bytes, content_type: str,
+                        headers: list = ()) -> None:
+    """
+    A function that sends a complete response through an ASGI send channel.
+
+    Args:
+        send (function): The ASGI send channel
+        status (int): The HTTP status code
+        body (bytes): The body of the response
+        content_type (str): The media type of the body
+        headers (list): Any further headers as pairs of bytes
+
+    Returns:
+        None
+    """
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type.encode()),
+                            (b"content-length", str(len(body)).encode()), *headers]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def serve_dashboard(query_string: bytes) -> bytes:
+    """
+    A function that serves the dashboard page, processing any URL arguments, picking up any
+    changes made by other worker processes and rendering the page in a worker thread, such that
+    reading the cache and rendering the template never hold up other connections.
+
+    Args:
+        query_string (bytes): The URL arguments of the request
+
+    Returns:
+        page (bytes): The rendered dashboard
+    """
+    start = time.perf_counter()
+    args = {name: values[-1] for name, values in parse_qs(query_string.decode()).items()}
+    if main.sync_due():
+        await asyncio.to_thread(main.sync_shared_state)
+    if args:
+        await asyncio.to_thread(main.handle_dashboard_request, args)
+    page = await asyncio.to_thread(render_current_dashboard)
+    observe("dashboard_request_seconds", time.perf_counter() - start)
+    return page.encode()
+
+
+async def serve_resource(send, name: str, if_none_match: str) -> None:
+    """
+    A function that serves one of the dashboard's JSON resources, answering with 304 Not Modified
+    should the client already hold its current version.
+
+    Args:
+        send (function): The ASGI send channel
+        name (str): The name of the resource requested
+        if_none_match (str): The value of the request's If-None-Match header, None should there be
+            none
+
+    Returns:
+        None
+    """
+    if main.sync_due():
+        await asyncio.to_thread(main.sync_shared_state)
+    resource = get_resource(name, get_snapshot(), *main.updates.toasts())
+    if resource is None:
+        await send_response(send, 404, b"Not Found", "text/plain")
+        return
+    body, etag = resource
+    headers = [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+    if etag_matches(if_none_match, etag):
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+    else:
+        await send_response(send, 200, body, "application/json", headers)
+
+
+async def wait_for_disconnect(receive) -> None:
+    """
+    A function that waits until the client of a streamed response disconnects.
+
+    Args:
+        receive (function): The ASGI receive channel
+
+    Returns:
+        None
+    """
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def serve_events(receive, send) -> None:
+    """
+    A function that serves a stream of server-sent events, each carrying one of the dashboard's JSON
+    resources whenever it changes, until the client disconnects. Waiting streams hold no thread,
+    being woken by dashboard_events on every change.
+
+    Args:
+        receive (function): The ASGI receive channel
+        send (function): The ASGI send channel
+
+    Returns:
+        None
+    """
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"text/event-stream"),
+                            (b"cache-control", b"no-cache")]})
+    listener = add_listener()
+    changed = listener[1]
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    sent = {}
+    last_sent = time.monotonic()
+    try:
+        while not disconnected.done():
+            changed.clear()
+            if main.sync_due():
+                await asyncio.to_thread(main.sync_shared_state)
+            page_events = changed_events(sent, get_snapshot(), *main.updates.toasts())
+            if not page_events and \
+                    time.monotonic() - last_sent >= main.config_data["Event Keepalive Seconds"]:
+                page_events = b": keepalive\n\n"
+            if page_events:
+                last_sent = time.monotonic()
+                await send({"type": "http.response.body", "body": page_events, "more_body": True})
+            change = asyncio.ensure_future(changed.wait())
+            await asyncio.wait([disconnected, change], return_when=asyncio.FIRST_COMPLETED,
+                               timeout=main.config_data["Shared State Poll Seconds"])
+            change.cancel()
+    finally:
+        remove_listener(listener)
+        disconnected.cancel()
+
+
+async def app(scope: dict, receive, send) -> None:
+    """
+    The ASGI application, serving the dashboard at / and /index, its JSON resources at /api/, its
+    stream of events at /events, its measurements at /metrics and the static files at /static/.
+
+    Args:
+        scope (dict): The ASGI connection scope
+        receive (function): The ASGI receive channel
+        send (function): The ASGI send channel
+
+    Returns:
+        None
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await asyncio.to_thread(main.start_app)
+                await asyncio.to_thread(get_snapshot)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+    path = scope["path"]
+    if path in ("/", "/index"):
+        page = await serve_dashboard(scope.get("query_string", b""))
+        await send_response(send, 200, page, "text/html; charset=utf-8")
+    elif path == "/metrics":
+        await send_response(send, 200, render_metrics().encode(), "text/plain; version=0.0.4")
+    elif path == "/events":
+        await serve_events(receive, send)
+    elif path.startswith("/api/"):
+        headers = dict(scope.get("headers", []))
+        if_none_match = headers.get(b"if-none-match")
+        await serve_resource(send, path[len("/api/"):],
+                             if_none_match.decode("latin-1") if if_none_match else None)
+    elif path.startswith("/static/"):
+        content = await asyncio.to_thread(read_static_file, path[len("/static/"):])
+        if content is None:
+            await send_response(send, 404, b"Not Found", "text/plain")
+        else:
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            await send_response(send, 200, content, content_type)
+    else:
+        await send_response(send, 404, b"Not Found", "text/plain")
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app)
@@ -0,0 +1,409 @@
+"""
+This module benchmarks the dashboard's hot paths against large synthetic data sets, with no network
+access: reading and processing Covid CSV files, gathering and merging Covid API data, filtering News
+articles against the deleted articles and rendering the dashboard. The results are stored such that
+each run can be compared with an earlier one to catch any performance regression, e.g.
+
+    python benchmark_dashboard.py --save          # store the results as the baseline
+    python benchmark_dashboard.py --compare       # compare against the stored baseline
+
+Timings depend on the machine they are taken on, so the baseline is kept out of version control;
+should there be no stored baseline when comparing, the results are stored as the baseline instead.
+
+It must be run from the project folder, as the modules benchmarked read config.json on import.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    results_file (str): The default file in which results are stored
+    benchmarks (list): A list of the names and functions of each benchmark, in the order run
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+import covid_data_handler
+import covid_news_handling
+import dashboard_cache
+import dashboard_snapshot
+import fake_data_sources
+import fetch_pipeline
+import main
+from news_article import Article
+
+logger = logging.getLogger(__name__)
+results_file = "benchmark_results.json"
+benchmarks = []
+
+
+def benchmark(name: str):
+    """
+    A decorator that registers a function as a benchmark. The function is given the fixtures and
+    returns the function to be timed, such that any setup isn't timed.
+
+    Args:
+        name (str): The name the benchmark's results are stored under
+
+    Returns:
+        register (function): The decorator registering the function
+    """
+    def register(function):
+        benchmarks.append((name, function))
+        return function
+    return register
+
+
+class FakeResponse:
+    """
+    A stand in for a response from the Covid API, holding a page of data already encoded as JSON.
+
+    Attributes:
+        status_code (int): The HTTP status code
+        content (bytes): The encoded body of the response
+    """
+
+    def __init__(self, status_code: int, content: bytes = b"") -> None:
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self) -> None:
+        """
+        Does nothing, as only successful responses are served.
+        """
+
+    def json(self):
+        """
+        Parses the encoded body of the response.
+        """
+        return json.loads(self.content)
+
+
+class FakeCovidSession:
+    """
+    A stand in for the Covid API's HTTP session which serves pages of synthetic data for each area,
+    newest days first, followed by no content once every page has been served.
+
+    Attributes:
+        pages (dict): A dictionary mapping each area name to a list of its encoded pages
+    """
+
+    def __init__(self, pages: dict) -> None:
+        self.pages = pages
+
+    def get(self, url: str, params: dict = None, timeout=None) -> FakeResponse:
+        """
+        Serves the requested page of the area named in the request's filters.
+        """
+        filters = dict(part.split("=") for part in params["filters"].split(";"))
+        pages = self.pages[filters["areaName"]]
+        if params["page"] > len(pages):
+            return FakeResponse(204)
+        return FakeResponse(200, pages[params["page"] - 1])
+
+
+def make_csv(path: str, areas: int, days: int) -> None:
+    """
+    A function that writes a CSV file in the form of the UK government's downloads, modelled on
+    nation_2021-10-28.csv, holding the given number of days for each of the given number of areas.
+
+    Args:
+        path (str): The name of the file to be written
+        areas (int): The number of areas
+        days (int): The number of days for each area
+
+    Returns:
+        None
+    """
+    last_day = date(2021, 10, 28)
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["areaCode", "areaName", "areaType", "date",
+                         "cumDailyNsoDeathsByDeathDate", "hospitalCases",
+                         "newCasesBySpecimenDate"])
+        for area in range(areas):
+            for i in range(days):
+                # The newest days have no deaths or cases yet, as in the real downloads
+                writer.writerow(["E9200000" + str(area), "Area " + str(area), "nation",
+                                 str(last_day - timedelta(i)),
+                                 "" if i < 12 else 150000 - i, 7000 + i % 500,
+                                 "" if i < 1 else 30000 + i % 2000])
+
+
+def make_api_pages(area_name: str, days: int, metrics: list, page_size: int = 1000) -> list:
+    """
+    A function that builds the encoded pages of a synthetic Covid API response for an area.
+
+    Args:
+        area_name (str): The name of the area
+        days (int): The number of days of data, ending today
+        metrics (list): The names of the metrics
+        page_size (int): The number of days in each page
+
+    Returns:
+        pages (list): A list of the encoded pages, newest days first
+    """
+    today = date.today()
+    records = [dict({"areaName": area_name, "date": str(today - timedelta(i))},
+                    **{metric: 1000 + (i * 7 + j) % 997 for j, metric in enumerate(metrics)})
+               for i in range(days)]
+    return [json.dumps({"data": records[i:i + page_size]}).encode()
+            for i in range(0, len(records), page_size)]
+
+
+def make_fixtures(folder: str) -> dict:
+    """
+    A function that builds every fixture used by the benchmarks in the given folder.
+
+    Args:
+        folder (str): The folder in which fixture files are written
+
+    Returns:
+        fixtures (dict): A dictionary of the fixtures
+    """
+    config_data = covid_data_handler.config_data
+    csv_path = os.path.join(folder, "nation_large.csv")
+    make_csv(csv_path, 10, 2000)
+    local_metrics = [config_data["Local Cases Metric"]]
+    national_metrics = [config_data["Total Deaths Metric"], "newCasesByPublishDate",
+                        "hospitalCases"]
+    articles = [Article.from_json(article)
+                for article in fake_data_sources.synthetic_articles(5000)]
+    # Half the articles are deleted, among as many titles deleted from earlier articles
+    deleted_titles = [article.title for article in articles[::2]] + \
+        ["Deleted article " + str(i) for i in range(2500)]
+    return {
+        "csv_path": csv_path,
+        "covid_session": FakeCovidSession({
+            config_data["Location"]: make_api_pages(config_data["Location"], 3000, local_metrics),
+            config_data["Nation"]: make_api_pages(config_data["Nation"], 3000, national_metrics)}),
+        "articles": articles,
+        "deleted_titles": deleted_titles,
+    }
+
+
+@benchmark("parse_csv_data")
+def bench_parse_csv_data(fixtures: dict):
+    """
+    Reads a large CSV file of Covid data into a list of rows.
+    """
+    return lambda: covid_data_handler.parse_csv_data(fixtures["csv_path"])
+
+
+@benchmark("process_covid_csv_data")
+def bench_process_covid_csv_data(fixtures: dict):
+    """
+    Processes the rows of a large CSV file into the displayed figures.
+    """
+    rows = covid_data_handler.parse_csv_data(fixtures["csv_path"])
+    return lambda: covid_data_handler.process_covid_csv_data(rows)
+
+
+@benchmark("covid_API_request full")
+def bench_covid_api_request_full(fixtures: dict):
+    """
+    Gathers and parses every page of the local and national Covid data.
+    """
+    covid_data_handler.session = fixtures["covid_session"]
+
+    def run():
+        covid_data_handler.covid_data = {}
+        covid_data_handler.covid_API_request(covid_data_handler.config_data["Location"],
+                                             covid_data_handler.config_data["Location Type"])
+    return run
+
+
+@benchmark("covid_API_request incremental merge")
+def bench_covid_api_request_incremental(fixtures: dict):
+    """
+    Gathers the newest page of Covid data and merges it into the data held.
+    """
+    covid_data_handler.session = fixtures["covid_session"]
+    covid_data_handler.covid_data = {}
+    covid_data_handler.covid_API_request(covid_data_handler.config_data["Location"],
+                                         covid_data_handler.config_data["Location Type"])
+    # The synthetic pages always hold the newest days first, so only the first page is read
+    return lambda: covid_data_handler.covid_API_request(
+        covid_data_handler.config_data["Location"],
+        covid_data_handler.config_data["Location Type"])
+
+
+@benchmark("update_news filtering")
+def bench_update_news(fixtures: dict):
+    """
+    Filters thousands of articles against thousands of deleted titles and collapses their near
+    duplicates.
+    """
+    covid_news_handling.news_API_request = lambda covid_terms, page=1, language=None: (
+        list(fixtures["articles"]) if page == 1 else [])
+    covid_news_handling.deleted_articles = set(fixtures["deleted_titles"])
+    return lambda: covid_news_handling.update_news(covid_news_handling.config_data["News Terms"])
+
+
+@benchmark("dismiss article")
+def bench_dismiss_article(fixtures: dict):
+    """
+    Deletes a displayed article, replacing it with the next article in the pool.
+    """
+    covid_news_handling.news_API_request = lambda covid_terms, page=1, language=None: (
+        list(fixtures["articles"]) if page == 1 else [])
+    covid_news_handling.deleted_articles = set(fixtures["deleted_titles"])
+    covid_news_handling.update_news(covid_news_handling.config_data["News Terms"])
+    return lambda: covid_news_handling.delete_article(
+        covid_news_handling.displayed_articles[0].title)
+
+
+@benchmark("render dashboard")
+def bench_render_dashboard(fixtures: dict):
+    """
+    Builds a new snapshot and renders the dashboard from it.
+    """
+    client = main.app.test_client()
+
+    def run():
+        # Forces the snapshot to be rebuilt and the page rendered again
+        dashboard_snapshot.snapshot = None
+        dashboard_snapshot.render_cache.clear()
+        client.get("/index")
+    return run
+
+
+@benchmark("render dashboard cached")
+def bench_render_dashboard_cached(fixtures: dict):
+    """
+    Serves the dashboard when neither the data nor the updates have changed.
+    """
+    client = main.app.test_client()
+    client.get("/index")
+    return lambda: client.get("/index")
+
+
+def time_function(function, runs: int) -> dict:
+    """
+    A function that times a number of runs of a function.
+
+    Args:
+        function (function): The function to be timed
+        runs (int): The number of runs
+
+    Returns:
+        result (dict): The best and median time of a run in seconds and the number of runs
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times), "runs": runs}
+
+
+def run_benchmarks(runs: int, selected: list = None) -> dict:
+    """
+    A function that runs the benchmarks in a temporary folder, such that no project files are
+    changed, with the minimum refresh interval disabled such that every call does its full work.
+
+    Args:
+        runs (int): The number of timed runs of each benchmark
+        selected (list): The names of the benchmarks to be run; defaults to every benchmark
+
+    Returns:
+        results (dict): A dictionary mapping each benchmark's name to its result
+    """
+    results = {}
+    project_folder = os.getcwd()
+    logging.disable(logging.INFO)
+    fetch_pipeline.config_data["Minimum Refresh Seconds"] = 0
+    main.started = True
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            dashboard_cache.open_cache(os.path.join(folder, "cache.db"))
+            fixtures = make_fixtures(folder)
+            for name, setup in benchmarks:
+                if selected and name not in selected:
+                    continue
+                function = setup(fixtures)
+                function()
+                results[name] = time_function(function, runs)
+                print("{:<40} best {:9.3f} ms  median {:9.3f} ms".format(
+                    name, results[name]["best"] * 1000, results[name]["median"] * 1000))
+        finally:
+            dashboard_cache.connection.close()
+            os.chdir(project_folder)
+            logging.disable(logging.NOTSET)
+    return results
+
+
+def compare_results(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    A function that compares benchmark results with a baseline, printing the change in each.
+
+    Args:
+        results (dict): A dictionary mapping each benchmark's name to its result
+        baseline (dict): A dictionary mapping each benchmark's name to its baseline result
+        tolerance (float): The fraction by which a benchmark may be slower than its baseline
+            before it is counted as a regression
+
+    Returns:
+        regressions (list): A list of the names of the benchmarks which have regressed
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print("{:<40} no baseline".format(name))
+            continue
+        ratio = result["best"] / baseline[name]["best"]
+        regressed = ratio > 1 + tolerance
+        if regressed:
+            regressions.append(name)
+        print("{:<40} {:+7.1f}%{}".format(name, (ratio - 1) * 100,
+                                          "  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main_benchmarks() -> int:
+    """
+    A function that runs the benchmarks from the command line, optionally storing the results as
+    the baseline or comparing them against it. Comparing with no stored baseline stores the results
+    as the baseline.
+
+    Args:
+        None
+
+    Returns:
+        status (int): The exit status, 1 should any benchmark have regressed
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="timed runs of each benchmark")
+    parser.add_argument("--results", default=results_file, help="file the results are stored in")
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="fraction slower than the baseline counted as a regression")
+    parser.add_argument("benchmark", nargs="*", help="names of the benchmarks to run")
+    args = parser.parse_args()
+    results = run_benchmarks(args.runs, args.benchmark)
+    status = 0
+    if args.compare and not os.path.exists(args.results):
+        print("No baseline found, the results are stored as the baseline in " + args.results)
+        args.save = True
+    elif args.compare:
+        with open(args.results) as stored_file:
+            baseline = json.load(stored_file)["results"]
+        if compare_results(results, baseline, args.tolerance):
+            status = 1
+    if args.save:
+        with open(args.results, "w") as stored_file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "date": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+                       "results": results}, stored_file, indent=4)
+    return status
+
+
+if __name__ == '__main__':
+    raise SystemExit(main_benchmarks())
@@ -0,0 +1,27 @@
+"""
+This module holds the fixtures shared by the test modules.
+"""
+
+import threading
+import pytest
+import covid_data_handler
+import covid_news_handling
+from fake_data_sources import FakeDataSourceAdapter, install_fake_data_sources
+
+
+@pytest.fixture(scope="module")
+def fake_sources(tmp_path_factory):
+    """
+    This fixture answers the requests made by the app in a module's tests, such as those gathering
+    the initial data once the app starts, from the stand in APIs rather than the network, restoring
+    the sessions' adapters once the initial data has been gathered.
+    """
+    sessions = (covid_data_handler.session, covid_news_handling.session)
+    adapters = [session.adapters.copy() for session in sessions]
+    install_fake_data_sources(FakeDataSourceAdapter(str(tmp_path_factory.mktemp("recordings"))))
+    yield
+    for thread in threading.enumerate():
+        if thread.name == "initial refresh":
+            thread.join()
+    for session, held in zip(sessions, adapters):
+        session.adapters = held
@@ -0,0 +1,205 @@
+"""
+This module computes rolling window analytics over the metrics of a CovidSeries: rolling totals and
+means, rates per 100,000 people and week on week change, for any metric and window size. Each is
+computed for every day of the series in a single pass over its array, and the results are cached
+per version of the Covid data such that any number of trend indicators can be displayed without
+any per request loops.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    cache (dict): A dictionary mapping the area, metric and window of each computed set of rolling
+        statistics to them, holding only those computed from the current data version
+    cache_version: The version of the Covid data the cached statistics were computed from
+    lock (threading.Lock): A lock preventing the cache being changed concurrently
+"""
+
+import logging
+import math
+import threading
+from array import array
+from datetime import date
+from typing import NamedTuple
+from covid_series import CovidSeries, MISSING
+
+logger = logging.getLogger(__name__)
+cache = {}
+cache_version = None
+lock = threading.Lock()
+
+
+class RollingStats(NamedTuple):
+    """
+    The rolling statistics of a metric for every day of a series, each array aligned with the
+    series' own arrays. Days before a full window has been held are MISSING.
+
+    Attributes:
+        start (date): The first day of the series
+        window (int): The number of days in each window
+        sums (array): The total of the metric over the window ending on each day, with days having
+            no data counting as zero
+        means (array): The mean of the days with data within the window ending on each day
+        rates (array): The total per 100,000 people, MISSING should the population not be known
+        changes (array): The percentage change of the total from that 7 days before
+    """
+    start: date
+    window: int
+    sums: array
+    means: array
+    rates: array
+    changes: array
+
+
+class Trend(NamedTuple):
+    """
+    The rolling statistics of a metric on a single day.
+
+    Attributes:
+        area (str): The name of the area
+        metric (str): The name of the metric
+        window (int): The number of days in the window
+        total (int): The total over the window, None should there be no full window
+        mean (float): The daily mean over the window, None should there be no data
+        rate (float): The total per 100,000 people, None should the population not be known
+        change (float): The percentage change of the total from 7 days before, None should it not
+            be known
+    """
+    area: str
+    metric: str
+    window: int
+    total: int
+    mean: float
+    rate: float
+    change: float
+
+
+def rolling_sums(column: array, window: int) -> tuple:
+    """
+    A function that gives the total and the number of days with data within the window ending on
+    each day, keeping running totals such that each day is visited once however wide the window.
+
+    Args:
+        column (array): The daily values of a metric, with days having no data holding MISSING
+        window (int): The number of days in each window
+
+    Returns:
+        sums (array): The total over each window, MISSING before the first full window
+        counts (array): The number of days with data within each window
+    """
+    sums = array('d', bytes(8 * len(column)))
+    counts = array('d', bytes(8 * len(column)))
+    total = 0.0
+    count = 0
+    for i, value in enumerate(column):
+        if not math.isnan(value):
+            total += value
+            count += 1
+        if i >= window:
+            leaving = column[i - window]
+            if not math.isnan(leaving):
+                total -= leaving
+                count -= 1
+        sums[i] = total if i >= window - 1 else MISSING
+        counts[i] = count
+    return sums, counts
+
+
+def week_on_week(sums: array) -> array:
+    """
+    A function that gives the percentage change of each rolling total from the total 7 days before.
+
+    Args:
+        sums (array): The rolling totals of a metric
+
+    Returns:
+        changes (array): The percentage changes, MISSING where the earlier total is missing or zero
+    """
+    changes = array('d', [MISSING]) * len(sums)
+    for i in range(7, len(sums)):
+        previous = sums[i - 7]
+        if previous and not math.isnan(previous):
+            changes[i] = (sums[i] - previous) / previous * 100
+    return changes
+
+
+def compute_rolling_stats(series: CovidSeries, metric: str, window: int,
+                          population: int = None) -> RollingStats:
+    """
+    A function that computes the rolling statistics of a metric for every day of a series.
+
+    Args:
+        series (CovidSeries): The series holding the metric
+        metric (str): The name of the metric
+        window (int): The number of days in each window
+        population (int): The population of the series' area, used for rates per 100,000 people
+
+    Returns:
+        stats (RollingStats): The rolling statistics
+    """
+    sums, counts = rolling_sums(series.columns[metric], window)
+    means = array('d', (total / count if count else MISSING for total, count in zip(sums, counts)))
+    if population:
+        rates = array('d', (total * 100000 / population for total in sums))
+    else:
+        rates = array('d', [MISSING]) * len(sums)
+    return RollingStats(series.start, window, sums, means, rates, week_on_week(sums))
+
+
+def get_rolling_stats(series: CovidSeries, metric: str, window: int, version,
+                      population: int = None) -> RollingStats:
+    """
+    A function that gives the rolling statistics of a metric, computing them only the first time
+    they are asked for from each version of the Covid data.
+
+    Args:
+        series (CovidSeries): The series holding the metric
+        metric (str): The name of the metric
+        window (int): The number of days in each window
+        version: The version of the Covid data the series belongs to
+        population (int): The population of the series' area, used for rates per 100,000 people
+
+    Returns:
+        stats (RollingStats): The rolling statistics
+    """
+    global cache_version
+    key = (series.area_name, metric, window, population)
+    with lock:
+        if cache_version != version:
+            cache.clear()
+            cache_version = version
+        stats = cache.get(key)
+    if stats is None:
+        logger.info("Computing rolling statistics of %s for %s over %s days", metric,
+                    series.area_name, window)
+        stats = compute_rolling_stats(series, metric, window, population)
+        with lock:
+            if cache_version == version:
+                cache[key] = stats
+    return stats
+
+
+def trend_on(series: CovidSeries, metric: str, window: int, day: date, version,
+             population: int = None) -> Trend:
+    """
+    A function that gives the rolling statistics of a metric on a single day.
+
+    Args:
+        series (CovidSeries): The series holding the metric
+        metric (str): The name of the metric
+        window (int): The number of days in the window
+        day (date): The last day of the window
+        version: The version of the Covid data the series belongs to
+        population (int): The population of the series' area, used for rates per 100,000 people
+
+    Returns:
+        trend (Trend): The rolling statistics on the given day, each None should it not be known
+    """
+    values = [None] * 4
+    if series.start is not None and metric in series.columns:
+        stats = get_rolling_stats(series, metric, window, version, population)
+        i = series.offset(day)
+        if 0 <= i < len(stats.sums):
+            values = [None if math.isnan(column[i]) else column[i]
+                      for column in (stats.sums, stats.means, stats.rates, stats.changes)]
+    total, mean, rate, change = values
+    return Trend(series.area_name, metric, window, None if total is None else int(total),
+                 mean, rate, change)
@@ -5,29 +5,50 @@ government Covid API and the scheduling and cancellation of updates to said Covi
 Attributes:
     logger (logging): An instance of the project's logging
     updates (dict): A dictionary used to hold the current Covid data updates scheduled
-    covid_data (dict): A dictionary used to hold the current Covid data
-    schedule (sched): An instance of the project's sched
+    covid_data (dict): A dictionary holding the current local and national Covid data series
+    covid_data_version (int): A count of the times new Covid data has been gathered
+    cached_covid_version (int): The version of the cached Covid data last loaded or saved by this
+        process, used to notice data gathered by other processes
     config_data (dict): A dictionary containing all the configurable variables from the config file
+    session (requests.Session): The pooled HTTP session used for all Covid API requests
 
 """
 
 import logging
 import csv
-import sched
+import itertools
 import time
 import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import requests
+from requests.adapters import HTTPAdapter
 from uk_covid19 import Cov19API
-
-# Initialises the logger and scheduler, and creates the updates and covid_data dictionaries
+from covid_series import CovidSeries, SeriesBuilder, MISSING
+import dashboard_cache
+from dashboard_events import notify_change
+from fetch_pipeline import single_flight, serve_stale, resilient_get, response_field
+from dashboard_metrics import describe, observe, timed
+from update_scheduler import (schedule_job, schedule_daily_job, cancel_job, next_time_at,
+                              is_scheduled)
+
+# Initialises the logger, and creates the updates and covid_data dictionaries
 logger = logging.getLogger(__name__)
 updates = {}
 covid_data = {}
-schedule = sched.scheduler()
+covid_data_version = 0
+cached_covid_version = 0
 
 # Opens the configuration file
 with open('config.json', 'r') as f:
     config_data = json.load(f)
 
+# Creates a session whose connections are kept open and shared between concurrent requests
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_maxsize=config_data["Fetch Workers"]))
+describe("covid_area_request_seconds", "Duration of gathering the Covid data for one area")
+
 
 # -- These functions are never used but were a necessary project requirement
 
@@ -48,111 +69,388 @@ def parse_csv_data(csv_filename: str) -> list:
     return covid_data_list
 
 
-def process_covid_csv_data(covid_csv_data: list) -> tuple:
+def process_covid_csv_data(covid_csv_data: list, cases_metric: str = "newCasesBySpecimenDate",
+                           hospital_metric: str = "hospitalCases",
+                           deaths_metric: str = "cumDailyNsoDeathsByDeathDate") -> tuple:
     """
     A function that takes in a list of data and processes it to return current hospital cases,
-    total deaths and cases in the last 7 days.
+    total deaths and cases in the last 7 days. Each value is found from the latest day on which its
+    column has data, rather than from a fixed row, and is totalled over every area in the data.
+    Values whose column is missing or holds no data count as 0.
 
     Args:
-        covid_csv_data (list): A list containing Covid data
+        covid_csv_data (list): A list containing Covid data, starting with a header row
+        cases_metric (str): The name of the column of daily cases
+        hospital_metric (str): The name of the column of hospital cases
+        deaths_metric (str): The name of the column of cumulative deaths
 
     Returns:
         current_hospital_cases (int): The number of current Covid hospital cases
         total_deaths (int): The cumulative deaths due to Covid infection
         last7days_cases (int): The number of Covid cases in the past 7 days
     """
-    current_hospital_cases = covid_csv_data[1][5]
-    total_deaths = covid_csv_data[14][4]
-    last7days_cases = 0
-    for i in range(3, 10):
-        last7days_cases += int(covid_csv_data[i][6])
-    return int(last7days_cases), int(current_hospital_cases), int(total_deaths)
+    rows = iter(covid_csv_data)
+    header = next(rows, None)
+    if header is None:
+        logger.warning("No Covid data to process")
+        return 0, 0, 0
+    metrics = []
+    for metric in (cases_metric, hospital_metric, deaths_metric):
+        if metric in header:
+            metrics.append(metric)
+        else:
+            logger.warning("Covid data has no %s column", metric)
+    last7days_cases = current_hospital_cases = total_deaths = 0
+    for covid_series in series_from_csv_rows(itertools.chain([header], rows), metrics).values():
+        current_hospital_cases += latest_value(covid_series, hospital_metric)
+        total_deaths += latest_value(covid_series, deaths_metric)
+        latest_day = covid_series.latest_date(cases_metric) \
+            if cases_metric in covid_series.columns else None
+        # The latest day of case data is incomplete so the 7 days counted end the day before it
+        if latest_day is not None:
+            last7days_cases += covid_series.window_sum(cases_metric, latest_day - timedelta(1), 7)
+    return last7days_cases, current_hospital_cases, total_deaths
+
+
+# --
+
+def latest_value(covid_series: CovidSeries, metric: str) -> int:
+    """
+    A function that gives the value of a metric on the latest day on which it has data.
+
+    Args:
+        covid_series (CovidSeries): The series holding the metric
+        metric (str): The name of the metric
+
+    Returns:
+        value (int): The latest value of the metric, 0 should the series hold no data for it
+    """
+    if metric not in covid_series.columns:
+        return 0
+    latest_day = covid_series.latest_date(metric)
+    if latest_day is None:
+        return 0
+    return covid_series.value(metric, latest_day)
+
+
+def series_from_csv_rows(rows, metrics: list = None) -> dict:
+    """
+    A function that takes in rows of Covid data in the form of the UK government's CSV downloads,
+    a header row followed by one row per area per day, and converts them into a series per area.
+    Rows are consumed one at a time, each filling its area's arrays directly, so any iterable of
+    rows, such as a csv reader, can be processed holding nothing but the series built. Blank cells
+    are held as missing.
+
+    Args:
+        rows (iterable): An iterable of rows, each a list of strings, starting with the header row
+        metrics (list): The names of the metric columns to be kept; defaults to every column other
+            than the area and date columns
+
+    Returns:
+        covid_series (dict): A dictionary mapping each area name to a CovidSeries of its data
+
+    Raises:
+        ValueError: Should the header have no areaName or date column, or none for a metric given
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return {}
+    if metrics is None:
+        metrics = [name for name in header if name not in
+                   ("areaCode", "areaName", "areaType", "date")]
+    for name in ["areaName", "date"] + list(metrics):
+        if name not in header:
+            raise ValueError("Covid CSV data has no " + name + " column")
+    area_index = header.index("areaName")
+    date_index = header.index("date")
+    metric_indices = [header.index(metric) for metric in metrics]
+    builders = {}
+    for row in rows:
+        if not row:
+            continue
+        area_name = row[area_index]
+        builder = builders.get(area_name)
+        if builder is None:
+            builder = builders[area_name] = SeriesBuilder(area_name, metrics)
+        values = []
+        for index in metric_indices:
+            cell = row[index]
+            try:
+                values.append(float(cell) if cell else MISSING)
+            except ValueError:
+                values.append(MISSING)
+        builder.add(date.fromisoformat(row[date_index]).toordinal(), values)
+    return {area_name: builder.build() for area_name, builder in builders.items()}
+
+
+def load_csv_series(csv_filename: str, metrics: list = None) -> dict:
+    """
+    A function that streams a Covid data CSV file, such as a full history download for every area,
+    into a series per area without reading the whole file into memory.
+
+    Args:
+        csv_filename (str): A string representing the name of the csv file to be opened
+        metrics (list): The names of the metric columns to be kept; defaults to every metric column
+
+    Returns:
+        covid_series (dict): A dictionary mapping each area name to a CovidSeries of its data
+    """
+    logger.info("Loading Covid data from %s", csv_filename)
+    with open(csv_filename, newline="") as file:
+        return series_from_csv_rows(csv.reader(file), metrics)
 
 
 # --
 
-def covid_API_request(location: str = "Exeter", location_type: str = "ltla") -> dict:
+@single_flight
+@serve_stale(lambda: covid_data)
+@timed("covid_api_request", "gathering the local and national Covid data")
+def covid_API_request(location: str = "Exeter", location_type: str = "ltla",
+                      incremental: bool = True) -> dict:
     """
     A function that takes in a location and gathers a set of Covid data from the UK government's
     Covid API relevant to that location and the wider nation. It then returns said data after having
-    processed it.
+    processed it. Where data for both the same local area and nation is already held and incremental
+    is set, only the days since the latest held (and those within the configured revision window
+    before it) are requested and merged into a copy of the held data. Should the data not be
+    gathered, the data already held is returned unchanged.
 
     Args:
         location (str): The local location; defaults to Exeter
         location_type (str): The local location's area classification; defaults to ltla
+        incremental (bool): Whether to request only newer data when data is already held
 
     Returns:
-        covid_data (dict): A dictionary containing up to date Covid data
+        covid_data (dict): A dictionary containing up to date Covid data, with the local and
+            national data held as CovidSeries under the keys local and national
     """
     global config_data
     global covid_data
+    global covid_data_version
+    global cached_covid_version
     logger.info("Data requested from Covid API")
-    # Sets up the filters for the local and national covid data for the API
-    local_structure = {
-        "areaName": "areaName",
-        "date": "date",
-        config_data["Local Cases Metric"]: config_data["Local Cases Metric"],
-    }
-    national_structure = {
-        "areaName": "areaName",
-        "date": "date",
-        config_data["Total Deaths Metric"]: config_data["Total Deaths Metric"],
-        "newCasesByPublishDate": "newCasesByPublishDate",
-        "hospitalCases": "hospitalCases"
+    nation = config_data["Nation"]
+    held = {}
+    # Data held for other areas, such as before the configured Location or Nation changed, is
+    # gathered in full rather than merged into
+    if incremental and covid_data.get("local") and covid_data["local"].area_name == location \
+            and covid_data["national"].area_name == nation:
+        held[(location, location_type)] = covid_data["local"]
+        held[(nation, "nation")] = covid_data["national"]
+    # Requests the local and national covid data from the covid API at the same time
+    batch_data, timings = fetch_covid_batch(
+        [(location, location_type), (nation, "nation")],
+        {location_type: [config_data["Local Cases Metric"]],
+         "nation": [config_data["Total Deaths Metric"], "newCasesByPublishDate", "hospitalCases"]},
+        held)
+    for (area_name, _), duration in timings.items():
+        observe("covid_area_request_seconds", duration, area=area_name)
+    # Stores the local and national data as separate series, each indexed by its own dates
+    covid_data = {
+        "local": batch_data[(location, location_type)],
+        "national": batch_data[(nation, "nation")]
     }
-    area_type = "areaType=" + location_type
-    area_name = "areaName=" + location
-    filter_list = [area_type, area_name]
-    # Requests the covid data from the covid API, strips them of unnecessary structures
-    local_api = Cov19API(filters=filter_list, structure=local_structure)
-    death_api = Cov19API(filters=["areaType=nation", "areaName=" + config_data["Nation"]],
-                         structure=national_structure)
-    local_data = local_api.get_json()
-    national_data = death_api.get_json()
-    # Strip unnecessary formatting
-    local_data = local_data["data"]
-    national_data = national_data["data"]
-    # Merges the local and national data
-    covid_data = {}
-    for i in range(0, len(local_data)):
-        covid_data[local_data[i]["date"]] = [local_data[i], national_data[i]]
+    covid_data_version += 1
+    notify_change()
+    try:
+        cached_covid_version = dashboard_cache.save_covid_data(covid_data)
+    except sqlite3.Error:
+        logger.exception("Covid data could not be saved to the cache")
+
+    return covid_data
+
+
+def load_cached_covid_data() -> dict:
+    """
+    A function that loads the Covid data saved by the last successful request to the Covid API,
+    allowing data to be displayed before a new request completes.
+
+    Args:
+        None
+
+    Returns:
+        covid_data (dict): A dictionary containing the cached Covid data, empty should there be none
+    """
+    global covid_data
+    global covid_data_version
+    global cached_covid_version
+    try:
+        cached_covid_version = dashboard_cache.get_version("covid")
+        cached_data = dashboard_cache.load_covid_data()
+    except sqlite3.Error:
+        logger.exception("Covid data could not be loaded from the cache")
+        cached_data = {}
+    if "local" in cached_data and "national" in cached_data:
+        logger.info("Covid data loaded from the cache")
+        covid_data = cached_data
+        covid_data_version += 1
+        notify_change()
+    return covid_data
+
+
+def sync_cached_covid_data() -> dict:
+    """
+    A function that loads the cached Covid data should another process have saved newer data since
+    this process last loaded or saved it.
 
+    Args:
+        None
+
+    Returns:
+        covid_data (dict): A dictionary containing the current Covid data
+    """
+    try:
+        changed = dashboard_cache.get_version("covid") != cached_covid_version
+    except sqlite3.Error:
+        logger.exception("Covid data version could not be read from the cache")
+        changed = False
+    if changed:
+        return load_cached_covid_data()
     return covid_data
 
 
-def schedule_covid_updates(update_interval: str, update_name: str) -> None:
+def fetch_area_data(area_name: str, area_type: str, metrics: list, since: date = None) -> list:
+    """
+    A function that gathers the given metrics for a single area from the UK government's Covid API,
+    requesting the pages of the data over the module's pooled HTTP session. The API gives the newest
+    days first, so when only days from a given date onwards are wanted no further pages are
+    requested once an earlier day is reached.
+
+    Args:
+        area_name (str): The name of the area, e.g. Exeter
+        area_type (str): The area's classification, e.g. ltla
+        metrics (list): The names of the metrics to be gathered
+        since (date): The earliest day to be gathered; defaults to every day
+
+    Returns:
+        area_data (list): A list of dictionaries each containing a date and the metric values
+    """
+    structure = {"areaName": "areaName", "date": "date"}
+    for metric in metrics:
+        structure[metric] = metric
+    api_params = Cov19API(filters=["areaType=" + area_type, "areaName=" + area_name],
+                          structure=structure).api_params
+    api_params["format"] = "json"
+    api_params["page"] = 1
+    area_data = []
+    while True:
+        response = resilient_get(session, Cov19API.endpoint, "covid", params=api_params)
+        # The API responds with no content once every page has been requested
+        if response.status_code == 204:
+            break
+        page_data = response_field(response, "data", "covid")
+        if since is not None:
+            since_text = str(since)
+            wanted = [record for record in page_data if record["date"] >= since_text]
+            area_data.extend(wanted)
+            if len(wanted) < len(page_data):
+                break
+        else:
+            area_data.extend(page_data)
+        api_params["page"] += 1
+    return area_data
+
+
+def fetch_covid_batch(areas: list, metrics: dict, held: dict = None) -> tuple:
+    """
+    A function that gathers Covid data for many areas at once, with the request for each area run
+    concurrently in a pool of threads sharing the module's pooled HTTP session. For areas whose data
+    is already held only the newer days, plus a revision window of earlier days which may have been
+    corrected, are requested and merged into a copy of the held series.
+
+    Args:
+        areas (list): A list of (area name, area type) tuples, e.g. ("Exeter", "ltla")
+        metrics (dict): A dictionary mapping each area type to the names of the metrics to be
+            gathered for areas of that type
+        held (dict): A dictionary mapping (area name, area type) tuples to the CovidSeries already
+            held for them; defaults to none being held
+
+    Returns:
+        covid_series (dict): A dictionary mapping each (area name, area type) tuple to a CovidSeries
+            of its data
+        timings (dict): A dictionary mapping each (area name, area type) tuple to the time in
+            seconds taken to gather its data
+    """
+
+    def fetch(area: tuple) -> tuple:
+        area_name, area_type = area
+        start = time.perf_counter()
+        series = held.get(area)
+        # Data is only requested incrementally if every metric already has a latest day held
+        latest_days = [None]
+        if series is not None and all(metric in series.columns for metric in metrics[area_type]):
+            latest_days = [series.latest_date(metric) for metric in metrics[area_type]]
+        if None not in latest_days:
+            since = min(latest_days) - timedelta(config_data["Revision Window Days"])
+            area_data = fetch_area_data(area_name, area_type, metrics[area_type], since)
+            logger.info("Covid data for %s requested from %s onwards", area_name, since)
+            series = series.copy()
+            series.merge_records(area_data)
+        else:
+            area_data = fetch_area_data(area_name, area_type, metrics[area_type])
+            series = CovidSeries.from_records(area_data, metrics[area_type], area_name)
+        return series, time.perf_counter() - start
+
+    if held is None:
+        held = {}
+    covid_series = {}
+    timings = {}
+    if not areas:
+        return covid_series, timings
+    with ThreadPoolExecutor(max_workers=min(len(areas), config_data["Fetch Workers"])) as pool:
+        for area, (series, duration) in zip(areas, pool.map(fetch, areas)):
+            logger.info("Covid data for %s gathered in %.3f seconds", area[0], duration)
+            covid_series[area] = series
+            timings[area] = duration
+    return covid_series, timings
+
+
+def schedule_covid_updates(update_interval: str, update_name: str,
+                           repeat: bool = False, run_at: float = None) -> None:
     """
     A function used to schedule a Covid update with the given name at the given date.
 
     Args:
         update_interval (str): The time for the update to be scheduled to in the form 12:15
         update_name (str): The name of the update to be scheduled
+        repeat (bool): Whether the update is to be repeated daily at the same time
+        run_at (float): The time of the first update in seconds since the epoch, used for updates
+            requested without a time; defaults to the next time matching update_interval
 
     Returns:
         None
     """
-    logger.info("Covid update " + update_name + " scheduled for " + update_interval)
+    logger.info("Covid update %s scheduled for %s", update_name, update_interval)
     global updates
-    global schedule
-    # Gathers the current time
-    current_hour = int(time.gmtime().tm_hour)
-    current_minute = int(time.gmtime().tm_min)
-    current_second = int(time.gmtime().tm_sec)
-    # Converts the time given by update_interval into an integer in seconds
-    update_hour = update_interval[0:2]
-    update_minute = update_interval[3:]
-    update_hour = int(update_hour)
-    update_minute = int(update_minute)
-    # Calculates the time in seconds until the scheduled time
-    timer = ((update_hour - current_hour) * 3600) + (
-        (update_minute - current_minute) * 60) - current_second
-    if timer < 0:
-        timer += 24 * 3600
-    updates[update_name] = schedule.enter(timer, 1, covid_API_request,
-                                          argument=(
-                                              config_data["Location"],
-                                              config_data["Location Type"],))
-    schedule.run(blocking=False)
+    argument = (config_data["Location"], config_data["Location Type"])
+    if repeat:
+        updates[update_name] = schedule_daily_job(("Covid", update_name), update_interval,
+                                                  covid_API_request, argument, run_at=run_at)
+    else:
+        if run_at is None:
+            run_at = next_time_at(update_interval)
+        updates[update_name] = schedule_job(("Covid", update_name), run_at, run_covid_update,
+                                            (update_name,) + argument)
+
+
+def run_covid_update(update_name: str, location: str, location_type: str) -> None:
+    """
+    A function run by the scheduler for a Covid update which isn't repeated, removing the update
+    from the updates once it has fallen due before gathering the Covid data.
+
+    Args:
+        update_name (str): The name of the update
+        location (str): The local location
+        location_type (str): The local location's area classification
+
+    Returns:
+        None
+    """
+    # An update of the same name scheduled since this one fell due is kept
+    if not is_scheduled(("Covid", update_name)):
+        updates.pop(update_name, None)
+    covid_API_request(location, location_type)
 
 
 def get_covid_data() -> dict:
@@ -163,11 +461,10 @@ def get_covid_data() -> dict:
         None
 
     Returns:
-        covid_data (dict): A dictionary containing current Covid data
+        covid_data (dict): A dictionary containing the current local and national Covid data series
     """
     global covid_data
     logger.info("Covid data requested")
-    schedule.run(blocking=False)
     return covid_data
 
 
@@ -183,8 +480,5 @@ def cancel_covid_update(update_name: str) -> None:
     """
     logger.info("Covid update %s cancelled", update_name)
     global updates
-    global schedule
-    schedule.cancel(updates[update_name])
-    del updates[update_name]
-
-print(parse_csv_data('nation_2021-10-28.csv'))
\ No newline at end of file
+    cancel_job(("Covid", update_name))
+    updates.pop(update_name, None)
@@ -1,40 +1,112 @@
 """
 This module handles the processing of News articles from the News API and the scheduling and
-cancellation of updates to the News articles data.
+cancellation of updates to the News articles data. Articles are gathered for the given terms in the
+configured News Language along with any configured Extra News Queries, e.g. further topics or
+languages, which are run concurrently and merged into one ranked feed. Near duplicate articles, such
+as a wire story syndicated by several outlets, are collapsed to the first gathered, and deleting an
+article also removes its near duplicates.
 
 Attributes:
     logger (logging): An instance of the project's logging
     updates (dict): A dictionary used to hold the current News data updates scheduled
-    current_articles (dict): A dictionary used to hold the current News articles
-    schedule (sched): An instance of the project's sched
+    current_articles (list): A list used to hold the current News articles, each an Article
+    displayed_articles (list): A list of the articles currently displayed, at most the configured
+        Articles Displayed
+    article_pool (deque): The articles waiting to replace displayed articles as they are deleted, in
+        the order gathered, topped up in the background from the next page of articles once fewer
+        than the configured Article Pool Watermark remain
+    pool_lock (threading.Lock): A lock preventing the displayed articles and pool being changed
+        concurrently
+    pool_generation (int): A count of the times the pool has been refilled from newly gathered or
+        loaded articles, such that a top up begun before a refill is discarded
+    news_terms (str): The terms the current articles were gathered with, used to top up the pool
+    news_page (int): The last page of articles gathered for the current terms
+    pool_exhausted (bool): Whether the last top up found no further articles, such that no more
+        are requested until the articles are next gathered
+    top_up_failures (int): The number of top ups in a row which have failed
+    top_up_retry_at (float): The time in seconds since the epoch before which no top up is
+        started, such that failed top ups are retried with a backoff
+    top_up_lock (threading.Lock): A lock held while the pool is being topped up
+    articles_index (NearDuplicateIndex): An index of the sketches of the current articles, used
+        to find near duplicates of those gathered to top up the pool
+    deleted_index (NearDuplicateIndex): An index of the sketches of the deleted articles seen by
+        this process, used to find their near duplicates
+    news_version (int): A count of the times the News articles have changed, either through new
+        articles being gathered or articles being deleted
+    cached_articles_version (int): The version of the cached articles last loaded or saved by this
+        process, used to notice articles gathered by other processes
+    deleted_articles (set): A set of the titles of deleted articles, None until first loaded
+    deleted_articles_position (tuple): The inode of the deleted articles file and the number of
+        bytes of it read so far, used to read only the titles deleted by other processes since
     config_data (dict): A dictionary containing all the configurable variables from the config file
+    session (requests.Session): The HTTP session used for all News API requests, allowing its
+        connections to be reused
 
 """
 
 import logging
-import sched
-import time
+import os
 import json
+import sqlite3
+import threading
+import time
+from collections import deque
 import requests
+from requests.adapters import HTTPAdapter
+import dashboard_cache
+from dashboard_events import notify_change
+from fetch_pipeline import single_flight, serve_stale, resilient_get, response_field
+from news_aggregation import merge_rankings, run_queries
+from near_duplicates import NearDuplicateIndex, Sketch, sketch
+from news_article import Article
+from dashboard_metrics import timed
+from update_scheduler import (schedule_job, schedule_daily_job, cancel_job, next_time_at,
+                              is_scheduled)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 updates = {}
-schedule = sched.scheduler()
-current_articles = {}
+current_articles = []
+displayed_articles = []
+article_pool = deque()
+pool_lock = threading.Lock()
+pool_generation = 0
+news_version = 0
+cached_articles_version = 0
+deleted_articles = None
+deleted_articles_position = None
 with open('config.json', 'r') as f:
     config_data = json.load(f)
+news_terms = config_data["News Terms"]
+news_page = 0
+pool_exhausted = False
+top_up_failures = 0
+top_up_retry_at = 0.0
+top_up_lock = threading.Lock()
+articles_index = NearDuplicateIndex()
+deleted_index = NearDuplicateIndex()
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_maxsize=config_data["Fetch Workers"]))
 
 
-def news_API_request(covid_terms: str = "Covid COVID-19 coronavirus") -> list:
+@single_flight
+@timed("news_api_request", "gathering News articles")
+def news_API_request(covid_terms: str = "Covid COVID-19 coronavirus", page: int = 1,
+                     language: str = None) -> list:
     """
     A function that takes in a string of multiple news term filters and uses this to gather relevant
-    news articles from the news API and return the articles as a dictionary
+    news articles from the news API and return the articles as compact records
 
     Args:
         covid_terms (str): A string of words used to filter what articles are gathered
+        page (int): The page of articles gathered, each holding the configured News Page Size
+        language (str): The language of the articles gathered; defaults to the News Language
 
     Returns:
-        articles (list): A formatted list of dictionaries containing the gathered news articles
+        articles (list): A list of the gathered news articles, each an Article
     """
     global config_data
     logger.info("Data requested from News API")
@@ -43,106 +115,615 @@ def news_API_request(covid_terms: str = "Covid COVID-19 coronavirus") -> list:
     api_key = config_data["API Key"]
     complete_url = "https://newsapi.org/v2/everything?q=" + terms + "&" + config_data[
         "News Sorting"] + "&language=" + \
-                   config_data["News Language"] + "&apiKey=" + api_key
-    response = requests.get(complete_url)
-    articles = response.json()
-    # Remove unnecessary formatting
-    articles = articles["articles"]
-    return articles
+                   (language or config_data["News Language"]) + "&pageSize=" + \
+                   str(config_data["News Page Size"]) + "&page=" + str(page) + "&apiKey=" + api_key
+    response = resilient_get(session, complete_url, "news")
+    articles = response_field(response, "articles", "news")
+    # Keep only the fields used, in a compact record created once for each article
+    return [Article.from_json(article) for article in articles]
+
+
+def news_queries(covid_terms: str) -> list:
+    """
+    A function that gives the queries gathering the articles for the given terms: the terms in the
+    configured News Language followed by any configured Extra News Queries.
+
+    Args:
+        covid_terms (str): A string of words used to filter what articles are gathered
+
+    Returns:
+        queries (list): A list of dictionaries holding the terms and language of each query
+    """
+    return [{"terms": covid_terms, "language": config_data["News Language"]}] + \
+        config_data["Extra News Queries"]
+
+
+def aggregate_news(covid_terms: str = "Covid COVID-19 coronavirus", page: int = 1) -> list:
+    """
+    A function that gathers a page of articles from each query for the given terms concurrently and
+    merges them into one ranked list, keeping a single copy of any article found more than once.
+
+    Args:
+        covid_terms (str): A string of words used to filter what articles are gathered
+        page (int): The page of articles gathered by each query
+
+    Returns:
+        articles (list): A list of the distinct articles, ranked best first
+    """
+    return merge_rankings(run_queries(news_API_request, news_queries(covid_terms), page))
 
 
+@single_flight
+@serve_stale(lambda: current_articles)
+@timed("update_news", "gathering and filtering News articles")
 def update_news(covid_terms: str = "Covid COVID-19 coronavirus") -> list:
     """
     A function that gathers news articles based on the terms given and filters them such that the
-    articles returned are not ones that have already been removed.
+    articles returned are not ones that have already been removed, nor near duplicates of removed
+    or earlier articles. Should the articles not be gathered, the articles already held are
+    returned unchanged.
 
     Args:
         covid_terms (str): A string of words used to filter what articles are gathered
 
     Returns:
-        current_articles (list): A formatted list of dictionaries containing the gathered articles
+        current_articles (list): A list of the gathered articles
     """
     global current_articles
-    current_articles = news_API_request(covid_terms)
-    # Imports all deleted articles from file and creates an empty list should the file not exist
+    global news_version
+    global cached_articles_version
+    global news_terms
+    global articles_index
+    index = NearDuplicateIndex()
+    # Removes already deleted articles and near duplicates from the current articles
+    current_articles = collapse_near_duplicates(aggregate_news(covid_terms), index)
+    articles_index = index
+    news_terms = covid_terms
+    refill_article_pool(current_articles, 1)
+    news_version += 1
+    notify_change()
+    try:
+        cached_articles_version = dashboard_cache.save_articles(current_articles)
+    except sqlite3.Error:
+        logger.exception("News articles could not be saved to the cache")
+
+    return current_articles
+
+
+def load_cached_articles() -> list:
+    """
+    A function that loads the News articles saved by the last update of the News articles, allowing
+    articles to be displayed before a new request completes.
+
+    Args:
+        None
+
+    Returns:
+        current_articles (list): A list of the cached articles
+    """
+    global current_articles
+    global news_version
+    global cached_articles_version
+    global articles_index
+    try:
+        cached_articles_version = dashboard_cache.get_version("articles")
+        cached_articles = dashboard_cache.load_articles()
+    except sqlite3.Error:
+        logger.exception("News articles could not be loaded from the cache")
+        cached_articles = []
+    if cached_articles:
+        logger.info("News articles loaded from the cache")
+        index = NearDuplicateIndex()
+        current_articles = collapse_near_duplicates(cached_articles, index)
+        articles_index = index
+        # The pages the cached articles were gathered from aren't kept; any gathered again while
+        # topping up the pool add nothing and are passed over
+        refill_article_pool(current_articles, 1)
+        news_version += 1
+        notify_change()
+    return current_articles
+
+
+def sync_cached_articles() -> list:
+    """
+    A function that loads the cached News articles should another process have saved newer articles
+    since this process last loaded or saved them.
+
+    Args:
+        None
+
+    Returns:
+        current_articles (list): A list of the current articles
+    """
+    try:
+        changed = dashboard_cache.get_version("articles") != cached_articles_version
+    except sqlite3.Error:
+        logger.exception("News articles version could not be read from the cache")
+        changed = False
+    if changed:
+        return load_cached_articles()
+    return current_articles
+
+
+def load_deleted_articles() -> set:
+    """
+    A function that loads the titles of deleted articles from the deleted articles file into memory
+    the first time it is called, compacting the file should it hold repeated titles. Later calls
+    return the titles already loaded.
+
+    Args:
+        None
+
+    Returns:
+        deleted_articles (set): A set of the titles of all deleted articles
+    """
+    global deleted_articles
+    global deleted_articles_position
+    if deleted_articles is not None:
+        return deleted_articles
+    try:
+        with open('deleted_articles.txt', 'rb') as del_art_file:
+            content = del_art_file.read()
+            deleted_articles_position = (os.fstat(del_art_file.fileno()).st_ino, len(content))
+        titles = content.decode().splitlines()
+    except FileNotFoundError:
+        logger.warning("No deleted_articles file found: it will be created on the first deletion")
+        deleted_articles_position = None
+        titles = []
+    deleted_articles = set(titles)
+    if len(titles) > len(deleted_articles):
+        compact_deleted_articles()
+    return deleted_articles
+
+
+def sync_deleted_articles() -> set:
+    """
+    A function that reads the titles deleted by other processes since the deleted articles file was
+    last read, reading the whole file again should it have been replaced by a compaction.
+
+    Args:
+        None
+
+    Returns:
+        deleted_articles (set): A set of the titles of all deleted articles
+    """
+    global deleted_articles
+    global deleted_articles_position
+    global news_version
+    deleted_titles = load_deleted_articles()
     try:
-        with open('deleted_articles.txt') as del_art_file:
-            deleted_articles = del_art_file.read().splitlines()
+        with open('deleted_articles.txt', 'rb') as del_art_file:
+            stat = os.fstat(del_art_file.fileno())
+            if deleted_articles_position is None:
+                inode, offset = stat.st_ino, 0
+            else:
+                inode, offset = deleted_articles_position
+            if inode != stat.st_ino or stat.st_size < offset:
+                logger.info("deleted_articles file replaced: reloading deleted articles")
+                deleted_articles = None
+                deleted_titles = load_deleted_articles()
+                suppress_near_duplicates(deleted_titles)
+                replace_deleted_articles()
+                news_version += 1
+                notify_change()
+                return deleted_titles
+            del_art_file.seek(offset)
+            content = del_art_file.read()
     except FileNotFoundError:
-        deleted_articles = []
-    # Removes already deleted articles from the current articles
-    for i in range(0, len(deleted_articles)):
-        for j in range(0, len(current_articles)):
+        return deleted_titles
+    # Only whole lines are read, as another process may be part way through appending a title
+    content = content[:content.rfind(b"\n") + 1]
+    deleted_articles_position = (inode, offset + len(content))
+    new_titles = set(content.decode().splitlines()) - deleted_titles
+    if new_titles:
+        logger.info("%s articles deleted by other processes", len(new_titles))
+        deleted_titles.update(new_titles)
+        suppress_near_duplicates(new_titles)
+        replace_deleted_articles()
+        news_version += 1
+        notify_change()
+    return deleted_titles
+
+
+def article_sketch(article: Article) -> Sketch:
+    """
+    A function that gives the sketch of the MinHash signature of an article's title and
+    description.
+
+    Args:
+        article (Article): The article
+
+    Returns:
+        sketch (Sketch): The sketch of the article's signature
+    """
+    return sketch(article.title, article.description)
+
+
+def is_dismissed(article: Article, deleted_titles: set) -> bool:
+    """
+    A function that gives whether an article has been deleted or nearly duplicates a deleted
+    article.
+
+    Args:
+        article (Article): The article
+        deleted_titles (set): A set of the titles of all deleted articles
+
+    Returns:
+        dismissed (bool): Whether the article is not to be displayed
+    """
+    return article.title in deleted_titles or \
+        deleted_index.match(article_sketch(article)) is not None
+
+
+def collapse_near_duplicates(articles: list, index: NearDuplicateIndex) -> list:
+    """
+    A function that removes any deleted articles from a list of articles, along with any nearly
+    duplicating a deleted article, an article earlier in the list or an article in the given index.
+    The articles kept are added to the index. Each article is only compared with the few articles
+    sharing one of its index buckets.
+
+    Args:
+        articles (list): A list of News articles, ranked best first
+        index (NearDuplicateIndex): An index of the articles already held
+
+    Returns:
+        articles (list): A new list of the articles kept
+    """
+    deleted_titles = load_deleted_articles()
+    sketches = [article_sketch(article) for article in articles]
+    # Deleted articles gathered again are indexed first such that copies ranked above them go too;
+    # copies of stories already indexed are left out, keeping the index's buckets small
+    for article, minhash in zip(articles, sketches):
+        if article.title in deleted_titles and article.title not in deleted_index and \
+                deleted_index.match(minhash) is None:
+            deleted_index.add(article.title, minhash)
+    kept = []
+    for article, minhash in zip(articles, sketches):
+        if article.title in deleted_titles or \
+                deleted_index.match(minhash) is not None or \
+                index.match(minhash) is not None:
+            continue
+        index.add(article.title, minhash)
+        kept.append(article)
+    if len(kept) < len(articles):
+        logger.info("%s deleted or near duplicate articles removed", len(articles) - len(kept))
+    return kept
+
+
+def suppress_near_duplicates(titles: set) -> None:
+    """
+    A function that indexes the sketches of newly deleted articles, such that their near
+    duplicates are no longer displayed. Deleted articles are usually displayed, so the displayed
+    articles are searched before the rest of the current articles.
+
+    Args:
+        titles (set): A set of the titles of the newly deleted articles
+
+    Returns:
+        None
+    """
+    with pool_lock:
+        found = [article for article in displayed_articles if article.title in titles]
+    if len(found) < len(titles):
+        found += [article for article in current_articles if article.title in titles]
+    for article in found:
+        minhash = article_sketch(article)
+        if deleted_index.match(minhash) is None:
+            deleted_index.add(article.title, minhash)
+
+
+def delete_article(title: str) -> None:
+    """
+    A function that marks an article as deleted by adding its title to the deleted articles and
+    appending it to the end of the deleted articles file. Its near duplicates are no longer
+    displayed either.
+
+    Args:
+        title (str): The title of the article to be deleted
+
+    Returns:
+        None
+    """
+    global news_version
+    deleted_titles = load_deleted_articles()
+    if title in deleted_titles:
+        return
+    logger.info("Article deleted: %s", title)
+    deleted_titles.add(title)
+    with lock_deleted_articles(), open('deleted_articles.txt', 'a') as del_art_file:
+        del_art_file.write(title + "\n")
+    suppress_near_duplicates({title})
+    replace_deleted_articles()
+    news_version += 1
+    notify_change()
+
+
+def fill_displayed_articles() -> None:
+    """
+    A function that moves articles from the front of the pool to the displayed articles until the
+    configured Articles Displayed are shown, skipping any deleted, or nearly duplicating a deleted
+    article, since they were pooled. It must be called holding the pool lock.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    deleted_titles = load_deleted_articles()
+    while len(displayed_articles) < config_data["Articles Displayed"] and article_pool:
+        article = article_pool.popleft()
+        if not is_dismissed(article, deleted_titles):
+            displayed_articles.append(article)
+
+
+def refill_article_pool(articles: list, page: int) -> None:
+    """
+    A function that displays the first of the newly gathered or loaded articles and pools the rest,
+    discarding the articles previously displayed and pooled.
+
+    Args:
+        articles (list): A list of the articles, none of which are deleted
+        page (int): The last page of articles gathered by each query for the articles
+
+    Returns:
+        None
+    """
+    global pool_generation
+    global news_page
+    global pool_exhausted
+    global top_up_failures
+    global top_up_retry_at
+    with pool_lock:
+        pool_generation += 1
+        displayed_articles.clear()
+        article_pool.clear()
+        article_pool.extend(articles)
+        fill_displayed_articles()
+        news_page = page
+        pool_exhausted = False
+        top_up_failures = 0
+        top_up_retry_at = 0.0
+    top_up_if_low()
+
+
+def replace_deleted_articles() -> None:
+    """
+    A function that removes any deleted articles, and near duplicates of deleted articles, from
+    those displayed, replacing each with the next article in the pool, and starts a top up should
+    the pool have run low. Only the few displayed articles are checked, as pooled articles are
+    skipped as they leave the pool.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    deleted_titles = load_deleted_articles()
+    with pool_lock:
+        displayed_articles[:] = [article for article in displayed_articles
+                                 if not is_dismissed(article, deleted_titles)]
+        fill_displayed_articles()
+    top_up_if_low()
+
+
+def top_up_if_low() -> None:
+    """
+    A function that starts topping up the pool in the background should fewer than the configured
+    Article Pool Watermark articles remain in it, unless a top up is already in progress, the last
+    found no further articles or the last failed too recently to be retried.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    if len(article_pool) >= config_data["Article Pool Watermark"] or pool_exhausted or \
+            time.time() < top_up_retry_at:
+        return
+    if not top_up_lock.acquire(blocking=False):
+        return
+    threading.Thread(target=top_up_article_pool, args=(news_terms, news_page + 1,
+                                                       pool_generation), daemon=True).start()
+
+
+def top_up_article_pool(covid_terms: str, page: int, generation: int) -> None:
+    """
+    A function run in the background which gathers the next page of articles and adds those not
+    deleted, already held or nearly duplicating either to the end of the pool, saving them with the
+    current articles such that other processes may use them too. Should the pool have been refilled
+    in the meantime the page is discarded, and should the page hold only articles already held the
+    next page is gathered in turn. Should the top up fail, it is retried after a backoff.
+
+    Args:
+        covid_terms (str): A string of words used to filter what articles are gathered
+        page (int): The page of articles to be gathered
+        generation (int): The pool generation the top up was started from
+
+    Returns:
+        None
+    """
+    global current_articles
+    global news_version
+    global cached_articles_version
+    global news_page
+    global pool_exhausted
+    global top_up_failures
+    index = articles_index
+    articles = new_articles = []
+    failed = False
+    try:
+        logger.info("Topping up the article pool from page %s", page)
+        articles = aggregate_news(covid_terms, page)
+        held_titles = {article.title for article in current_articles}
+        new_articles = collapse_near_duplicates(
+            [article for article in articles if article.title not in held_titles], index)
+        with pool_lock:
+            if generation != pool_generation:
+                return
+            news_page = page
+            pool_exhausted = not articles
+            top_up_failures = 0
+            current_articles = current_articles + new_articles
+            article_pool.extend(new_articles)
+            displayed_count = len(displayed_articles)
+            fill_displayed_articles()
+            changed = len(displayed_articles) != displayed_count
+        if changed:
+            news_version += 1
+            notify_change()
+        if new_articles:
             try:
-                if (current_articles[j]["title"]) == deleted_articles[i]:
-                    del current_articles[j]
-            except IndexError:
-                break
+                cached_articles_version = dashboard_cache.save_articles(current_articles)
+            except sqlite3.Error:
+                logger.exception("News articles could not be saved to the cache")
+    except Exception:
+        logger.exception("Article pool could not be topped up from page %s", page)
+        failed = True
+    finally:
+        top_up_lock.release()
+    if failed:
+        retry_top_up()
+    # A page holding only articles already held is passed over for the next
+    elif articles and not new_articles:
+        top_up_if_low()
 
-    return current_articles
+
+def retry_top_up() -> None:
+    """
+    A function that schedules a failed top up to be tried again, waiting twice as long after each
+    failure in a row from the configured Retry Backoff Seconds up to the configured Circuit Reset
+    Seconds.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global top_up_failures
+    global top_up_retry_at
+    with pool_lock:
+        top_up_failures += 1
+        delay = min(config_data["Retry Backoff Seconds"] * 2 ** top_up_failures,
+                    config_data["Circuit Reset Seconds"])
+        top_up_retry_at = time.time() + delay
+    logger.info("Retrying the article pool top up in %.2f seconds", delay)
+    schedule_job(("News", "pool top up"), top_up_retry_at, top_up_if_low)
+
+
+def lock_deleted_articles():
+    """
+    A function that takes a lock on the deleted articles file shared by all worker processes, held
+    until the returned file is closed, such that no title appended by one process is lost to another
+    compacting the file. Where file locks aren't supported the returned file holds no lock.
+
+    Args:
+        None
+
+    Returns:
+        lock_file (file): The open lock file
+    """
+    lock_file = open('deleted_articles.txt.lock', 'a')
+    if fcntl is not None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
 
 
-def schedule_news_updates(update_interval: str, update_name: str) -> None:
+def compact_deleted_articles() -> None:
+    """
+    A function that rewrites the deleted articles file such that it holds each deleted title once,
+    replacing the old file only once the new one is complete. The file is read again holding the
+    lock, such that titles appended by other processes since it was loaded are kept, and should
+    another process have compacted it already it is left as it is.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global deleted_articles_position
+    with lock_deleted_articles():
+        try:
+            with open('deleted_articles.txt', 'rb') as del_art_file:
+                titles = del_art_file.read().decode().splitlines()
+        except FileNotFoundError:
+            return
+        unique_titles = dict.fromkeys(titles)
+        if len(unique_titles) < len(titles):
+            logger.info("Compacting deleted_articles file")
+            temporary_file = 'deleted_articles.txt.' + str(os.getpid()) + '.tmp'
+            with open(temporary_file, 'w') as del_art_file:
+                for title in unique_titles:
+                    del_art_file.write(title + "\n")
+            os.replace(temporary_file, 'deleted_articles.txt')
+        deleted_articles.update(unique_titles)
+        stat = os.stat('deleted_articles.txt')
+        deleted_articles_position = (stat.st_ino, stat.st_size)
+
+
+def schedule_news_updates(update_interval: str, update_name: str,
+                          repeat: bool = False, run_at: float = None) -> None:
     """
     A function used to schedule a News update with the given name at the given date.
 
     Args:
         update_interval (str): The time for the update to be scheduled to in the form 12:15
         update_name (str): The name of the update to be scheduled
+        repeat (bool): Whether the update is to be repeated daily at the same time
+        run_at (float): The time of the first update in seconds since the epoch, used for updates
+            requested without a time; defaults to the next time matching update_interval
 
     Returns:
         None
     """
-    logger.info("News update " + update_name + " scheduled for " + update_interval)
+    logger.info("News update %s scheduled for %s", update_name, update_interval)
     global updates
-    global schedule
-    # Gathers the current time
-    current_hour = int(time.gmtime().tm_hour)
-    current_minute = int(time.gmtime().tm_min)
-    current_second = int(time.gmtime().tm_sec)
-    # Converts the time given by update_interval into an integer in seconds
-    update_hour = update_interval[0:2]
-    update_minute = update_interval[3:]
-    update_hour = int(update_hour)
-    update_minute = int(update_minute)
-    # Calculates the time in seconds until the scheduled time
-    timer = ((update_hour - current_hour) * 3600) + (
-        (update_minute - current_minute) * 60) - current_second
-    if timer < 0:
-        timer += 24 * 3600
-    updates[update_name] = schedule.enter(timer, 1, update_news,
-                                          argument=(config_data["News Terms"],))
-    schedule.run(blocking=False)
+    argument = (config_data["News Terms"],)
+    if repeat:
+        updates[update_name] = schedule_daily_job(("News", update_name), update_interval,
+                                                  update_news, argument, run_at=run_at)
+    else:
+        if run_at is None:
+            run_at = next_time_at(update_interval)
+        updates[update_name] = schedule_job(("News", update_name), run_at, run_news_update,
+                                            (update_name,) + argument)
+
+
+def run_news_update(update_name: str, covid_terms: str) -> None:
+    """
+    A function run by the scheduler for a News update which isn't repeated, removing the update
+    from the updates once it has fallen due before gathering the News articles.
+
+    Args:
+        update_name (str): The name of the update
+        covid_terms (str): The terms the articles are searched for by
+
+    Returns:
+        None
+    """
+    # An update of the same name scheduled since this one fell due is kept
+    if not is_scheduled(("News", update_name)):
+        updates.pop(update_name, None)
+    update_news(covid_terms)
 
 
 def get_news_articles() -> list:
     """
-    A function used in the main file to access current news articles from this module.
+    A function used in the main file to access the displayed news articles from this module.
 
     Args:
         None
 
     Returns:
-        current_articles (list): A list of dictionaries containing current news articles
+        displayed_articles (list): A list of the displayed news articles
     """
-    global current_articles
     logger.info("News data requested")
-    schedule.run(blocking=False)
-    try:
-        with open('deleted_articles.txt') as del_art_file:
-            deleted_articles = del_art_file.read().splitlines()
-    except FileNotFoundError:
-        deleted_articles = []
-    # Removes already deleted articles from the current articles
-    for i in range(0, len(deleted_articles)):
-        for j in range(0, len(current_articles)):
-            try:
-                if (current_articles[j]["title"]) == deleted_articles[i]:
-                    del current_articles[j]
-            except IndexError:
-                break
-
-    return current_articles
+    with pool_lock:
+        return list(displayed_articles)
 
 
 def cancel_news_update(update_name: str) -> None:
@@ -157,6 +738,5 @@ def cancel_news_update(update_name: str) -> None:
     """
     logger.info("News update %s cancelled", update_name)
     global updates
-    global schedule
-    schedule.cancel(updates[update_name])
-    del updates[update_name]
+    cancel_job(("News", update_name))
+    updates.pop(update_name, None)
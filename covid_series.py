@@ -0,0 +1,429 @@
+"""
+This module provides a compact store for Covid time series data. The data for each area is held as
+a dense run of consecutive days with one numeric array per metric, such that any day can be found
+by its offset from the first day held and totals over a window of days can be read from prefix sums
+rather than by summing the window each time.
+
+Attributes:
+    MISSING (float): The value stored for days on which a metric has no data
+"""
+
+import math
+from array import array
+from datetime import date, timedelta
+
+MISSING = math.nan
+
+
+def to_date(day) -> date:
+    """
+    A function that converts a day given either as a date or as an ISO date string into a date.
+
+    Args:
+        day (date or str): The day to be converted, e.g. 2021-10-28
+
+    Returns:
+        day (date): The day as a date
+    """
+    if isinstance(day, str):
+        return date.fromisoformat(day)
+    return day
+
+
+class CovidSeries:
+    """
+    A dense, array backed time series of Covid metrics for a single area.
+
+    Attributes:
+        area_name (str): The name of the area the series belongs to
+        start (date): The first day held in the series, None if the series is empty
+        columns (dict): A dictionary mapping each metric name to an array of its daily values, with
+            days that have no data holding MISSING
+    """
+
+    def __init__(self, area_name: str, metrics: list, start: date = None) -> None:
+        self.area_name = area_name
+        self.start = start
+        self.columns = {metric: array('d') for metric in metrics}
+        self._prefix_sums = {}
+
+    @classmethod
+    def from_records(cls, records: list, metrics: list, area_name: str = "") -> "CovidSeries":
+        """
+        A function that builds a series from a list of records as returned by the Covid API, each a
+        dictionary holding a date and a value for some of the given metrics. The records may be in
+        any order and days with no record are held as missing.
+
+        Args:
+            records (list): A list of dictionaries each containing a date and metric values
+            metrics (list): The names of the metrics to be held in the series
+            area_name (str): The name of the area, used should the records not contain one
+
+        Returns:
+            series (CovidSeries): A series holding the data from the records
+        """
+        if records:
+            area_name = records[0].get("areaName", area_name)
+        days = array('l', [date.fromisoformat(record["date"]).toordinal() for record in records])
+        columns = {}
+        for metric in metrics:
+            columns[metric] = array('d', [MISSING if record.get(metric) is None
+                                          else record[metric] for record in records])
+        return cls.from_columns(area_name, days, columns)
+
+    @classmethod
+    def from_columns(cls, area_name: str, days: array, columns: dict) -> "CovidSeries":
+        """
+        A function that builds a series from parallel arrays of days and metric values. The days may
+        be in any order and days with no value are held as missing.
+
+        Args:
+            area_name (str): The name of the area
+            days (array): An array of the days of each value as date ordinals
+            columns (dict): A dictionary mapping each metric name to an array of its values
+
+        Returns:
+            series (CovidSeries): A series holding the data from the arrays
+        """
+        series = cls(area_name, list(columns))
+        if not days:
+            return series
+        # Finds the span of days covered so that each column is allocated once
+        first_day = min(days)
+        length = max(days) - first_day + 1
+        series.start = date.fromordinal(first_day)
+        for metric, values in columns.items():
+            column = array('d', [MISSING]) * length
+            for day, value in zip(days, values):
+                if not math.isnan(value):
+                    column[day - first_day] = value
+            series.columns[metric] = column
+        return series
+
+    def copy(self) -> "CovidSeries":
+        """
+        A function that gives a copy of the series which can be changed without affecting it.
+
+        Args:
+            None
+
+        Returns:
+            series (CovidSeries): A copy of the series
+        """
+        series = CovidSeries(self.area_name, [], self.start)
+        series.columns = {metric: array('d', column) for metric, column in self.columns.items()}
+        return series
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CovidSeries):
+            return NotImplemented
+        # Compares the raw bytes of the columns as missing values never equal one another
+        return (self.area_name, self.start, list(self.columns)) == \
+            (other.area_name, other.start, list(other.columns)) and \
+            all(column.tobytes() == other.columns[metric].tobytes()
+                for metric, column in self.columns.items())
+
+    def __len__(self) -> int:
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    @property
+    def end(self) -> date:
+        """
+        The last day held in the series, None if the series is empty.
+        """
+        if self.start is None or not len(self):
+            return None
+        return self.start + timedelta(len(self) - 1)
+
+    def offset(self, day) -> int:
+        """
+        A function that gives the position of a day within the series' arrays.
+
+        Args:
+            day (date or str): The day to be found
+
+        Returns:
+            offset (int): The index of the day, which may be outside the bounds of the series
+        """
+        return (to_date(day) - self.start).days
+
+    def append(self, day, record: dict) -> None:
+        """
+        A function that adds a day's values to the end of the series. Any days skipped between the
+        current end of the series and the given day are held as missing.
+
+        Args:
+            day (date or str): The day the values belong to, which must be after the current end
+            record (dict): A dictionary mapping metric names to their values on that day
+
+        Returns:
+            None
+        """
+        day = to_date(day)
+        if self.start is None:
+            self.start = day
+        gap = self.offset(day) - len(self)
+        if gap < 0:
+            raise ValueError("Cannot append " + str(day) + " before the end of the series")
+        for metric, column in self.columns.items():
+            if gap:
+                column.extend(array('d', [MISSING]) * gap)
+            value = record.get(metric)
+            column.append(MISSING if value is None else value)
+        self._prefix_sums = {}
+
+    def merge_records(self, records: list) -> None:
+        """
+        A function that merges a list of records as returned by the Covid API into the series. The
+        series is extended to cover any days outside it and the values for days already held are
+        replaced, allowing late corrections to earlier days to be taken in.
+
+        Args:
+            records (list): A list of dictionaries each containing a date and metric values
+
+        Returns:
+            None
+        """
+        if not records:
+            return
+        days = [date.fromisoformat(record["date"]) for record in records]
+        first_day = min(days)
+        if self.start is None:
+            self.start = first_day
+        lead = (self.start - first_day).days
+        if lead > 0:
+            for metric, column in self.columns.items():
+                self.columns[metric] = array('d', [MISSING]) * lead + column
+            self.start = first_day
+        trail = self.offset(max(days)) + 1 - len(self)
+        if trail > 0:
+            for column in self.columns.values():
+                column.extend(array('d', [MISSING]) * trail)
+        for day, record in zip(days, records):
+            offset = self.offset(day)
+            for metric, column in self.columns.items():
+                value = record.get(metric)
+                if value is not None:
+                    column[offset] = value
+        self._prefix_sums = {}
+
+    def value(self, metric: str, day):
+        """
+        A function that gives the value of a metric on a given day.
+
+        Args:
+            metric (str): The name of the metric
+            day (date or str): The day of the value
+
+        Returns:
+            value (int): The value of the metric, None if there is no data for that day
+        """
+        if self.start is None:
+            return None
+        offset = self.offset(day)
+        column = self.columns[metric]
+        if offset < 0 or offset >= len(column) or math.isnan(column[offset]):
+            return None
+        return int(column[offset])
+
+    def window_sum(self, metric: str, end_day, days: int) -> int:
+        """
+        A function that gives the total of a metric over a number of days ending on the given day.
+        Days with no data count as zero.
+
+        Args:
+            metric (str): The name of the metric
+            end_day (date or str): The last day of the window, inclusive
+            days (int): The number of days in the window
+
+        Returns:
+            total (int): The total of the metric over the window
+        """
+        if self.start is None:
+            return 0
+        prefix_sums = self._prefix_sums.get(metric)
+        if prefix_sums is None:
+            prefix_sums = array('d', [0.0])
+            total = 0.0
+            for value in self.columns[metric]:
+                if not math.isnan(value):
+                    total += value
+                prefix_sums.append(total)
+            self._prefix_sums[metric] = prefix_sums
+        stop = self.offset(end_day) + 1
+        begin = stop - days
+        stop = min(max(stop, 0), len(prefix_sums) - 1)
+        begin = min(max(begin, 0), stop)
+        return int(prefix_sums[stop] - prefix_sums[begin])
+
+    def latest_date(self, metric: str) -> date:
+        """
+        A function that gives the last day on which a metric has data.
+
+        Args:
+            metric (str): The name of the metric
+
+        Returns:
+            day (date): The last day with data for the metric, None if there is none
+        """
+        column = self.columns[metric]
+        for offset in range(len(column) - 1, -1, -1):
+            if not math.isnan(column[offset]):
+                return self.start + timedelta(offset)
+        return None
+
+
+class SeriesBuilder:
+    """
+    A builder which fills the arrays of a series one day at a time, such as from the rows of a CSV
+    file, without holding the values anywhere else. Days may come in ascending or descending order;
+    either way they are added to the end of the arrays, which are reversed in place once built
+    should the days have been descending. Days out of order are written in place.
+
+    Attributes:
+        series (CovidSeries): The series being filled
+        first (int): The ordinal of the day at the front of the arrays, None until a day is added
+        last (int): The ordinal of the day at the end of the arrays
+        step (int): 1 should the days be ascending and -1 should they be descending, None until two
+            different days are added
+    """
+
+    def __init__(self, area_name: str, metrics: list) -> None:
+        self.series = CovidSeries(area_name, metrics)
+        self.first = None
+        self.last = None
+        self.step = None
+
+    def add(self, day: int, values: list) -> None:
+        """
+        A function that adds a day's values to the series.
+
+        Args:
+            day (int): The ordinal of the day the values belong to
+            values (list): The value of each metric, in the order the metrics were given, with
+                MISSING for those without data
+
+        Returns:
+            None
+        """
+        columns = self.series.columns
+        if self.first is None:
+            self.first = self.last = day
+            for column, value in zip(columns.values(), values):
+                column.append(value)
+            return
+        if self.step is None and day != self.first:
+            self.step = 1 if day > self.first else -1
+        step = self.step or 1
+        gap = (day - self.last) * step
+        if gap > 0:
+            for column, value in zip(columns.values(), values):
+                if gap > 1:
+                    column.extend(array('d', [MISSING]) * (gap - 1))
+                column.append(value)
+            self.last = day
+            return
+        offset = (day - self.first) * step
+        if offset < 0:
+            for metric, column in columns.items():
+                columns[metric] = array('d', [MISSING]) * -offset + column
+            self.first = day
+            offset = 0
+        for column, value in zip(columns.values(), values):
+            if not math.isnan(value):
+                column[offset] = value
+
+    def build(self) -> CovidSeries:
+        """
+        A function that gives the series filled, which the builder must no longer be used after.
+
+        Args:
+            None
+
+        Returns:
+            series (CovidSeries): The series holding every day added
+        """
+        if self.first is None:
+            return self.series
+        if self.step == -1:
+            for column in self.series.columns.values():
+                column.reverse()
+            self.series.start = date.fromordinal(self.last)
+        else:
+            self.series.start = date.fromordinal(self.first)
+        return self.series
+
+
+def align_series(series_list: list, metrics: list) -> tuple:
+    """
+    A function that aligns a metric from each of any number of series onto a common run of days,
+    from the earliest first day to the latest last day of the series, such that the same index in
+    every returned array refers to the same day. Days a series doesn't cover are held as missing.
+
+    Args:
+        series_list (list): A list of CovidSeries to be aligned
+        metrics (list): A list of the metric to be aligned from each series, in the same order
+
+    Returns:
+        start (date): The first day of the aligned arrays, None if every series is empty
+        columns (list): A list of arrays holding the aligned metric of each series
+    """
+    held = [series for series in series_list if len(series)]
+    if not held:
+        return None, [array('d') for _ in series_list]
+    start = min(series.start for series in held)
+    end = max(series.end for series in held)
+    length = (end - start).days + 1
+    columns = []
+    for series, metric in zip(series_list, metrics):
+        if not len(series):
+            columns.append(array('d', [MISSING]) * length)
+            continue
+        lead = (series.start - start).days
+        trail = length - lead - len(series)
+        columns.append(array('d', [MISSING]) * lead + series.columns[metric] +
+                       array('d', [MISSING]) * trail)
+    return start, columns
+
+
+def missing_days(start: date, columns: list) -> list:
+    """
+    A function that lists the days on which any of a set of aligned arrays has no data.
+
+    Args:
+        start (date): The first day of the aligned arrays
+        columns (list): A list of aligned arrays as returned by align_series
+
+    Returns:
+        missing (list): A list of (day, indices) tuples giving each day with missing data and the
+            indices of the arrays missing it
+    """
+    missing = []
+    for offset, values in enumerate(zip(*columns)):
+        absent = [index for index, value in enumerate(values) if math.isnan(value)]
+        if absent:
+            missing.append((start + timedelta(offset), absent))
+    return missing
+
+
+def latest_common_day(series_list: list, metrics: list) -> date:
+    """
+    A function that gives the last day on which every one of a set of series has data for its
+    metric, such as the latest day published for both a local area and the nation.
+
+    Args:
+        series_list (list): A list of CovidSeries
+        metrics (list): A list of the metric to be checked in each series, in the same order
+
+    Returns:
+        day (date): The last day with data in every series, None if there is no such day
+    """
+    start, columns = align_series(series_list, metrics)
+    if start is None:
+        return None
+    for offset in range(len(columns[0]) - 1, -1, -1):
+        if not any(math.isnan(column[offset]) for column in columns):
+            return start + timedelta(offset)
+    return None
@@ -0,0 +1,143 @@
+"""
+This module provides the JSON resources served by the dashboard's API, allowing clients to poll for
+the Covid metrics, the News articles and the scheduled updates rather than reloading the whole page.
+Each resource's body is built once per version of its data, along with an ETag, such that a client
+already holding the current version can be answered with 304 Not Modified and no body at all.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    resources (dict): A dictionary mapping each resource's name to the function building its data
+    responses (dict): A dictionary mapping each resource's name to the version, body and ETag of its
+        last built response
+"""
+
+import logging
+import hashlib
+import json
+
+logger = logging.getLogger(__name__)
+responses = {}
+
+
+def metrics_data(current_snapshot, updates: list) -> dict:
+    """
+    A function that gives the Covid metrics displayed on the dashboard for each area.
+
+    Args:
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+
+    Returns:
+        metrics (dict): A dictionary mapping local and national to the metrics of each area, and
+            trends to a list of the trend indicators
+    """
+    return {"local": {"area": current_snapshot.location,
+                      "7day_infections": current_snapshot.local_7day_infections},
+            "national": {"area": current_snapshot.nation_location,
+                         "7day_infections": current_snapshot.national_7day_infections,
+                         "hospital_cases": current_snapshot.hospital_cases,
+                         "deaths_total": current_snapshot.deaths_total},
+            "trends": [dict(trend) for trend in current_snapshot.trends]}
+
+
+def news_data(current_snapshot, updates: list) -> list:
+    """
+    A function that gives the News articles displayed on the dashboard.
+
+    Args:
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+
+    Returns:
+        articles (list): A list of dictionaries containing the title and content of each article
+    """
+    return [dict(article) for article in current_snapshot.news_articles]
+
+
+def updates_data(current_snapshot, updates: list) -> list:
+    """
+    A function that gives the scheduled updates displayed on the dashboard.
+
+    Args:
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+
+    Returns:
+        updates (list): A list of dictionaries containing the title and content of each update
+    """
+    return [{"title": update["title"], "content": update["content"]} for update in updates]
+
+
+resources = {"metrics": metrics_data, "news": news_data, "updates": updates_data}
+
+
+def resource_version(name: str, current_snapshot, updates: list, updates_version=None) -> tuple:
+    """
+    A function that gives the version of the data a resource is built from.
+
+    Args:
+        name (str): The name of the resource
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+        updates_version: A value which changes whenever the updates change, sparing the updates
+            being compared; defaults to their titles and contents
+
+    Returns:
+        version (tuple): A value which changes whenever the resource's data changes
+    """
+    if name == "updates":
+        if updates_version is not None:
+            return updates_version
+        return tuple((update["title"], update["content"]) for update in updates)
+    return current_snapshot.version
+
+
+def get_resource(name: str, current_snapshot, updates: list, updates_version=None) -> tuple:
+    """
+    A function that gives the JSON body and ETag of a resource, building them only should the
+    resource's data have changed since they were last built. The ETag is a hash of the body, such
+    that every worker process serving the same data gives the same ETag.
+
+    Args:
+        name (str): The name of the resource, one of metrics, news or updates
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+        updates_version: A value which changes whenever the updates change, see resource_version
+
+    Returns:
+        response (tuple): The body (bytes) and ETag (str) of the resource, None should there be no
+            resource with the given name
+    """
+    if name not in resources:
+        return None
+    version = resource_version(name, current_snapshot, updates, updates_version)
+    response = responses.get(name)
+    if response is None or response[0] != version:
+        logger.info("Building %s resource for version %s", name, version)
+        body = json.dumps(resources[name](current_snapshot, updates)).encode()
+        response = responses[name] = (version, body,
+                                      '"' + hashlib.sha1(body).hexdigest() + '"')
+    return response[1], response[2]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    A function that gives whether a request's If-None-Match header matches a resource's ETag, in
+    which case the client already holds the current version of the resource.
+
+    Args:
+        if_none_match (str): The value of the If-None-Match header, None should there be none
+        etag (str): The current ETag of the resource
+
+    Returns:
+        matches (bool): Whether the client's version of the resource is current
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in ("*", etag):
+            return True
+    return False
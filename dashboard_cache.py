@@ -0,0 +1,276 @@
+"""
+This module keeps a persistent copy of the last Covid data and News articles gathered in a local
+SQLite file, such that the dashboard can be served from it immediately on startup while fresh data
+is gathered in the background. The file also holds the scheduled updates and a version number for
+each kind of data, so that several worker processes serving the dashboard can share one set of data
+and updates, each noticing when another has changed it.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    connection (sqlite3.Connection): The connection to the cache file, None until first opened
+    connection_pid (int): The ID of the process which opened the connection, as a connection can't
+        be shared with processes forked from it
+    lock (threading.Lock): A lock used to prevent concurrent use of the connection
+    config_data (dict): A dictionary containing all the configurable variables from the config file
+"""
+
+import logging
+import json
+import os
+import sqlite3
+import threading
+from array import array
+from datetime import date
+from covid_series import CovidSeries
+from news_article import Article
+
+logger = logging.getLogger(__name__)
+connection = None
+connection_pid = None
+lock = threading.Lock()
+with open('config.json', 'r') as f:
+    config_data = json.load(f)
+
+
+def open_cache(cache_file: str = None) -> sqlite3.Connection:
+    """
+    A function that opens the cache file, creating it and its tables should they not exist, and
+    makes it the cache used by the other functions in this module.
+
+    Args:
+        cache_file (str): The name of the cache file; defaults to the configured Cache File
+
+    Returns:
+        connection (sqlite3.Connection): The connection to the cache file
+    """
+    global connection
+    global connection_pid
+    if cache_file is None:
+        cache_file = config_data["Cache File"]
+    logger.info("Opening cache file %s", cache_file)
+    with lock:
+        connection = sqlite3.connect(cache_file, timeout=10, check_same_thread=False)
+        connection_pid = os.getpid()
+        # Allows worker processes to read while another process writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS series_columns (key TEXT, metric TEXT, "
+                           "area_name TEXT, start INTEGER, data BLOB, PRIMARY KEY (key, metric))")
+        connection.execute("CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, "
+                           "body TEXT)")
+        connection.execute("CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, "
+                           "version INTEGER)")
+        connection.execute("CREATE TABLE IF NOT EXISTS updates (title TEXT PRIMARY KEY, "
+                           "content TEXT, kind TEXT, update_time TEXT, repeat INTEGER, "
+                           "run_at REAL)")
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(updates)")]
+        if "run_at" not in columns:
+            try:
+                connection.execute("ALTER TABLE updates ADD COLUMN run_at REAL")
+            except sqlite3.OperationalError:
+                # Another process added the column first
+                pass
+        connection.commit()
+    return connection
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    A function that gives the connection to the cache file, opening it should it not yet be open in
+    the current process.
+
+    Args:
+        None
+
+    Returns:
+        connection (sqlite3.Connection): The connection to the cache file
+    """
+    if connection is None or connection_pid != os.getpid():
+        open_cache()
+    return connection
+
+
+def bump_version(name: str) -> int:
+    """
+    A function that increases the version number of a kind of data, to be called within the same
+    transaction as the change to the data.
+
+    Args:
+        name (str): The kind of data, e.g. covid
+
+    Returns:
+        version (int): The new version number
+    """
+    connection.execute("INSERT INTO versions VALUES (?, 1) ON CONFLICT (name) DO UPDATE SET "
+                       "version = version + 1", (name,))
+    return connection.execute("SELECT version FROM versions WHERE name = ?",
+                              (name,)).fetchone()[0]
+
+
+def get_version(name: str) -> int:
+    """
+    A function that gives the version number of a kind of data, which changes whenever any process
+    changes the data.
+
+    Args:
+        name (str): The kind of data, e.g. covid
+
+    Returns:
+        version (int): The version number, 0 should the data never have been saved
+    """
+    get_connection()
+    with lock:
+        row = connection.execute("SELECT version FROM versions WHERE name = ?",
+                                 (name,)).fetchone()
+    return row[0] if row else 0
+
+
+def save_covid_data(covid_data: dict) -> int:
+    """
+    A function that replaces the cached Covid data with the given data, storing the raw bytes of
+    each series' arrays.
+
+    Args:
+        covid_data (dict): A dictionary mapping keys such as local and national to CovidSeries
+
+    Returns:
+        version (int): The new version number of the cached Covid data
+    """
+    get_connection()
+    rows = []
+    for key, series in covid_data.items():
+        start = series.start.toordinal() if series.start else None
+        for metric, column in series.columns.items():
+            rows.append((key, metric, series.area_name, start, column.tobytes()))
+    with lock:
+        with connection:
+            connection.execute("DELETE FROM series_columns")
+            connection.executemany("INSERT INTO series_columns VALUES (?, ?, ?, ?, ?)", rows)
+            return bump_version("covid")
+
+
+def load_covid_data() -> dict:
+    """
+    A function that loads the cached Covid data.
+
+    Args:
+        None
+
+    Returns:
+        covid_data (dict): A dictionary mapping keys such as local and national to CovidSeries,
+            empty should nothing be cached
+    """
+    get_connection()
+    with lock:
+        rows = connection.execute("SELECT key, metric, area_name, start, data FROM series_columns "
+                                  "ORDER BY rowid").fetchall()
+    covid_data = {}
+    for key, metric, area_name, start, data in rows:
+        series = covid_data.get(key)
+        if series is None:
+            series = covid_data[key] = CovidSeries(
+                area_name, [], date.fromordinal(start) if start is not None else None)
+        column = array('d')
+        column.frombytes(data)
+        series.columns[metric] = column
+    return covid_data
+
+
+def save_articles(articles: list) -> int:
+    """
+    A function that replaces the cached News articles with the given articles.
+
+    Args:
+        articles (list): A list of News articles, each an Article
+
+    Returns:
+        version (int): The new version number of the cached News articles
+    """
+    get_connection()
+    with lock:
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO documents VALUES ('articles', ?)",
+                               (json.dumps([article.to_json() for article in articles]),))
+            return bump_version("articles")
+
+
+def load_articles() -> list:
+    """
+    A function that loads the cached News articles.
+
+    Args:
+        None
+
+    Returns:
+        articles (list): A list of News articles, each an Article, empty should nothing be cached
+    """
+    get_connection()
+    with lock:
+        row = connection.execute("SELECT body FROM documents WHERE name = 'articles'").fetchone()
+    if row is None:
+        return []
+    return [Article.from_json(article) for article in json.loads(row[0])]
+
+
+def save_update(update: dict) -> int:
+    """
+    A function that adds a scheduled update shared by all worker processes.
+
+    Args:
+        update (dict): A dictionary holding the update's title, content, kind (Covid or News),
+            update_time, repeat flag and optionally the run_at time of an update requested without
+            a time
+
+    Returns:
+        version (int): The new version number of the scheduled updates
+
+    Raises:
+        sqlite3.IntegrityError: Should an update with the same title already be shared, e.g. by
+            another worker process
+    """
+    get_connection()
+    with lock:
+        with connection:
+            connection.execute("INSERT INTO updates (title, content, kind, update_time, repeat, "
+                               "run_at) VALUES (?, ?, ?, ?, ?, ?)",
+                               (update["title"], update["content"], update["kind"],
+                                update["update_time"], int(update["repeat"]),
+                                update.get("run_at")))
+            return bump_version("updates")
+
+
+def delete_update(title: str) -> int:
+    """
+    A function that removes a scheduled update shared by all worker processes.
+
+    Args:
+        title (str): The title of the update to be removed
+
+    Returns:
+        version (int): The new version number of the scheduled updates
+    """
+    get_connection()
+    with lock:
+        with connection:
+            connection.execute("DELETE FROM updates WHERE title = ?", (title,))
+            return bump_version("updates")
+
+
+def load_updates() -> list:
+    """
+    A function that loads the scheduled updates shared by all worker processes, in the order they
+    were scheduled.
+
+    Args:
+        None
+
+    Returns:
+        updates (list): A list of dictionaries each holding an update's title, content, kind,
+            update_time, repeat flag and run_at time
+    """
+    get_connection()
+    with lock:
+        rows = connection.execute("SELECT title, content, kind, update_time, repeat, run_at "
+                                  "FROM updates ORDER BY rowid").fetchall()
+    return [{"title": title, "content": content, "kind": kind, "update_time": update_time,
+             "repeat": bool(repeat), "run_at": run_at}
+            for title, content, kind, update_time, repeat, run_at in rows]
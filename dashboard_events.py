@@ -0,0 +1,134 @@
+"""
+This module pushes changes to the dashboard's data to connected clients as server-sent events, such
+that pages patch themselves in place as soon as the Covid data, News articles or scheduled updates
+change rather than every client reloading the page every minute. Whatever changes the data calls
+notify_change, waking every open event stream, which then sends only the JSON resources whose ETags
+differ from those it last sent.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    condition (threading.Condition): A condition notified on every change, waited upon by streams
+        served from threads
+    change_count (int): A count of the changes notified, used by streams to notice missed changes
+    listeners (set): A set of the event loops and asyncio events of the streams served by the
+        asynchronous app, each set on every change
+"""
+
+import logging
+import asyncio
+import threading
+from dashboard_api import get_resource, resources
+
+logger = logging.getLogger(__name__)
+condition = threading.Condition()
+change_count = 0
+listeners = set()
+
+
+def notify_change() -> None:
+    """
+    A function used to wake every open event stream after the dashboard's data has changed.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global change_count
+    with condition:
+        change_count += 1
+        condition.notify_all()
+    for loop, event in list(listeners):
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The stream's event loop has closed
+            listeners.discard((loop, event))
+
+
+def wait_for_change(last_count: int, timeout: float) -> int:
+    """
+    A function that waits until a change has been notified since the given count, or until the
+    timeout passes.
+
+    Args:
+        last_count (int): The change count when the stream last checked for changes
+        timeout (float): The most time in seconds to wait
+
+    Returns:
+        change_count (int): The current change count
+    """
+    with condition:
+        condition.wait_for(lambda: change_count != last_count, timeout)
+        return change_count
+
+
+def add_listener() -> tuple:
+    """
+    A function that registers an asyncio event, set on every change, for a stream served by the
+    asynchronous app. It must be called from within the stream's event loop.
+
+    Args:
+        None
+
+    Returns:
+        listener (tuple): The event loop and asyncio event, to be passed to remove_listener once
+            the stream closes
+    """
+    listener = (asyncio.get_running_loop(), asyncio.Event())
+    listeners.add(listener)
+    return listener
+
+
+def remove_listener(listener: tuple) -> None:
+    """
+    A function that stops notifying a closed stream's asyncio event of changes.
+
+    Args:
+        listener (tuple): The event loop and asyncio event given by add_listener
+
+    Returns:
+        None
+    """
+    listeners.discard(listener)
+
+
+def format_event(name: str, body: bytes, etag: str) -> bytes:
+    """
+    A function that formats a JSON resource as a server-sent event named after the resource, with
+    the resource's ETag as the event ID.
+
+    Args:
+        name (str): The name of the resource
+        body (bytes): The JSON body of the resource
+        etag (str): The ETag of the resource
+
+    Returns:
+        event (bytes): The encoded event
+    """
+    return b"event: " + name.encode() + b"\nid: " + etag.encode() + b"\ndata: " + body + b"\n\n"
+
+
+def changed_events(sent: dict, current_snapshot, updates: list, updates_version=None) -> bytes:
+    """
+    A function that gives the events for every resource which has changed since it was last sent to
+    a stream, recording the ETags of those sent.
+
+    Args:
+        sent (dict): A dictionary mapping the name of each resource to the ETag last sent to the
+            stream, updated by this function
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+        updates_version: A value which changes whenever the updates change, see resource_version
+
+    Returns:
+        events (bytes): The encoded events, empty should nothing have changed
+    """
+    events = []
+    for name in resources:
+        body, etag = get_resource(name, current_snapshot, updates, updates_version)
+        if sent.get(name) != etag:
+            sent[name] = etag
+            events.append(format_event(name, body, etag))
+    return b"".join(events)
@@ -0,0 +1,206 @@
+"""
+This module holds a precomputed snapshot of everything the dashboard displays. The snapshot is only
+rebuilt when the Covid data or the News articles change, so serving the dashboard is a lookup of the
+current snapshot and, where the scheduled updates are unchanged too, of the page already rendered
+from it.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    snapshot (DashboardSnapshot): The most recently built snapshot, None until first requested
+    render_cache (dict): A dictionary mapping each render function to the snapshot version and
+        updates it last rendered and the page it rendered from them
+"""
+
+import logging
+from datetime import date, timedelta
+from types import MappingProxyType
+from typing import NamedTuple
+import covid_data_handler
+import covid_news_handling
+from covid_analytics import Trend, trend_on
+from covid_series import latest_common_day
+
+logger = logging.getLogger(__name__)
+snapshot = None
+render_cache = {}
+
+
+class DashboardSnapshot(NamedTuple):
+    """
+    An immutable record of the values displayed on the dashboard.
+
+    Attributes:
+        version (tuple): The data versions the snapshot was built from
+        location (str): The name of the local area
+        nation_location (str): The name of the nation
+        hospital_cases (int): The number of current Covid hospital cases
+        deaths_total (int): The cumulative deaths due to Covid infection
+        local_7day_infections (int): The number of local Covid cases in the past 7 days
+        national_7day_infections (int): The number of national Covid cases in the past 7 days
+        news_articles (tuple): The articles displayed, each a read only title and content mapping
+        trends (tuple): The configured trend indicators, each a read only mapping of the fields of
+            a Trend and its text
+    """
+    version: tuple
+    location: str
+    nation_location: str
+    hospital_cases: int
+    deaths_total: int
+    local_7day_infections: int
+    national_7day_infections: int
+    news_articles: tuple
+    trends: tuple = ()
+
+
+def reference_day(covid_data: dict) -> date:
+    """
+    A function that gives the day the displayed Covid figures are taken from, which is two days
+    before the latest day published for both the local area and the nation, allowing for late
+    reporting.
+
+    Args:
+        covid_data (dict): A dictionary containing the local and national Covid data series
+
+    Returns:
+        day (date): The day the figures are taken from
+    """
+    config_data = covid_data_handler.config_data
+    latest_day = latest_common_day([covid_data["local"], covid_data["national"]],
+                                   [config_data["Local Cases Metric"], "newCasesByPublishDate"])
+    if latest_day is None:
+        logger.warning("No day published for both the local area and the nation")
+        latest_day = date.today() - timedelta(1)
+    return latest_day - timedelta(2)
+
+
+def trend_text(trend: Trend) -> str:
+    """
+    A function that describes a trend indicator for display, leaving out any values not known.
+
+    Args:
+        trend (Trend): The rolling statistics of a metric on the displayed day
+
+    Returns:
+        text (str): The description of the trend
+    """
+    text = "{} {}-day {}: {}".format(trend.area, trend.window, trend.metric, trend.total)
+    if trend.mean is not None:
+        text += ", {:.1f} a day".format(trend.mean)
+    if trend.rate is not None:
+        text += ", {:.1f} per 100k".format(trend.rate)
+    if trend.change is not None:
+        text += ", {:+.1f}% on the week before".format(trend.change)
+    return text
+
+
+def build_trends(covid_data: dict, day: date, version: tuple) -> tuple:
+    """
+    A function that computes the configured trend indicators on the given day.
+
+    Args:
+        covid_data (dict): A dictionary containing the local and national Covid data series
+        day (date): The day the figures are taken from
+        version (tuple): The data versions the snapshot is being built from
+
+    Returns:
+        trends (tuple): The trend indicators, each a read only mapping of the fields of a Trend
+            and its text
+    """
+    config_data = covid_data_handler.config_data
+    trends = []
+    for indicator in config_data["Trend Indicators"]:
+        series = covid_data[indicator["area"]]
+        trend = trend_on(series, indicator["metric"], indicator["window"], day, version[0],
+                         config_data["Populations"].get(series.area_name))
+        trends.append(MappingProxyType(dict(trend._asdict(), text=trend_text(trend))))
+    return tuple(trends)
+
+
+def build_snapshot(covid_data: dict, current_articles: list, version: tuple) -> DashboardSnapshot:
+    """
+    A function that computes all displayed values from the given Covid data and News articles.
+
+    Args:
+        covid_data (dict): A dictionary containing the local and national Covid data series
+        current_articles (list): A list of the filtered News articles, each an Article
+        version (tuple): The data versions the snapshot is being built from
+
+    Returns:
+        snapshot (DashboardSnapshot): The newly built snapshot
+    """
+    logger.info("Building dashboard snapshot for version %s", version)
+    news_articles = []
+    articles_displayed = covid_news_handling.config_data["Articles Displayed"]
+    for article in current_articles[:articles_displayed]:
+        news_articles.append(MappingProxyType({"title": article.title, "content": article.content}))
+    if len(news_articles) < articles_displayed:
+        logger.warning("No articles left to load")
+    if "local" not in covid_data:
+        logger.warning("No Covid data available for the dashboard snapshot")
+        return DashboardSnapshot(version, "", "", None, None, None, None, tuple(news_articles))
+    local_series = covid_data["local"]
+    national_series = covid_data["national"]
+    config_data = covid_data_handler.config_data
+    day = reference_day(covid_data)
+    # Only the 7 day window displayed is checked, sparing a pass over the whole history
+    for offset in range(6, -1, -1):
+        window_day = day - timedelta(offset)
+        if local_series.value(config_data["Local Cases Metric"], window_day) is None or \
+                national_series.value("newCasesByPublishDate", window_day) is None:
+            logger.warning("Cases missing on %s within the 7 day window", window_day)
+    return DashboardSnapshot(
+        version, local_series.area_name, national_series.area_name,
+        national_series.value("hospitalCases", day),
+        national_series.value(config_data["Total Deaths Metric"], day),
+        local_series.window_sum(config_data["Local Cases Metric"], day, 7),
+        national_series.window_sum("newCasesByPublishDate", day, 7),
+        tuple(news_articles), build_trends(covid_data, day, version))
+
+
+def get_snapshot() -> DashboardSnapshot:
+    """
+    A function that returns the current snapshot, rebuilding it only if the Covid data or News
+    articles have changed since it was built.
+
+    Args:
+        None
+
+    Returns:
+        snapshot (DashboardSnapshot): The current snapshot
+    """
+    global snapshot
+    version = (covid_data_handler.covid_data_version, covid_news_handling.news_version,
+               date.today())
+    if snapshot is None or snapshot.version != version:
+        snapshot = build_snapshot(covid_data_handler.get_covid_data(),
+                                  covid_news_handling.get_news_articles(), version)
+        render_cache.clear()
+    return snapshot
+
+
+def render_snapshot(current_snapshot: DashboardSnapshot, updates: list, render,
+                    updates_version=None) -> str:
+    """
+    A function that renders a snapshot and the scheduled updates into a page, reusing the page
+    previously rendered by the same render function for the same snapshot and updates where there
+    is one. Only the latest page of each render function is kept, as the updates only change
+    forwards.
+
+    Args:
+        current_snapshot (DashboardSnapshot): The snapshot to be rendered
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+        render (function): A function taking the snapshot and updates and returning the page
+        updates_version: A value which changes whenever the updates change, sparing the updates
+            being compared; defaults to their titles and contents
+
+    Returns:
+        page (str): The rendered page
+    """
+    if updates_version is None:
+        updates_version = tuple((update["title"], update["content"]) for update in updates)
+    key = (current_snapshot.version, updates_version)
+    cached_key, page = render_cache.get(render, (None, None))
+    if cached_key != key:
+        page = render(current_snapshot, updates)
+        render_cache[render] = (key, page)
+    return page
@@ -0,0 +1,338 @@
+"""
+This module provides in-process stand ins for the UK government's Covid API and the News API, such
+that the dashboard can be run and load tested with no network. The stand in is a transport adapter
+mounted on the HTTP sessions the handlers already use, so the handlers make their requests exactly
+as they would to the real APIs. Responses replay payloads recorded from the real APIs, or synthetic
+data where none have been recorded, with configurable latency, throttling and error rates; given
+the same seed the same requests fail each run.
+
+Payloads are recorded with python fake_data_sources.py record, and the stand ins are used by the
+app when the configured Data Source is fake.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    covid_host (str): The scheme and host of the Covid API
+    news_host (str): The scheme and host of the News API
+    article_words (list): The words synthetic articles are made from
+    config_data (dict): A dictionary containing all the configurable variables from the config file
+"""
+
+import logging
+import json
+import http
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit, parse_qs
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+covid_host = "https://api.coronavirus.data.gov.uk"
+news_host = "https://newsapi.org"
+article_words = ("vaccine booster hospital admissions school testing variant Omicron Delta "
+                 "lockdown travel rules masks care homes NHS staff GP surgeries pharmacy queues "
+                 "winter cases deaths ministers scientists advice isolation payments workers "
+                 "businesses students exams festivals sport stadiums borders quarantine data "
+                 "study trial antivirals immunity research funding councils regions Wales "
+                 "Scotland").split()
+with open('config.json', 'r') as f:
+    config_data = json.load(f)
+
+
+def synthetic_covid_records(area_name: str, days: int) -> list:
+    """
+    A function that generates a run of plausible daily Covid data for an area, ending today.
+
+    Args:
+        area_name (str): The name of the area
+        days (int): The number of days of data
+
+    Returns:
+        records (list): A list of dictionaries each holding a date and every metric, newest first
+    """
+    scale = 400 if area_name == config_data["Nation"] else 1
+    today = date.today()
+    records = []
+    for i in range(days):
+        cases = scale * (50 + (i * 37) % 90)
+        records.append({"areaName": area_name, "date": str(today - timedelta(i)),
+                        "newCasesByPublishDate": cases, "newCasesBySpecimenDate": cases,
+                        "hospitalCases": scale * (10 + (i * 13) % 20),
+                        "cumDeaths60DaysByDeathDate": scale * (days - i),
+                        "cumDailyNsoDeathsByDeathDate": scale * (days - i)})
+    return records
+
+
+def synthetic_articles(count: int) -> list:
+    """
+    A function that generates News articles in the form given by the News API. Each article's text
+    is drawn from a seeded word list, such that the articles aren't near duplicates of one another.
+
+    Args:
+        count (int): The number of articles
+
+    Returns:
+        articles (list): A list of dictionaries containing the articles
+    """
+    articles = []
+    for i in range(count):
+        words = random.Random(i).sample(article_words, 12)
+        articles.append({"source": {"id": None, "name": "Stand in News"}, "author": None,
+                         "title": "Covid update " + str(i) + ": " + " ".join(words[:4]),
+                         "description": " ".join(words[4:]).capitalize() + ".",
+                         "url": "https://example.com/covid/" + str(i), "urlToImage": None,
+                         "publishedAt": "2021-12-01T00:00:00Z", "content": None})
+    return articles
+
+
+class FakeDataSourceAdapter(BaseAdapter):
+    """
+    A requests transport adapter answering requests to the Covid and News APIs in process.
+
+    Attributes:
+        recordings_folder (str): The folder holding recorded payloads
+        latency (float): The time in seconds each response is delayed by
+        jitter (float): The most time in seconds each response is further randomly delayed by
+        error_rate (float): The fraction of requests answered with 503 Service Unavailable
+        failure_rate (float): The fraction of requests failing with a connection error
+        requests_per_second (float): The most requests answered each second before further requests
+            are answered with 429 Too Many Requests, 0 for no limit
+        page_size (int): The number of days in each page of Covid data
+        synthetic_days (int): The number of days of Covid data generated for unrecorded areas
+        random (random.Random): The seeded source of the injected delays and errors
+        lock (threading.Lock): A lock preventing the random source and throttle being used
+            concurrently
+        payloads (dict): A dictionary mapping each loaded payload's name to it
+    """
+
+    def __init__(self, recordings_folder: str = "recordings", latency: float = 0,
+                 jitter: float = 0, error_rate: float = 0, failure_rate: float = 0,
+                 requests_per_second: float = 0, page_size: int = 1000,
+                 synthetic_days: int = 700, seed: int = 0) -> None:
+        super().__init__()
+        self.recordings_folder = recordings_folder
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.failure_rate = failure_rate
+        self.requests_per_second = requests_per_second
+        self.page_size = page_size
+        self.synthetic_days = synthetic_days
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.payloads = {}
+        self._tokens = requests_per_second
+        self._refilled_at = time.monotonic()
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "FakeDataSourceAdapter":
+        """
+        A function that creates an adapter from the Fake Data Source settings of the config file.
+
+        Args:
+            settings (dict): A dictionary of the settings
+
+        Returns:
+            adapter (FakeDataSourceAdapter): The adapter
+        """
+        return cls(settings["Recordings Folder"], settings["Latency Seconds"],
+                   settings["Jitter Seconds"], settings["Error Rate"],
+                   settings["Connection Failure Rate"], settings["Requests Per Second"],
+                   settings["Page Size"], settings["Synthetic Days"], settings["Seed"])
+
+    def load_payload(self, name: str, default):
+        """
+        A function that loads a recorded payload the first time it is asked for, falling back to
+        the given synthetic payload should none have been recorded.
+
+        Args:
+            name (str): The name of the payload's file within the recordings folder
+            default (function): A function giving the synthetic payload
+
+        Returns:
+            payload: The recorded or synthetic payload
+        """
+        payload = self.payloads.get(name)
+        if payload is None:
+            try:
+                with open(os.path.join(self.recordings_folder, name)) as payload_file:
+                    payload = json.load(payload_file)
+            except FileNotFoundError:
+                payload = default()
+            self.payloads[name] = payload
+        return payload
+
+    def throttled(self) -> bool:
+        """
+        A function that takes a token from the throttle's bucket, which refills at the configured
+        requests per second up to a second's worth of requests.
+
+        Args:
+            None
+
+        Returns:
+            throttled (bool): Whether the bucket was empty, such that the request is refused
+        """
+        if not self.requests_per_second:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.requests_per_second, self._tokens + (now - self._refilled_at) *
+                           self.requests_per_second)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def covid_response(self, query: dict) -> tuple:
+        """
+        A function that answers a request for a page of Covid data in the form of the Covid API.
+
+        Args:
+            query (dict): The request's query parameters
+
+        Returns:
+            response (tuple): The status code and the body
+        """
+        filters = dict(part.split("=", 1) for part in query["filters"].split(";"))
+        area_name = filters["areaName"]
+        structure = json.loads(query["structure"])
+        records = self.load_payload("covid_" + area_name + ".json", lambda: {
+            "data": synthetic_covid_records(area_name, self.synthetic_days)})["data"]
+        page = int(query.get("page", 1))
+        page_records = records[(page - 1) * self.page_size:page * self.page_size]
+        if not page_records:
+            return 204, b""
+        data = [{name: record.get(metric) for name, metric in structure.items()}
+                for record in page_records]
+        return 200, json.dumps({"length": len(data), "data": data}).encode()
+
+    def news_response(self, query: dict) -> tuple:
+        """
+        A function that answers a request for articles in the form of the News API.
+
+        Args:
+            query (dict): The request's query parameters
+
+        Returns:
+            response (tuple): The status code and the body
+        """
+        articles = self.load_payload("news.json", lambda: {
+            "articles": synthetic_articles(100)})["articles"]
+        page_size = int(query.get("pageSize", 100))
+        page = int(query.get("page", 1))
+        return 200, json.dumps({"status": "ok", "totalResults": len(articles),
+                                "articles": articles[(page - 1) * page_size:
+                                                     page * page_size]}).encode()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None,
+             proxies=None) -> requests.Response:
+        """
+        A function that answers a request as the matching API would, after the configured latency,
+        unless the request is chosen to fail or be throttled.
+
+        Args:
+            request (requests.PreparedRequest): The request
+
+        Returns:
+            response (requests.Response): The response
+        """
+        with self.lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            roll = self.random.random()
+            throttled = self.throttled()
+        if delay:
+            time.sleep(delay)
+        if roll < self.failure_rate:
+            raise requests.ConnectionError("Injected connection failure", request=request)
+        url = urlsplit(request.url)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if throttled:
+            status, body = 429, b'{"message": "Too many requests"}'
+        elif roll < self.failure_rate + self.error_rate:
+            status, body = 503, b'{"message": "Injected error"}'
+        elif request.url.startswith(covid_host):
+            status, body = self.covid_response(query)
+        elif request.url.startswith(news_host):
+            status, body = self.news_response(query)
+        else:
+            status, body = 404, b'{"message": "Not found"}'
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        if throttled:
+            response.headers["Retry-After"] = "1"
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response.reason = http.HTTPStatus(status).phrase
+        return response
+
+    def close(self) -> None:
+        """
+        Does nothing, as the adapter holds no connections.
+        """
+
+
+def install_fake_data_sources(adapter: FakeDataSourceAdapter = None) -> FakeDataSourceAdapter:
+    """
+    A function that makes the Covid and News handlers' sessions send their requests to the stand in
+    APIs rather than the real ones.
+
+    Args:
+        adapter (FakeDataSourceAdapter): The adapter to be used; defaults to one created from the
+            configured Fake Data Source settings
+
+    Returns:
+        adapter (FakeDataSourceAdapter): The adapter in use
+    """
+    import covid_data_handler
+    import covid_news_handling
+    if adapter is None:
+        adapter = FakeDataSourceAdapter.from_config(config_data["Fake Data Source"])
+    logger.info("Using stand in Covid and News APIs")
+    for session in (covid_data_handler.session, covid_news_handling.session):
+        session.mount(covid_host, adapter)
+        session.mount(news_host, adapter)
+    return adapter
+
+
+def record_payloads(folder: str) -> None:
+    """
+    A function that records the current payloads of the real Covid and News APIs for the configured
+    areas and News terms, to be replayed by the stand ins.
+
+    Args:
+        folder (str): The folder in which the payloads are written
+
+    Returns:
+        None
+    """
+    import covid_data_handler
+    import covid_news_handling
+    os.makedirs(folder, exist_ok=True)
+    metrics = sorted({config_data["Local Cases Metric"], config_data["National Cases Metric"],
+                      config_data["Total Deaths Metric"], "newCasesByPublishDate",
+                      "hospitalCases"})
+    for area_name, area_type in ((config_data["Location"], config_data["Location Type"]),
+                                 (config_data["Nation"], "nation")):
+        records = covid_data_handler.fetch_area_data(area_name, area_type, metrics)
+        with open(os.path.join(folder, "covid_" + area_name + ".json"), "w") as payload_file:
+            json.dump({"data": records}, payload_file)
+    articles = covid_news_handling.news_API_request(config_data["News Terms"])
+    with open(os.path.join(folder, "news.json"), "w") as payload_file:
+        json.dump({"status": "ok", "articles": [article.to_json() for article in articles]},
+                  payload_file)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ["record"]:
+        record_payloads(config_data["Fake Data Source"]["Recordings Folder"])
+    else:
+        print("Usage: python fake_data_sources.py record")
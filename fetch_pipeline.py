@@ -0,0 +1,351 @@
+"""
+This module wraps the functions that gather data from the Covid and News APIs such that concurrent
+requests for the same data share one request. A call made while an identical call is in flight
+waits for and returns that call's result, and a call made within the configured minimum refresh
+interval of the last completed identical call returns its result without any request being made.
+
+It also keeps the dashboard available while either API misbehaves. Each request is made with the
+configured timeouts for its source and retried with exponential backoff should it fail in a way
+which may pass, and a circuit breaker per source stops requests being made at all for a time once
+a source has failed repeatedly. Should gathering data fail regardless, the last good data continues
+to be served until a later request succeeds.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    lock (threading.Lock): A lock used to prevent the in flight and completed calls being changed
+        concurrently
+    in_flight (dict): A dictionary mapping the key of each call in progress to its Future
+    completed (dict): A dictionary mapping the key of each completed call to the time it finished
+        and its result, each dropped once older than the configured Minimum Refresh Seconds
+    breakers (dict): A dictionary mapping the name of each source to its circuit breaker
+    retry_statuses (set): The HTTP status codes of responses which are retried
+    config_data (dict): A dictionary containing all the configurable variables from the config file
+"""
+
+import logging
+import functools
+import inspect
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+import requests
+from dashboard_metrics import describe, increment
+
+logger = logging.getLogger(__name__)
+lock = threading.Lock()
+in_flight = {}
+completed = {}
+breakers = {}
+retry_statuses = {429, 500, 502, 503, 504}
+with open('config.json', 'r') as f:
+    config_data = json.load(f)
+describe("fetch_shared_total", "Calls answered by a recent or in flight identical call")
+describe("fetch_retries_total", "Requests retried after a failure")
+describe("fetch_failures_total", "Requests which failed after every retry")
+describe("circuit_opened_total", "Times a source's circuit breaker has opened")
+describe("fetch_stale_total", "Failed gathers answered with the last good data")
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    The error raised for a request to a source whose circuit breaker is open.
+    """
+
+
+class MalformedResponseError(ValueError):
+    """
+    The error raised for a response from a source which doesn't hold the data expected of it.
+    """
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker for a single source. It opens once the configured number of requests in a row
+    have failed, refusing every request until the configured reset time has passed, after which a
+    single trial request is let through; the breaker closes should it succeed and opens again should
+    it fail.
+
+    Attributes:
+        source (str): The name of the source, e.g. covid
+        failures (int): The number of requests in a row which have failed
+        opened_at (float): The monotonic time the breaker last opened, None while it is closed
+        trial (bool): Whether a trial request is in progress
+        lock (threading.Lock): A lock preventing the breaker being changed concurrently
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        A function that gives whether a request may be made to the source.
+
+        Args:
+            None
+
+        Returns:
+            allowed (bool): Whether the request may be made
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or \
+                    time.monotonic() - self.opened_at < config_data["Circuit Reset Seconds"]:
+                return False
+            self.trial = True
+            return True
+
+    def record_success(self) -> None:
+        """
+        A function that records a successful request, closing the breaker.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if self.opened_at is not None:
+                logger.info("Circuit for %s closed", self.source)
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def record_failure(self) -> None:
+        """
+        A function that records a failed request, opening the breaker should too many requests in a
+        row have failed or a trial request have failed.
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.failures += 1
+            if self.trial or (self.opened_at is None and
+                              self.failures >= config_data["Circuit Failure Threshold"]):
+                logger.warning("Circuit for %s opened after %s failures", self.source,
+                               self.failures)
+                increment("circuit_opened_total", source=self.source)
+                self.opened_at = time.monotonic()
+            self.trial = False
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    """
+    A function that gives the circuit breaker of a source, creating it the first time.
+
+    Args:
+        source (str): The name of the source, e.g. covid
+
+    Returns:
+        breaker (CircuitBreaker): The source's circuit breaker
+    """
+    with lock:
+        breaker = breakers.get(source)
+        if breaker is None:
+            breaker = breakers[source] = CircuitBreaker(source)
+    return breaker
+
+
+def retry_delay(attempt: int, response: requests.Response = None) -> float:
+    """
+    A function that gives the time to wait before retrying a request: the time asked for by the
+    source should it have been given, otherwise an exponential backoff with random jitter such that
+    retries from many callers are spread out.
+
+    Args:
+        attempt (int): The number of attempts made so far
+        response (requests.Response): The failed response, None should no response have been given
+
+    Returns:
+        delay (float): The time in seconds to wait
+    """
+    backoff = config_data["Retry Backoff Seconds"]
+    delay = random.uniform(0, backoff * 2 ** (attempt - 1))
+    if response is not None and response.headers.get("Retry-After", "").isdigit():
+        delay = int(response.headers["Retry-After"])
+    return min(delay, backoff * 2 ** config_data["Fetch Retries"])
+
+
+def resilient_get(session: requests.Session, url: str, source: str,
+                  params: dict = None) -> requests.Response:
+    """
+    A function that makes a GET request to a source with the source's configured timeouts, retrying
+    requests which time out, fail to connect or are answered with an error which may pass, up to the
+    configured number of retries.
+
+    Args:
+        session (requests.Session): The session the request is made with
+        url (str): The URL requested
+        source (str): The name of the source, one of those with configured Fetch Timeouts
+        params (dict): The query parameters of the request
+
+    Returns:
+        response (requests.Response): The successful response
+
+    Raises:
+        requests.RequestException: Should the request fail after every retry, or the source's
+            circuit breaker be open
+    """
+    breaker = get_breaker(source)
+    if not breaker.allow():
+        raise CircuitOpenError("Circuit for " + source + " is open")
+    timeout = tuple(config_data["Fetch Timeouts"][source])
+    attempt = 0
+    while True:
+        attempt += 1
+        response = None
+        try:
+            response = session.get(url, params=params, timeout=timeout)
+            if response.status_code not in retry_statuses:
+                response.raise_for_status()
+                breaker.record_success()
+                return response
+            error = requests.HTTPError(str(response.status_code) + " from " + source,
+                                       response=response)
+        except (requests.ConnectionError, requests.Timeout) as request_error:
+            error = request_error
+        except requests.HTTPError:
+            # Errors which won't pass on retrying, such as a bad request, say nothing of the
+            # source's health
+            breaker.record_success()
+            raise
+        except requests.RequestException:
+            # Other failures, such as a response cut short, aren't retried but still count against
+            # the source, ending any trial request such that the breaker never stays open for good
+            increment("fetch_failures_total", source=source)
+            breaker.record_failure()
+            raise
+        if attempt > config_data["Fetch Retries"]:
+            logger.warning("Request to %s failed after %s attempts: %s", source, attempt, error)
+            increment("fetch_failures_total", source=source)
+            breaker.record_failure()
+            raise error
+        delay = retry_delay(attempt, response)
+        logger.info("Retrying request to %s in %.2f seconds after: %s", source, delay, error)
+        increment("fetch_retries_total", source=source)
+        time.sleep(delay)
+
+
+def response_field(response: requests.Response, field: str, source: str):
+    """
+    A function that gives a field of the JSON body of a response from a source.
+
+    Args:
+        response (requests.Response): The response
+        field (str): The name of the field, e.g. data
+        source (str): The name of the source, e.g. covid
+
+    Returns:
+        value: The value of the field
+
+    Raises:
+        json.JSONDecodeError: Should the body not be JSON
+        MalformedResponseError: Should the body not hold the field
+    """
+    payload = response.json()
+    try:
+        return payload[field]
+    except (KeyError, TypeError):
+        raise MalformedResponseError("Response from " + source + " has no " + field) from None
+
+
+def serve_stale(last_good):
+    """
+    A decorator that makes the decorated function, which gathers data, give the last good data
+    should gathering fail, such that a failed update leaves the dashboard showing the data it
+    already had rather than raising. Only failed requests and responses which can't be parsed are
+    answered with the last good data; any other error, or any error while there is no good data yet,
+    is raised.
+
+    Args:
+        last_good (function): A function giving the last good data, or an empty value should there
+            be none
+
+    Returns:
+        decorator (function): The decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            try:
+                return function(*args, **kwargs)
+            except (requests.RequestException, json.JSONDecodeError, MalformedResponseError):
+                stale = last_good()
+                if not stale:
+                    raise
+                logger.warning("%s failed; serving the last good data", function.__name__,
+                               exc_info=True)
+                increment("fetch_stale_total", function=function.__name__)
+                return stale
+        return wrapper
+    return decorator
+
+
+def single_flight(function):
+    """
+    A decorator that makes concurrent calls to the decorated function with the same arguments share
+    one call, and reuses the result of a completed call for the configured Minimum Refresh Seconds.
+
+    Args:
+        function (function): The function to be wrapped
+
+    Returns:
+        wrapper (function): The wrapped function
+    """
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # Calls are keyed by their full arguments, defaults included, such that calls made with
+        # and without the default arguments are shared. The representation of the arguments is
+        # used as some, such as lists, can't be hashed
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        key = (function.__qualname__, repr(arguments.arguments))
+        with lock:
+            if key in completed:
+                finished_at, result = completed[key]
+                if time.monotonic() - finished_at < config_data["Minimum Refresh Seconds"]:
+                    logger.info("Reusing recent result of %s%s", function.__name__, args)
+                    increment("fetch_shared_total", function=function.__name__, outcome="reused")
+                    return result
+            future = in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = in_flight[key] = Future()
+        if not leader:
+            logger.info("Joining in flight call of %s%s", function.__name__, args)
+            increment("fetch_shared_total", function=function.__name__, outcome="joined")
+            return future.result()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            with lock:
+                del in_flight[key]
+            future.set_exception(error)
+            raise
+        with lock:
+            del in_flight[key]
+            finished_at = time.monotonic()
+            # Results which can no longer be reused are dropped, such that calls with ever changing
+            # arguments, e.g. each page of articles, aren't held forever
+            refresh = config_data["Minimum Refresh Seconds"]
+            for expired in [completed_key for completed_key, (completed_at, _) in completed.items()
+                            if finished_at - completed_at >= refresh]:
+                del completed[expired]
+            completed[key] = (finished_at, result)
+        future.set_result(result)
+        return result
+
+    return wrapper
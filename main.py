@@ -1,34 +1,74 @@
 """
 This is the main program module from which everything is run. The Flask app is run from here as well
-as the logger and scheduler. The module creates a Covid Data Dashboard which is a simple
-personalised covid dashboard that displays information about the Covid infection rates in the local
-area, as well as nationally, and news stories about Covid. The user is able to schedule updates to
-both the displayed Covid Data and the news stories on the dashboard, as well as being able to delete
-any news stories they no longer wish to see which will then be replaced with a fresh story.
+as the logger. The module creates a Covid Data Dashboard which is a simple personalised covid
+dashboard that displays information about the Covid infection rates in the local area, as well as
+nationally, and news stories about Covid. The user is able to schedule updates to both the displayed
+Covid Data and the news stories on the dashboard, as well as being able to delete any news stories
+they no longer wish to see which will then be replaced with a fresh story.
 Updates to news and Covid data can be scheduled separately and can also be set to repeat at a set
 time daily.
+The dashboard may be served by several worker processes, e.g. gunicorn 'main:app' --workers 4, in
+which case the scheduled updates are held in the shared cache and only the worker owning the
+scheduler runs them; each worker picks up the data, articles and updates changed by the others.
+Pushing changes to open pages over /events holds a worker for as long as each page is open, so the
+configured Push Updates should only be enabled for the Flask app when it is served by threaded or
+gevent workers, e.g. gunicorn 'main:app' --worker-class gevent; the ASGI app in asgi_app always
+pushes changes, its streams holding no thread.
 
 Attributes:
-    logger (logging): The main project logger, initialised at debug level and saved to sys.log
-    schedule (sched): The main project scheduler; an instance of sched
+    logger (logging): The main project logger, initialised at the configured Log Level and saved to
+        sys.log by a background thread, such that logging never waits on the file
+    log_listener (logging.handlers.QueueListener): The listener writing queued log records to the
+        log file
     app (Flask): A flask app instance
+    updates (UpdateRegistry): The scheduled updates keyed by title, shared by all worker processes
+        through the cache and holding the scheduler jobs of those scheduled by this process
+    updates_version (int): The version of the shared updates last loaded by this process
+    started (bool): Whether the app has been prepared to serve requests by this process
+    last_sync (float): The monotonic time shared state was last synchronised by this process
+    start_lock (threading.Lock): A lock preventing the app being started twice
+    sync_lock (threading.Lock): A lock preventing shared state being synchronised concurrently
 """
 
+import atexit
 import logging
-import sched
+import logging.handlers
+import queue
+import sqlite3
+import threading
 import time
-from datetime import datetime, timedelta
 from flask import *
 from covid_data_handler import *
 from covid_news_handling import *
+import dashboard_cache
+from dashboard_api import get_resource, etag_matches
+import dashboard_events
+from dashboard_events import notify_change, changed_events, wait_for_change
+from dashboard_metrics import timed, render_metrics
+from fake_data_sources import install_fake_data_sources
+from dashboard_snapshot import DashboardSnapshot, get_snapshot, render_snapshot
+from update_registry import UpdateRecord, UpdateRegistry
+from update_scheduler import (schedule_job, schedule_interval_job, cancel_job, next_time_at,
+                              claim_scheduler, is_scheduler_owner)
 
-logging.basicConfig(filename='sys.log', encoding='utf-8',
-                    format="%(asctime)s %(module)s [%(levelname)s] - %(message)s",
-                    level=logging.DEBUG)
+# Log records are queued by the logging thread and written to the file by the listener's thread
+log_queue = queue.SimpleQueue()
+file_handler = logging.FileHandler('sys.log', encoding='utf-8')
+file_handler.setFormatter(logging.Formatter("%(asctime)s %(module)s [%(levelname)s] - %(message)s"))
+log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+logging.basicConfig(handlers=[logging.handlers.QueueHandler(log_queue)],
+                    level=config_data["Log Level"])
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger()
 
 app = Flask(__name__)
-schedule = sched.scheduler()
+updates = UpdateRegistry()
+updates_version = 0
+started = False
+last_sync = 0.0
+start_lock = threading.Lock()
+sync_lock = threading.Lock()
 
 
 @app.route('/')
@@ -47,13 +87,12 @@ def root() -> str:
 
 
 @app.route("/index")
+@timed("dashboard_request", "serving the dashboard page")
 def update() -> str:
     """
     The main function which is executed at least every 60 seconds by the html template which is then
-    re-rendered by this function. From here URL arguments are taken in and processed appropriately;
-    any necessary functions from the other two modules are run and their outputs are handled
-    accordingly. Further the maintenance of necessary data structures such as a list of scheduled
-    updates and the contents of the dashboard toasts is also largely handled here.
+    re-rendered by this function. From here URL arguments are taken in and processed appropriately
+    before the dashboard is rendered from the current snapshot of its data.
 
     Args:
         None
@@ -62,269 +101,444 @@ def update() -> str:
         render_template (str): A function/string that renders the flask dashboard template with all
             its parameters/arguments filled with the relevant data
     """
-    schedule.run(blocking=False)
-    global news_articles
-    global covid_data
-    global update_name
-    # Gathers the current (but not necessarily up to date) data from the covid_data_handler and
-    # covid_news_handling modules
-    covid_data = get_covid_data()
-    current_articles = get_news_articles()
-    # Updates the displayed news articles
-    news_articles = []
-    for i in range(0, 3):
-        try:
-            news_articles.append({"title": current_articles[i]["title"], "content": (
-                current_articles[i]["description"] + "\n" + "Article from: " + current_articles[i][
-                    "url"])})
-        except IndexError:
-            logger.warning("No articles left to load")
-            break
-    # Calculates the relevant Covid data
-    hospital_cases = covid_data[two_days_ago][1]["hospitalCases"]
-    deaths_total = covid_data[two_days_ago][1]["cumDeaths60DaysByDeathDate"]
-
-    local_7day_infections = 0
-    national_7day_infections = 0
-    for i in range(0, 7):
-        local_7day_infections += covid_data[str(datetime.now().date() - timedelta(2 + i))][0][
-            "newCasesByPublishDate"]
-        national_7day_infections += covid_data[str(datetime.now().date() - timedelta(2 + i))][1][
-            "newCasesByPublishDate"]
+    sync_shared_state()
+    handle_dashboard_request(request.args)
+    toasts, toasts_version = updates.toasts()
+    return render_snapshot(get_snapshot(), toasts, render_dashboard, toasts_version)
+
+
+@app.route("/api/<name>")
+def api(name: str) -> Response:
+    """
+    A function serving the JSON resources of the dashboard: the Covid metrics at /api/metrics, the
+    News articles at /api/news and the scheduled updates at /api/updates. Clients sending the ETag
+    of the current version in an If-None-Match header are answered with 304 Not Modified.
+
+    Args:
+        name (str): The name of the resource requested
+
+    Returns:
+        response (Response): The JSON resource, or an empty response should it be unchanged
+    """
+    sync_shared_state()
+    resource = get_resource(name, get_snapshot(), *updates.toasts())
+    if resource is None:
+        abort(404)
+    body, etag = resource
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype="application/json", headers=headers)
+
+
+@app.route("/metrics")
+def metrics() -> Response:
+    """
+    A function serving the counters and histograms measuring the dashboard's hot paths, in the
+    Prometheus text format.
+
+    Args:
+        None
+
+    Returns:
+        response (Response): The metrics page
+    """
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/events")
+def events() -> Response:
+    """
+    A function serving a stream of server-sent events, each carrying one of the dashboard's JSON
+    resources whenever it changes, from which the page patches itself in place. Streams are only
+    served should the configured Push Updates be enabled, as each holds a worker while it is open.
+
+    Args:
+        None
+
+    Returns:
+        response (Response): The stream of events
+    """
+    if not config_data["Push Updates"]:
+        abort(404)
+    return Response(stream_events(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache"})
+
+
+def stream_events():
+    """
+    A generator giving the server-sent events of a single stream. Every resource is sent once the
+    stream opens and again whenever it changes; changes made by other worker processes are picked up
+    every Shared State Poll Seconds, and a comment is sent every Event Keepalive Seconds otherwise
+    to keep the connection open.
+
+    Args:
+        None
+
+    Returns:
+        events (generator): The encoded events
+    """
+    sent = {}
+    last_sent = time.monotonic()
+    while True:
+        count = dashboard_events.change_count
+        sync_shared_state()
+        page_events = changed_events(sent, get_snapshot(), *updates.toasts())
+        if page_events:
+            last_sent = time.monotonic()
+            yield page_events
+        elif time.monotonic() - last_sent >= config_data["Event Keepalive Seconds"]:
+            last_sent = time.monotonic()
+            yield b": keepalive\n\n"
+        wait_for_change(count, config_data["Shared State Poll Seconds"])
+
+
+def handle_dashboard_request(args) -> None:
+    """
+    A function that processes the URL arguments of a request to the dashboard; any necessary
+    functions from the other two modules are run and their outputs are handled accordingly. Further
+    the maintenance of necessary data structures such as a list of scheduled updates and the
+    contents of the dashboard toasts is also largely handled here.
+
+    Args:
+        args (dict): A dictionary-like mapping of the request's URL arguments
+
+    Returns:
+        None
+    """
     # Checks to see if the current update title has been already used and prevents a new update
     # being scheduled if so
-    update_name = request.args.get("two")
-    for i in range(0, len(updates)):
-        if not update_name:
-            break
-        if updates[i]["title"] == ((update_name + " - Covid") or (update_name + " - News")):
-            logger.warning("Duplicate update name used: %s", update_name)
-            return render_template('index.html', title='Covid Daily Update App', location=location,
-                                   nation_location=nation_location,
-                                   hospital_cases="Hospital Cases: " + str(hospital_cases),
-                                   deaths_total="Total Deaths: " + str(deaths_total),
-                                   news_articles=news_articles,
-                                   updates=updates,
-                                   local_7day_infections=local_7day_infections,
-                                   national_7day_infections=national_7day_infections,
-                                   favicon="./static/images/favicon.ico",
-                                   image="covid.png")
-
-    repeat_update = request.args.get("repeat")
-    # Checks to see if an update has been scheduled without a time, if so the time is set to the
-    # current time, effectively scheduling an immediate update
-    update_time = request.args.get("update")
+    update_name = args.get("two")
+    if update_name and (update_name + " - Covid" in updates or update_name + " - News" in updates):
+        logger.warning("Duplicate update name used: %s", update_name)
+        return
+
+    repeat_update = args.get("repeat")
+    # Checks to see if an update has been scheduled without a time, if so the update is run at the
+    # current time, effectively scheduling an immediate update. The time itself is shared rather
+    # than only the time of day, which will have passed by the time the scheduler owner reads it
+    update_time = args.get("update")
+    run_at = None
     if (not update_time) and update_name:
         logger.warning("No time inserted, current time being used to schedule immediate update")
-        update_time = str(time.gmtime().tm_hour) + ":" + str(time.gmtime().tm_min)
-    # If an article is removed, the article is added to the file of removed articles and new
-    # articles are added to a maximum of 3. Furthermore, if said file doesn't exist it's created
-    remove_news = request.args.get('notif')
+        run_at = time.time()
+        update_time = time.strftime("%H:%M:%S", time.gmtime(run_at))
+    # If an article is removed, the article is added to the deleted articles and replaced by the
+    # next article in the pool, which is topped up in the background should it run low
+    remove_news = args.get('notif')
     if remove_news:
-        try:
-            logger.info("Filtering out already deleted articles")
-            with open('deleted_articles.txt') as del_art_file:
-                deleted_articles = del_art_file.read().splitlines()
-                if remove_news not in deleted_articles:
-                    deleted_articles.append(remove_news)
-        except FileNotFoundError:
-            logger.warning(
-                "No deleted_articles file found: current article will be used to create said file")
-            deleted_articles = [remove_news]
-        with open('deleted_articles.txt', 'w') as outfile:
-            for article in deleted_articles:
-                outfile.write(article + "\n")
-        for i in range(0, 3):
-            try:
-                if (news_articles[i]["title"]) == remove_news:
-                    del news_articles[i]
-            except IndexError:
-                logger.error("Suppressed error in removing filtered articles")
-                break
-        articles = get_news_articles()
-        for i in range(len(news_articles), 3):
-            try:
-                news_articles.append({"title": articles[i]["title"],
-                                      "content": (articles[i][
-                                                      "description"]) + "\n" + "Article from: " +
-                                                 current_articles[i]["url"]})
-            except IndexError:
-                logger.warning("No articles left to load")
-                break
+        delete_article(remove_news)
     # Scheduling a Covid data update and an automatic removal of the relevant toast once the update
     # arrives
-    covid_toggle = request.args.get("covid-data")
+    covid_toggle = args.get("covid-data")
     if covid_toggle:
         message = "Update of Covid data at: "
         if repeat_update:
             message = "Repeating update of Covid data at: "
-        schedule_covid_updates(update_time, update_name + " - Covid")
-        updates.append({"title": update_name + " - Covid", "content": message + update_time})
-        current_hour = int(time.gmtime().tm_hour)
-        current_minute = int(time.gmtime().tm_min)
-        current_second = int(time.gmtime().tm_sec)
-        update_hour = update_time[0:2]
-        update_minute = update_time[3:]
-        update_hour = int(update_hour)
-        update_minute = int(update_minute)
-        timer = ((update_hour - current_hour) * 3600) + (
-            (update_minute - current_minute) * 60) - current_second
-        toast_updates[update_name + " - Covid"] = schedule.enter(timer, 1, remove_update_toast,
-                                                                 argument=(update_name + " - Covid",
-                                                                           update_time))
-        schedule.run(blocking=False)
+        share_update({"title": update_name + " - Covid", "content": message + update_time,
+                      "kind": "Covid", "update_time": update_time, "repeat": bool(repeat_update),
+                      "run_at": run_at})
     # Scheduling a News article update and an automatic removal of the relevant toast once the
     # update arrives
-    news_toggle = request.args.get("news")
+    news_toggle = args.get("news")
     if news_toggle:
         message = "Update of News data at: "
         if repeat_update:
             message = "Repeating update of News data at: "
-        schedule_news_updates(update_time, update_name + " - News")
-        updates.append({"title": update_name + " - News", "content": message + update_time})
-        current_hour = int(time.gmtime().tm_hour)
-        current_minute = int(time.gmtime().tm_min)
-        current_second = int(time.gmtime().tm_sec)
-        update_hour = update_time[0:2]
-        update_minute = update_time[3:]
-        update_hour = int(update_hour)
-        update_minute = int(update_minute)
-        timer = ((update_hour - current_hour) * 3600) + (
-            (update_minute - current_minute) * 60) - current_second
-        toast_updates[update_name + " - News"] = schedule.enter(timer, 1, remove_update_toast,
-                                                                argument=(update_name + " - News",
-                                                                          update_time))
-        schedule.run(blocking=False)
-    # Cancellation of the relevant update by reading the contents of the toast. Also cancels the
-    # automatic removal of said toast given that it'll no longer exist
-    remove_schedule = request.args.get("update_item")
+        share_update({"title": update_name + " - News", "content": message + update_time,
+                      "kind": "News", "update_time": update_time, "repeat": bool(repeat_update),
+                      "run_at": run_at})
+    # Cancellation of the relevant update, which the scheduler owner notices and so cancels both
+    # the update and the automatic removal of its toast
+    remove_schedule = args.get("update_item")
     if remove_schedule:
         logger.info("Removal of toast titled: %s", remove_schedule)
-        for i in range(0, len(updates)):
-            try:
-                if updates[i]["title"] == remove_schedule:
-                    update_content = updates[i]["content"].split()
-                    if (update_content[2] == "Covid") or (update_content[3] == "Covid"):
-                        cancel_covid_update(remove_schedule)
-                        schedule.cancel(toast_updates[remove_schedule])
-                    else:
-                        cancel_news_update(remove_schedule)
-                        schedule.cancel(toast_updates[remove_schedule])
-                    del updates[i]
-            except IndexError:
-                break
-
-    return render_template('index.html', title='Covid Daily Update App', location=location,
-                           nation_location=nation_location,
-                           hospital_cases="Hospital Cases: " + str(hospital_cases),
-                           deaths_total="Total Deaths: " + str(deaths_total),
-                           news_articles=news_articles,
+        dashboard_cache.delete_update(remove_schedule)
+    if covid_toggle or news_toggle or remove_schedule:
+        with sync_lock:
+            sync_updates()
+
+
+def share_update(update: dict) -> None:
+    """
+    A function that shares a requested update with every worker process. The updates held by this
+    process may be out of date, so an update whose title another process has since used is only
+    refused here, as a duplicate, once the shared updates reject it.
+
+    Args:
+        update (dict): A dictionary holding the update's title, content, kind, update_time, repeat
+            flag and run_at time
+
+    Returns:
+        None
+    """
+    try:
+        dashboard_cache.save_update(update)
+    except sqlite3.IntegrityError:
+        logger.warning("Duplicate update name used: %s", update["title"])
+
+
+def schedule_update(record: UpdateRecord) -> None:
+    """
+    A function that schedules a shared update in this process, along with the automatic removal of
+    its toast once the update arrives should it not repeat. An update requested without a time runs
+    at the time it was requested, at once should that have passed before it reached this process.
+
+    Args:
+        record (UpdateRecord): The update's record
+
+    Returns:
+        None
+    """
+    if record.kind == "Covid":
+        schedule_covid_updates(record.update_time, record.title, record.repeat, record.run_at)
+    else:
+        schedule_news_updates(record.update_time, record.title, record.repeat, record.run_at)
+    # Repeating updates keep their toast until they are cancelled
+    if not record.repeat:
+        run_at = record.run_at if record.run_at is not None else next_time_at(record.update_time)
+        schedule_job(("Toast", record.title), run_at, remove_update_toast,
+                     argument=(record.title, record.update_time))
+    updates.set_job(record.title, (record.kind, record.title))
+
+
+def unschedule_update(record: UpdateRecord) -> None:
+    """
+    A function that cancels a shared update should it be scheduled in this process, along with the
+    automatic removal of its toast.
+
+    Args:
+        record (UpdateRecord): The update's record
+
+    Returns:
+        None
+    """
+    if record.job is None:
+        return
+    if record.kind == "Covid":
+        cancel_covid_update(record.title)
+    else:
+        cancel_news_update(record.title)
+    cancel_job(("Toast", record.title))
+    updates.set_job(record.title, None)
+
+
+def sync_updates() -> None:
+    """
+    A function that loads the shared updates should they have changed since last loaded, removing
+    any changed or removed updates from the registry and adding any new ones; in the scheduler
+    owner, the removed updates are cancelled and the new ones scheduled.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global updates_version
+    version = dashboard_cache.get_version("updates")
+    if version == updates_version:
+        return
+    updates_version = version
+    shared = {record["title"]: UpdateRecord(**record) for record in dashboard_cache.load_updates()}
+    for record in updates:
+        if shared.get(record.title) != record._replace(job=None):
+            unschedule_update(record)
+            updates.remove(record.title)
+    owner = is_scheduler_owner()
+    for title, record in shared.items():
+        if title not in updates:
+            updates.add(record)
+            if owner:
+                schedule_update(record)
+    notify_change()
+
+
+def sync_due() -> bool:
+    """
+    A function that gives whether the configured Shared State Poll Seconds have passed since shared
+    state was last synchronised by this process.
+
+    Args:
+        None
+
+    Returns:
+        due (bool): Whether shared state is due to be synchronised
+    """
+    return time.monotonic() - last_sync >= config_data["Shared State Poll Seconds"]
+
+
+def sync_shared_state(force: bool = False) -> None:
+    """
+    A function that brings this process up to date with the Covid data, News articles, deleted
+    articles and updates changed by other processes, at most once every configured Shared State Poll
+    Seconds. Should the scheduler owner have exited, this process attempts to take over the
+    scheduler.
+
+    Args:
+        force (bool): Whether to synchronise even if the last synchronisation was recent
+
+    Returns:
+        None
+    """
+    global last_sync
+    if not (force or sync_due()):
+        return
+    with sync_lock:
+        last_sync = time.monotonic()
+        if not is_scheduler_owner() and claim_scheduler():
+            start_owner_jobs()
+        try:
+            sync_cached_covid_data()
+            sync_cached_articles()
+            sync_deleted_articles()
+            sync_updates()
+        except sqlite3.Error:
+            logger.exception("Shared state could not be synchronised")
+
+
+def start_owner_jobs() -> None:
+    """
+    A function run once this process owns the scheduler which keeps the scheduled updates in step
+    with the shared updates even while this process serves no requests.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    schedule_interval_job(("Sync", "shared state"), config_data["Shared State Poll Seconds"] / 60,
+                          sync_shared_state)
+    # Updates loaded before this process took over the scheduler are scheduled now
+    for record in updates:
+        if record.job is None:
+            schedule_update(record)
+
+
+@timed("dashboard_render", "rendering the dashboard template")
+def render_dashboard(current_snapshot: DashboardSnapshot, updates: list,
+                     push_updates: bool = None) -> str:
+    """
+    A function that renders the flask dashboard template from a snapshot of the dashboard's data and
+    the list of scheduled updates.
+
+    Args:
+        current_snapshot (DashboardSnapshot): The snapshot holding the values to be displayed
+        updates (list): A list of dictionaries containing the titles and contents of the updates
+        push_updates (bool): Whether the page listens for changes pushed over /events; defaults to
+            the configured Push Updates
+
+    Returns:
+        render_template (str): The flask dashboard template with all its parameters/arguments filled
+            with the relevant data
+    """
+    if push_updates is None:
+        push_updates = config_data["Push Updates"]
+    return render_template('index.html', title='Covid Daily Update App',
+                           location=current_snapshot.location,
+                           nation_location=current_snapshot.nation_location,
+                           hospital_cases="Hospital Cases: " + str(current_snapshot.hospital_cases),
+                           deaths_total="Total Deaths: " + str(current_snapshot.deaths_total),
+                           news_articles=current_snapshot.news_articles,
+                           trends=current_snapshot.trends,
                            updates=updates,
-                           local_7day_infections=local_7day_infections,
-                           national_7day_infections=national_7day_infections,
+                           local_7day_infections=current_snapshot.local_7day_infections,
+                           national_7day_infections=current_snapshot.national_7day_infections,
                            favicon="./static/images/favicon.ico",
-                           image="covid.png")
+                           image="covid.png",
+                           poll_api=config_data["Poll JSON API"],
+                           push_updates=push_updates,
+                           poll_seconds=config_data["API Poll Seconds"])
 
 
 def remove_update_toast(update_name: str, update_time: str) -> None:
     """
     A function that removes a toast with a specific name at a specific time (the same time as the
-    toast's update time). By checking whether the toast represents a repeating update it is able to
-    enact this repeating update; if not it simply removes the toast and the relevant scheduled
-    update for the removal of said toast.
+    toast's update time). Only toasts of updates which don't repeat are removed, as repeating
+    updates are rescheduled by the scheduler itself.
 
     Args:
         update_name (str): The name of the toast to be removed
-        update_name (str): The time for the toast to be removed
+        update_time (str): The time for the toast to be removed
 
     Returns:
         None
     """
-    logger.info("Removal of toast titled " + update_name + " scheduled for " + update_time)
-    for element in updates:
-        if element["title"] == update_name:
-            update_content = element["content"].split()
-            # Reads content of toast; if it is a repeating toast it doesn't delete the toast and
-            # schedules a new update of the relevant type as well as a new removal of the toast to
-            # allow the cycle to repeat itself
-            if update_content[0] == "Repeating":
-                if update_content[3] == "Covid":
-                    schedule_covid_updates(update_time, update_name)
-                    current_hour = int(time.gmtime().tm_hour)
-                    current_minute = int(time.gmtime().tm_min)
-                    current_second = int(time.gmtime().tm_sec)
-                    update_hour = update_time[0:2]
-                    update_minute = update_time[3:]
-                    update_hour = int(update_hour)
-                    update_minute = int(update_minute)
-                    timer = ((update_hour - current_hour + 24) * 3600) + (
-                        (update_minute - current_minute) * 60) - current_second
-                    toast_updates[update_name] = schedule.enter(timer, 1, remove_update_toast,
-                                                                argument=(update_name + " - Covid",
-                                                                          update_time))
-                    schedule.run(blocking=False)
-                    break
-                else:
-                    schedule_news_updates(update_time, update_name)
-                    current_hour = int(time.gmtime().tm_hour)
-                    current_minute = int(time.gmtime().tm_min)
-                    current_second = int(time.gmtime().tm_sec)
-                    update_hour = update_time[0:2]
-                    update_minute = update_time[3:]
-                    update_hour = int(update_hour)
-                    update_minute = int(update_minute)
-                    timer = ((update_hour - current_hour + 24) * 3600) + (
-                        (update_minute - current_minute) * 60) - current_second
-                    toast_updates[update_name] = schedule.enter(timer, 1, remove_update_toast,
-                                                                argument=(update_name + " - News",
-                                                                          update_time))
-                    schedule.run(blocking=False)
-                    break
-
-            updates.remove(element)
+    logger.info("Removal of toast titled %s scheduled for %s", update_name, update_time)
+    if updates.remove(update_name) is not None:
+        notify_change()
+    try:
+        dashboard_cache.delete_update(update_name)
+    except sqlite3.Error:
+        logger.exception("Update %s could not be removed from the cache", update_name)
 
 
-if __name__ == '__main__':
-    global covid_data
-    logger.info("App starting")
-    # Gathering the initial Covid data
-    covid_data = covid_API_request(config_data["Location"], config_data["Location Type"])
+def refresh_all_data() -> None:
+    """
+    A function that gathers the Covid data and News articles, used to refresh the cached data in
+    the background when the app starts.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
     try:
-        today = str(datetime.now().date())
-        two_days_ago = str(datetime.now().date() - timedelta(2))
-        location = covid_data[today][0]["areaName"]
-    except KeyError:
-        logger.error(
-            "No data available at current date, initial data gathered will be of the previous day")
-        # For when today's data isn't available: e.g. near midnight
-        today = str(datetime.now().date() - timedelta(1))
-        two_days_ago = str(datetime.now().date() - timedelta(3))
-        location = covid_data[today][0]["areaName"]
-    # Calculation of the relevant Covid data
-    nation_location = covid_data[today][1]["areaName"]
-    hospital_cases = covid_data[two_days_ago][1]["hospitalCases"]
-    deaths_total = covid_data[two_days_ago][1]["cumDeaths60DaysByDeathDate"]
-
-    local_7day_infections = 0
-    national_7day_infections = 0
-    for i in range(0, 7):
-        local_7day_infections += covid_data[str(datetime.now().date() - timedelta(2 + i))][0][
-            "newCasesByPublishDate"]
-        national_7day_infections += covid_data[str(datetime.now().date() - timedelta(2 + i))][1][
-            "newCasesByPublishDate"]
-    # Gathering the initial News articles
-    current_articles = update_news(config_data["News Terms"])
-    news_articles = []
-    for i in range(0, 3):
-        logger.info("Loading initial articles")
-        try:
-            news_articles.append({"title": current_articles[i]["title"], "content": (
-                current_articles[i]["description"] + "\n" + "Article from: " + current_articles[i][
-                    "url"])})
-        except IndexError:
-            logger.warning("No articles left to load")
-            break
-    # Creating the empty update list and toast update dictionary
-    updates = []
-    toast_updates = {}
+        covid_API_request(config_data["Location"], config_data["Location Type"])
+    except Exception:
+        logger.exception("Initial Covid data request failed; cached data will be used")
+    try:
+        update_news(config_data["News Terms"])
+    except Exception:
+        logger.exception("Initial News request failed; cached articles will be used")
+
+
+def start_app() -> None:
+    """
+    A function that prepares the app to serve requests: the cached Covid data, News articles and
+    updates are loaded to be served while, should this process own the scheduler, the initial data
+    is gathered in the background, from which the next snapshot is built. Only the first call in
+    each process has any effect.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    global started
+    with start_lock:
+        if started:
+            return
+        started = True
+    logger.info("App starting")
+    if config_data["Data Source"] == "fake":
+        install_fake_data_sources()
+    load_cached_covid_data()
+    load_cached_articles()
+    load_deleted_articles()
+    sync_shared_state(force=True)
+    if is_scheduler_owner():
+        threading.Thread(target=refresh_all_data, name="initial refresh", daemon=True).start()
+
+
+@app.before_request
+def start_worker() -> None:
+    """
+    A function run before each request which prepares the app in worker processes started by a
+    pre-forking server, where the app is imported rather than run from this module.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    start_app()
+
+
+if __name__ == '__main__':
+    start_app()
     app.run()
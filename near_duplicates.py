@@ -0,0 +1,265 @@
+"""
+This module detects News articles which are near duplicates of one another, such as the same wire
+story syndicated by several outlets under slightly different titles. Each article's title and
+description are broken into overlapping character shingles, from which a MinHash signature is
+computed; the share of equal values in two signatures estimates the share of shingles the articles
+have in common. Signatures are held in a locality sensitive hashing index which buckets them by
+bands of values, such that finding an article's near duplicates only compares it with the few
+articles sharing several buckets rather than every article held. The index holds each signature as a
+sketch, its bands already hashed and its values packed into a single integer, such that comparing
+two articles takes a few integer operations rather than a Python loop over every value.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    shingle_size (int): The number of characters in each shingle
+    signature_limit (int): The most values a signature may hold
+    bucket_recall (float): The least chance that two articles whose similarity is exactly the
+        configured Near Duplicate Similarity share band_hits buckets, such that they are compared
+    band_hits (int): The number of buckets two articles must share to be compared, such that
+        articles sharing a single bucket by chance, as those with common phrases often do, aren't
+        compared
+    bucket_limit (int): The most articles held in a bucket, such that a band of values common to
+        many unrelated articles adds few candidates; near duplicates share many other buckets
+    config_data (dict): A dictionary containing all the configurable variables from the config file
+    bands (int): The number of bands each signature is bucketed by, chosen from the configured Near
+        Duplicate Similarity
+    rows (int): The number of signature values in each band
+    masks (list): The random values each shingle hash is combined with, one for each signature value
+    lane_mask (int): A mask selecting the low byte of each value of a packed sketch
+"""
+
+import logging
+import collections
+import functools
+import itertools
+import hashlib
+import json
+import math
+import operator
+import random
+import re
+import threading
+from array import array
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+shingle_size = 5
+signature_limit = 128
+bucket_recall = 0.95
+band_hits = 2
+bucket_limit = 8
+with open('config.json', 'r') as f:
+    config_data = json.load(f)
+
+
+def shingles(text: str) -> set:
+    """
+    A function that gives the hashes of the overlapping runs of characters in a text, ignoring case,
+    punctuation and spacing.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        shingles (set): The hashes of the text's shingles
+    """
+    text = " ".join(re.findall(r"\w+", text.casefold()))
+    runs = {text[i:i + shingle_size] for i in range(max(1, len(text) - shingle_size + 1))}
+    return {int.from_bytes(hashlib.blake2b(run.encode(), digest_size=8).digest(), "little")
+            for run in runs}
+
+
+@functools.lru_cache(maxsize=8192)
+def signature(title: str, description: str = None) -> tuple:
+    """
+    A function that computes the MinHash signature of an article from its title and description.
+    Each value is the least of the shingle hashes combined with one of the masks, such that the
+    chance of two articles sharing a value is the share of shingles they have in common. Signatures
+    are cached, as the same articles are gathered again on each update.
+
+    Args:
+        title (str): The title of the article
+        description (str): The description of the article
+
+    Returns:
+        signature (tuple): The article's signature
+    """
+    hashes = shingles(title + " " + (description or ""))
+    return tuple(min(map(mask.__xor__, hashes)) for mask in masks)
+
+
+def band_layout(threshold: float) -> tuple:
+    """
+    A function that chooses how signatures are split into bands for a similarity threshold. The
+    most rows per band are used, such that articles less alike rarely share a bucket and are
+    seldom compared, along with the fewest bands for which two articles at the threshold still
+    share band_hits buckets with at least the bucket_recall chance, each band being shared with the
+    chance threshold ** rows.
+
+    Args:
+        threshold (float): The similarity from which articles are near duplicates, from 0 to 1
+
+    Returns:
+        bands (int): The number of bands
+        rows (int): The number of signature values in each band
+    """
+    for rows in range(signature_limit, 0, -1):
+        shared = threshold ** rows
+        for bands in range(band_hits, signature_limit // rows + 1):
+            missed = sum(math.comb(bands, hits) * shared ** hits * (1 - shared) ** (bands - hits)
+                         for hits in range(band_hits))
+            if 1 - missed >= bucket_recall:
+                return bands, rows
+    return signature_limit, 1
+
+
+bands, rows = band_layout(config_data["Near Duplicate Similarity"])
+masks = [random.Random(i).getrandbits(64) for i in range(bands * rows)]
+lane_mask = int.from_bytes(b"\xff\x00" * (bands * rows), "little")
+
+
+def similarity(first: tuple, second: tuple) -> float:
+    """
+    A function that estimates the share of shingles two articles have in common from their
+    signatures.
+
+    Args:
+        first (tuple): The signature of the first article
+        second (tuple): The signature of the second article
+
+    Returns:
+        similarity (float): The estimated similarity, from 0 to 1
+    """
+    return sum(map(operator.eq, first, second)) / len(first)
+
+
+class Sketch(NamedTuple):
+    """
+    A compact form of an article's signature, as held by the index.
+
+    Attributes:
+        band_keys (tuple): The hash of each band of the signature's values along with the band's
+            number, such that equal values in different bands don't share a bucket
+        values (int): The low 16 bits of every value of the signature, packed into one integer
+    """
+    band_keys: tuple
+    values: int
+
+
+@functools.lru_cache(maxsize=8192)
+def sketch(title: str, description: str = None) -> Sketch:
+    """
+    A function that gives the sketch of an article's signature. Sketches are cached, as the same
+    articles are gathered again on each update.
+
+    Args:
+        title (str): The title of the article
+        description (str): The description of the article
+
+    Returns:
+        sketch (Sketch): The sketch of the article's signature
+    """
+    values = signature(title, description)
+    band_keys = tuple(hash((band, values[band * rows:(band + 1) * rows])) for band in range(bands))
+    packed = array('H', [value & 0xFFFF for value in values]).tobytes()
+    return Sketch(band_keys, int.from_bytes(packed, "little"))
+
+
+def sketch_similarity(first: int, second: int) -> float:
+    """
+    A function that estimates the share of shingles two articles have in common from the packed
+    values of their sketches. Values which differ leave a lane of the exclusive or of the two
+    non-zero, which is folded into the lane's low byte such that the equal values are counted by
+    counting the zero bytes. Values only compared by their low 16 bits are equal by chance only once
+    in 65536 comparisons, which is far too seldom to matter.
+
+    Args:
+        first (int): The packed values of the first article's sketch
+        second (int): The packed values of the second article's sketch
+
+    Returns:
+        similarity (float): The estimated similarity, from 0 to 1
+    """
+    length = bands * rows
+    differ = first ^ second
+    differ = (differ | differ >> 8) & lane_mask
+    # Every high byte is masked to zero, so is counted along with the equal values
+    return (differ.to_bytes(2 * length, "little").count(0) - length) / length
+
+
+class NearDuplicateIndex:
+    """
+    A locality sensitive hashing index of article sketches. Articles whose similarity reaches the
+    configured Near Duplicate Similarity share at least band_hits bands of their signatures, and so
+    buckets, with at least the bucket_recall chance. The sketches found to have no near duplicate
+    are remembered until an article is next added, as the same articles are checked again and
+    again against the deleted articles, which seldom change.
+
+    Attributes:
+        sketches (dict): A dictionary mapping the key of each article, e.g. its title, to its
+            sketch
+        buckets (dict): A dictionary mapping each band key to the keys of the articles sharing it
+        unmatched (set): The packed values of the sketches found to have no near duplicate since an
+            article was last added
+        lock (threading.Lock): A lock preventing the index being changed concurrently
+    """
+
+    def __init__(self) -> None:
+        self.sketches = {}
+        self.buckets = {}
+        self.unmatched = set()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.sketches)
+
+    def __contains__(self, key) -> bool:
+        return key in self.sketches
+
+    def add(self, key, article_sketch: Sketch) -> None:
+        """
+        A function that adds an article to the index. Articles already held are ignored, as are
+        buckets already holding bucket_limit articles.
+
+        Args:
+            key: The key of the article, e.g. its title
+            article_sketch (Sketch): The sketch of the article's signature
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if key in self.sketches:
+                return
+            self.sketches[key] = article_sketch
+            for band_key in article_sketch.band_keys:
+                keys = self.buckets.setdefault(band_key, [])
+                if len(keys) < bucket_limit:
+                    keys.append(key)
+            self.unmatched.clear()
+
+    def match(self, article_sketch: Sketch):
+        """
+        A function that finds an article in the index which the given article nearly duplicates,
+        comparing it only with the articles sharing at least band_hits of its buckets.
+
+        Args:
+            article_sketch (Sketch): The sketch of the article's signature
+
+        Returns:
+            key: The key of the first near duplicate found, None should there be none
+        """
+        threshold = config_data["Near Duplicate Similarity"]
+        values = article_sketch.values
+        with self.lock:
+            if values in self.unmatched:
+                return None
+            # Counts the buckets shared with each article without a Python loop per band
+            hits = collections.Counter(itertools.chain.from_iterable(
+                map(self.buckets.get, article_sketch.band_keys, itertools.repeat(()))))
+            for key, count in hits.items():
+                if count >= band_hits and \
+                        sketch_similarity(self.sketches[key].values, values) >= threshold:
+                    return key
+            self.unmatched.add(values)
+        return None
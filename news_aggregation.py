@@ -0,0 +1,149 @@
+"""
+This module merges the News articles gathered by several queries, e.g. for different topics or
+languages, into a single ranked feed. The queries are run concurrently, an article found by more
+than one query, or syndicated under several URLs, is kept once, matched by its normalised URL or
+title, and the feed is ranked by reciprocal rank fusion such that articles ranked highly by several
+queries come first. Each query's articles are reused across feeds, as the function gathering them
+shares recent identical requests.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    rank_offset (int): The constant added to each rank when fusing rankings, limiting how far the
+        very top ranks of a single query outweigh articles found by several queries
+    config_data (dict): A dictionary containing all the configurable variables from the config file
+"""
+
+import logging
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from news_article import Article
+
+logger = logging.getLogger(__name__)
+rank_offset = 60
+with open('config.json', 'r') as f:
+    config_data = json.load(f)
+
+
+def normalise_url(url: str) -> str:
+    """
+    A function that reduces an article's URL to the form shared by its copies, ignoring the scheme,
+    any www. prefix, query, fragment and trailing slash.
+
+    Args:
+        url (str): The URL of the article
+
+    Returns:
+        url (str): The normalised URL, empty should there be none
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host + parts.path.rstrip("/")
+
+
+def normalise_title(title: str) -> str:
+    """
+    A function that reduces an article's title to its lower case words, ignoring punctuation and
+    spacing.
+
+    Args:
+        title (str): The title of the article
+
+    Returns:
+        title (str): The normalised title, empty should there be none
+    """
+    if not title:
+        return ""
+    return " ".join(re.findall(r"\w+", title.casefold()))
+
+
+def article_keys(article: Article) -> list:
+    """
+    A function that gives the keys by which copies of an article are matched.
+
+    Args:
+        article (Article): The article
+
+    Returns:
+        keys (list): The hashes of the article's normalised URL and title, leaving out either should
+            it be empty
+    """
+    keys = []
+    url = normalise_url(article.url)
+    if url:
+        keys.append(hash(("url", url)))
+    title = normalise_title(article.title)
+    if title:
+        keys.append(hash(("title", title)))
+    return keys
+
+
+def merge_rankings(rankings: list) -> list:
+    """
+    A function that merges the ranked articles of several queries into a single ranking, keeping the
+    first copy of each article. Each article scores the sum of 1 / (rank_offset + rank) over the
+    queries finding it; articles scoring the same keep the order in which they were first found.
+
+    Args:
+        rankings (list): A list of each query's articles, each a list of Articles ranked best first
+
+    Returns:
+        articles (list): A list of the distinct articles, ranked best first
+    """
+    articles = []
+    scores = []
+    positions = {}
+    for ranking in rankings:
+        for rank, article in enumerate(ranking, 1):
+            keys = article_keys(article)
+            position = next((positions[key] for key in keys if key in positions), None)
+            if position is None:
+                position = len(articles)
+                articles.append(article)
+                scores.append(0.0)
+            for key in keys:
+                positions.setdefault(key, position)
+            scores[position] += 1 / (rank_offset + rank)
+    order = sorted(range(len(articles)), key=lambda position: -scores[position])
+    return [articles[position] for position in order]
+
+
+def run_queries(fetch, queries: list, page: int = 1) -> list:
+    """
+    A function that runs each query concurrently, up to the configured Fetch Workers at once. Should
+    a query fail, the articles of the others are still returned.
+
+    Args:
+        fetch (function): A function taking the terms, page and language of a query and returning
+            its articles
+        queries (list): A list of dictionaries holding the terms and language of each query
+        page (int): The page of articles gathered by each query
+
+    Returns:
+        rankings (list): A list of the articles of each query which succeeded, in the order given
+
+    Raises:
+        Exception: The error of the last query should every query fail
+    """
+    def run(query: dict):
+        try:
+            return fetch(query["terms"], page, query["language"])
+        except Exception as error:
+            logger.exception("News query for %s in %s failed", query["terms"], query["language"])
+            return error
+
+    if len(queries) == 1:
+        results = [run(queries[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(queries),
+                                                config_data["Fetch Workers"])) as pool:
+            results = list(pool.map(run, queries))
+    rankings = [result for result in results if not isinstance(result, Exception)]
+    if results and not rankings:
+        raise results[-1]
+    return rankings
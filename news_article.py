@@ -0,0 +1,75 @@
+"""
+This module provides the compact record each News article is held as from the moment it is
+gathered. Only the fields displayed or used to match articles are kept, rather than every field
+given by the News API, and the records have no per instance dictionary. The title, URL and source
+are interned, such that an article gathered again on each update shares the strings already held,
+and the content displayed is rendered once when the article is created rather than each time the
+dashboard is built.
+"""
+
+import sys
+
+
+class Article:
+    """
+    A News article.
+
+    Attributes:
+        title (str): The title of the article
+        description (str): The description of the article, None should it have none
+        url (str): The address of the article, None should it have none
+        source (str): The name of the article's source, None should it not be known
+        content (str): The content displayed beneath the article's title
+    """
+    __slots__ = ("title", "description", "url", "source", "content")
+
+    def __init__(self, title: str, description: str = None, url: str = None,
+                 source: str = None) -> None:
+        self.title = sys.intern(title)
+        self.description = description
+        self.url = sys.intern(url) if url else url
+        self.source = sys.intern(source) if source else source
+        self.content = (description or "") + "\n" + "Article from: " + (url or "")
+
+    @classmethod
+    def from_json(cls, article: dict) -> "Article":
+        """
+        A function that creates an article from a dictionary in the form given by the News API,
+        ignoring any fields not held.
+
+        Args:
+            article (dict): A dictionary containing the article
+
+        Returns:
+            article (Article): The article
+        """
+        source = article.get("source")
+        if isinstance(source, dict):
+            source = source.get("name")
+        return cls(article.get("title") or "", article.get("description"), article.get("url"),
+                   source)
+
+    def to_json(self) -> dict:
+        """
+        A function that gives the article as a dictionary in the form given by the News API.
+
+        Args:
+            None
+
+        Returns:
+            article (dict): A dictionary containing the article's source, title, description and URL
+        """
+        return {"source": {"name": self.source}, "title": self.title,
+                "description": self.description, "url": self.url}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return (self.title, self.description, self.url, self.source) == \
+            (other.title, other.description, other.url, other.source)
+
+    def __hash__(self) -> int:
+        return hash((self.title, self.description, self.url, self.source))
+
+    def __repr__(self) -> str:
+        return "Article({!r})".format(self.title)
@@ -0,0 +1,88 @@
+// Keeps the dashboard up to date without reloading the page, either by listening to the server's
+// stream of events, each carrying a resource which has changed, or by polling its JSON resources.
+// Each poll carries the ETag of the version already shown, so unchanged resources are answered
+// with an empty 304 Not Modified. Either way only changed parts of the page are rewritten.
+var dashboard = (function () {
+    var etags = {};
+
+    function toast(title, content, removeName) {
+        var element = $('<div class="toast" data-autohide="false">' +
+            '<div class="toast-header"><strong class="mr-auto"></strong>' +
+            '<form action="/index" method="get">' +
+            '<button type="submit" class="ml-2 mb-1 close" data-dismiss="toast" aria-label="Close">' +
+            '<span aria-hidden="true">&times;</span></button></form></div>' +
+            '<div class="toast-body"></div></div>');
+        element.find("strong").text(title);
+        element.find("button").attr("name", removeName).val(title);
+        element.find(".toast-body").text(content);
+        return element;
+    }
+
+    function showToasts(container, items, removeName) {
+        var column = $(container).empty();
+        items.forEach(function (item) {
+            column.append(toast(item.title, item.content, removeName));
+        });
+        column.find(".toast").toast("show");
+    }
+
+    var apply = {
+        metrics: function (metrics) {
+            $("#local-7day-infections").text("Local 7-day infection rate in " +
+                metrics.local.area + ": " + metrics.local["7day_infections"]);
+            $("#national-7day-infections").text("National 7-day infection rate in " +
+                metrics.national.area + ": " + metrics.national["7day_infections"]);
+            $("#hospital-cases").text("Hospital Cases: " + metrics.national.hospital_cases);
+            $("#deaths-total").text("Total Deaths: " + metrics.national.deaths_total);
+            var trends = $("#trends").empty();
+            metrics.trends.forEach(function (trend) {
+                trends.append($("<li></li>").text(trend.text));
+            });
+        },
+        news: function (articles) {
+            showToasts("#news", articles, "notif");
+        },
+        updates: function (updates) {
+            showToasts("#updates", updates, "update_item");
+        }
+    };
+
+    function poll(name) {
+        var headers = {};
+        if (etags[name]) {
+            headers["If-None-Match"] = etags[name];
+        }
+        return fetch("/api/" + name, {headers: headers, cache: "no-store"})
+            .then(function (response) {
+                if (response.status !== 200) {
+                    return;
+                }
+                etags[name] = response.headers.get("ETag");
+                return response.json().then(apply[name]);
+            })
+            .catch(function () {});
+    }
+
+    function pollAll() {
+        Object.keys(apply).forEach(poll);
+    }
+
+    function listen(url) {
+        var source = new EventSource(url);
+        Object.keys(apply).forEach(function (name) {
+            source.addEventListener(name, function (event) {
+                etags[name] = event.lastEventId;
+                apply[name](JSON.parse(event.data));
+            });
+        });
+        return source;
+    }
+
+    var script = document.currentScript;
+    if (script && script.dataset.events) {
+        listen(script.dataset.events);
+    } else if (script && script.dataset.pollSeconds) {
+        setInterval(pollAll, Number(script.dataset.pollSeconds) * 1000);
+    }
+    return {apply: apply, poll: poll, pollAll: pollAll, listen: listen};
+})();
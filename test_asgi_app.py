@@ -0,0 +1,99 @@
+"""
+This is the test module with test functions to test the functions in asgi_app.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+import pytest
+from asgi_app import *
+
+
+# The app's requests are answered by the stand in APIs rather than the network
+pytestmark = pytest.mark.usefixtures("fake_sources")
+
+
+def request(path: str, query_string: bytes = b"", headers: list = ()) -> list:
+    """
+    This function is used to make a request to the ASGI application and gather its response.
+    """
+    messages = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    asyncio.run(app({"type": "http", "path": path, "query_string": query_string,
+                     "headers": list(headers)}, receive, send))
+    return messages
+
+
+def test_app() -> None:
+    """
+    This function is used to test the function app.
+    """
+    data = request("/index")
+    assert data[0]["status"] == 200, "Test for status of dashboard: failed"
+    assert b"Covid Daily Update App" in data[1]["body"], "Test for rendered dashboard: failed"
+    assert b'data-events="/events"' in data[1]["body"], "Test for pushed changes: failed"
+    assert request("/")[1]["body"] == data[1]["body"], "Test for base URL: failed"
+    assert request("/missing")[0]["status"] == 404, "Test for unknown path: failed"
+    assert isinstance(data, list), "Test for return type of app: failed"
+
+
+def test_render_current_dashboard() -> None:
+    """
+    This function is used to test the function render_current_dashboard.
+    """
+    data = render_current_dashboard()
+    assert "Covid Daily Update App" in data, "Test for dashboard rendered: failed"
+    assert isinstance(data, str), "Test for return type of render_current_dashboard: failed"
+
+
+def test_read_static_file() -> None:
+    """
+    This function is used to test the function read_static_file.
+    """
+    data = read_static_file("images/favicon.ico")
+    assert data, "Test for static file read: failed"
+    assert read_static_file("../config.json") is None, "Test for path outside static: failed"
+    assert request("/static/images/covid.png")[0]["status"] == 200, \
+        "Test for static file served: failed"
+    assert isinstance(data, bytes), "Test for return type of read_static_file: failed"
+
+
+def test_serve_resource() -> None:
+    """
+    This function is used to test the function serve_resource.
+    """
+    data = request("/api/metrics")
+    assert data[0]["status"] == 200, "Test for status of resource: failed"
+    etag = dict(data[0]["headers"])[b"etag"]
+    assert request("/api/metrics", headers=[(b"if-none-match", etag)])[0]["status"] == 304, \
+        "Test for unchanged resource: failed"
+    assert request("/api/missing")[0]["status"] == 404, "Test for unknown resource: failed"
+    assert isinstance(data, list), "Test for return type of serve_resource: failed"
+
+
+def test_serve_events() -> None:
+    """
+    This function is used to test the function serve_events.
+    """
+    messages = []
+    received = []
+
+    async def receive() -> dict:
+        received.append(1)
+        if len(received) > 1:
+            await asyncio.sleep(0.2)
+            return {"type": "http.disconnect"}
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    data = asyncio.run(app({"type": "http", "path": "/events", "headers": []}, receive, send))
+    assert messages[0]["status"] == 200, "Test for status of stream: failed"
+    assert b"event: metrics" in messages[1]["body"], "Test for resources sent: failed"
+    assert data is None, "Test for return type of serve_events: failed"
@@ -0,0 +1,60 @@
+"""
+This is the test module with test functions to test the functions in covid_analytics.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from covid_analytics import *
+
+series = CovidSeries.from_records(
+    [{"areaName": "Exeter", "date": "2021-12-{:02d}".format(day), "newCasesByPublishDate": day}
+     for day in range(1, 16) if day != 10], ["newCasesByPublishDate"])
+
+
+def test_rolling_sums() -> None:
+    """
+    This function is used to test the function rolling_sums.
+    """
+    data = rolling_sums(series.columns["newCasesByPublishDate"], 7)
+    sums, counts = data
+    assert math.isnan(sums[5]), "Test for missing total before a full window: failed"
+    assert sums[6] == 28, "Test for first full window: failed"
+    assert sums[14] == 9 + 11 + 12 + 13 + 14 + 15, "Test for window with a gap: failed"
+    assert counts[14] == 6, "Test for count of days with data: failed"
+    assert isinstance(data, tuple), "Test for return type of rolling_sums: failed"
+
+
+def test_compute_rolling_stats() -> None:
+    """
+    This function is used to test the function compute_rolling_stats.
+    """
+    data = compute_rolling_stats(series, "newCasesByPublishDate", 7, 200000)
+    assert data.means[6] == 4, "Test for rolling mean: failed"
+    assert data.rates[6] == 14, "Test for rate per 100,000: failed"
+    assert data.changes[13] == (data.sums[13] - 28) / 28 * 100, "Test for week on week: failed"
+    assert math.isnan(data.changes[12]), "Test for change without an earlier week: failed"
+    assert isinstance(data, RollingStats), "Test for return type of compute_rolling_stats: failed"
+
+
+def test_get_rolling_stats() -> None:
+    """
+    This function is used to test the function get_rolling_stats.
+    """
+    data = get_rolling_stats(series, "newCasesByPublishDate", 7, "v1")
+    assert get_rolling_stats(series, "newCasesByPublishDate", 7, "v1") is data, \
+        "Test for statistics cached within a version: failed"
+    assert get_rolling_stats(series, "newCasesByPublishDate", 7, "v2") is not data, \
+        "Test for statistics computed for a new version: failed"
+    assert isinstance(data, RollingStats), "Test for return type of get_rolling_stats: failed"
+
+
+def test_trend_on() -> None:
+    """
+    This function is used to test the function trend_on.
+    """
+    data = trend_on(series, "newCasesByPublishDate", 7, date(2021, 12, 7), "v1")
+    assert data.total == 28 and data.mean == 4, "Test for trend on a day: failed"
+    assert data.rate is None, "Test for rate without a population: failed"
+    assert trend_on(series, "newCasesByPublishDate", 7, date(2022, 1, 1), "v1").total is None, \
+        "Test for day outside the series: failed"
+    assert isinstance(data, Trend), "Test for return type of trend_on: failed"
@@ -4,7 +4,9 @@ This is the test module with test functions to test the functions in covid_data_
 Each function is tested with some test cases and the return type is tested as well.
 """
 
+import pytest
 from covid_data_handler import *
+from dashboard_metrics import histograms
 
 
 def test_parse_csv_data() -> None:
@@ -26,12 +28,45 @@ def test_process_covid_csv_data() -> None:
     assert last7days_cases == 240299, "Test for value of last7days_cases: failed"
     assert current_hospital_cases == 7019, "Test for value of current_hospital_cases: failed"
     assert total_deaths == 141544, "Test for value of total_deaths: failed"
+    rows = [["areaName", "date", "hospitalCases"], ["Exeter", "2021-10-28", "5"],
+            ["Devon", "2021-10-28", "9"]]
+    assert process_covid_csv_data(rows) == (0, 14, 0), \
+        "Test for every area totalled and missing columns counted as 0: failed"
+    assert process_covid_csv_data([]) == (0, 0, 0), "Test for empty data: failed"
     assert isinstance(last7days_cases, int), "Test for return type of last7days_cases: failed"
     assert isinstance(current_hospital_cases,
                       int), "Test for return type of current_hospital_cases: failed"
     assert isinstance(total_deaths, int), "Test for return type of total_deaths: failed"
 
 
+def test_series_from_csv_rows() -> None:
+    """
+    This function is used to test the function series_from_csv_rows.
+    """
+    rows = [["areaName", "date", "hospitalCases"], ["Exeter", "2021-10-28", ""],
+            ["Exeter", "2021-10-27", "5"], ["Devon", "2021-10-27", "9"]]
+    data = series_from_csv_rows(rows)
+    assert len(data) == 2, "Test for one series per area: failed"
+    assert data["Exeter"].value("hospitalCases", "2021-10-28") is None, \
+        "Test for blank cell held as missing: failed"
+    assert data["Devon"].value("hospitalCases", "2021-10-27") == 9, "Test for value: failed"
+    assert data["Exeter"].start == date(2021, 10, 27), "Test for descending days: failed"
+    with pytest.raises(ValueError):
+        series_from_csv_rows(rows, ["newCasesByPublishDate"])
+    assert isinstance(data, dict), "Test for return type of series_from_csv_rows: failed"
+
+
+def test_load_csv_series() -> None:
+    """
+    This function is used to test the function load_csv_series.
+    """
+    data = load_csv_series('nation_2021-10-28.csv', ["hospitalCases"])
+    assert len(data["England"]) == 638, "Test for length of loaded series: failed"
+    assert data["England"].value("hospitalCases", "2021-10-28") == 7019, \
+        "Test for value of loaded series: failed"
+    assert isinstance(data, dict), "Test for return type of load_csv_series: failed"
+
+
 def test_covid_API_request() -> None:
     """
     This function is used to test the function covid_API_request.
@@ -44,6 +79,73 @@ def test_covid_API_request() -> None:
     assert isinstance(data, dict), "Test for return type of covid_API_request: failed"
 
 
+def test_covid_API_request_timings(monkeypatch) -> None:
+    """
+    This function is used to test the recording of the time taken to gather each area's data by
+    the function covid_API_request.
+    """
+    monkeypatch.setattr("fetch_pipeline.completed", {})
+    monkeypatch.setattr("covid_data_handler.covid_data", {})
+    monkeypatch.setattr("dashboard_cache.save_covid_data", lambda data: 0)
+    monkeypatch.setattr("covid_data_handler.fetch_covid_batch", lambda areas, metrics, held: (
+        {area: CovidSeries(area[0], metrics[area[1]]) for area in areas},
+        {area: 0.5 for area in areas}))
+    data = covid_API_request("Timing test", "ltla")
+    assert ("covid_area_request_seconds", (("area", "Timing test"),)) in histograms, \
+        "Test for time taken per area recorded: failed"
+    assert isinstance(data, dict), "Test for return type of covid_API_request: failed"
+
+
+def test_covid_API_request_incremental(monkeypatch) -> None:
+    """
+    This function is used to test which held data the function covid_API_request merges into.
+    """
+    held_areas = []
+    monkeypatch.setattr("fetch_pipeline.completed", {})
+    monkeypatch.setattr("dashboard_cache.save_covid_data", lambda data: 0)
+    monkeypatch.setattr("covid_data_handler.fetch_covid_batch", lambda areas, metrics, held: (
+        held_areas.append(set(held)) or
+        {area: CovidSeries.from_records([{"date": "2021-12-07"}], metrics[area[1]], area[0])
+         for area in areas}, {}))
+    monkeypatch.setattr("covid_data_handler.covid_data", {
+        "local": CovidSeries.from_records([{"date": "2021-12-07"}], ["hospitalCases"], "Exeter"),
+        "national": CovidSeries.from_records([{"date": "2021-12-07"}], ["hospitalCases"], "Wales")})
+    data = covid_API_request("Exeter", "ltla")
+    assert held_areas[0] == set(), "Test for full request after the nation changed: failed"
+    covid_API_request("Exeter", "ltla", incremental=False)
+    monkeypatch.setattr("fetch_pipeline.completed", {})
+    covid_API_request("Exeter", "ltla")
+    assert held_areas[2] == {("Exeter", "ltla"), (config_data["Nation"], "nation")}, \
+        "Test for incremental request for the same areas: failed"
+    assert isinstance(data, dict), "Test for return type of covid_API_request: failed"
+
+
+def test_fetch_covid_batch(monkeypatch) -> None:
+    """
+    This function is used to test the function fetch_covid_batch.
+    """
+    monkeypatch.setattr("covid_data_handler.fetch_area_data",
+                        lambda area_name, area_type, metrics: [
+                            {"areaName": area_name, "date": "2021-12-07", metrics[0]: 1}])
+    data, timings = fetch_covid_batch([("Exeter", "ltla"), ("Devon", "utla")],
+                                      {"ltla": ["newCasesByPublishDate"],
+                                       "utla": ["hospitalCases"]})
+    assert len(data) == 2 and len(timings) == 2, "Test for result per area: failed"
+    assert data[("Devon", "utla")].value("hospitalCases", "2021-12-07") == 1, \
+        "Test for metrics used per area type: failed"
+    assert fetch_covid_batch([], {}) == ({}, {}), "Test for empty batch: failed"
+    requested = []
+    monkeypatch.setattr("covid_data_handler.fetch_area_data",
+                        lambda area_name, area_type, metrics, since=None: requested.append(since)
+                        or [{"areaName": area_name, "date": "2021-12-08", metrics[0]: 2}])
+    merged, _ = fetch_covid_batch([("Exeter", "ltla")], {"ltla": ["newCasesByPublishDate"]},
+                                  {("Exeter", "ltla"): data[("Exeter", "ltla")]})
+    assert requested == [date(2021, 12, 7) - timedelta(config_data["Revision Window Days"])], \
+        "Test for incremental request from the latest held day: failed"
+    assert len(merged[("Exeter", "ltla")]) == 2, "Test for newer day merged in: failed"
+    assert isinstance(data, dict), "Test for return type of fetch_covid_batch: failed"
+
+
 def test_schedule_covid_updates() -> None:
     """
     This function is used to test the function schedule_covid_updates.
@@ -59,11 +161,28 @@ def test_get_covid_data() -> None:
     This function is used to test the function get_covid_data.
     """
     data = get_covid_data()
-    value = data['2021-12-07'][0]["newCasesByPublishDate"]
+    value = data["local"].value("newCasesByPublishDate", '2021-12-07')
     assert isinstance(data, dict), "Test for return type of get_covid_data: failed"
     assert isinstance(value, int), "Test that returned data is in the correct form: failed"
 
 
+def test_run_covid_update(monkeypatch) -> None:
+    """
+    This function is used to test the function run_covid_update.
+    """
+    ran = []
+    monkeypatch.setattr("covid_data_handler.covid_API_request",
+                        lambda location, location_type: ran.append(location))
+    updates["run test"] = None
+    data = run_covid_update("run test", "Exeter", "ltla")
+    assert ran and "run test" not in updates, "Test for update run and removed: failed"
+    schedule_covid_updates("10:10", "run test")
+    run_covid_update("run test", "Exeter", "ltla")
+    assert "run test" in updates, "Test for update of the same name scheduled since kept: failed"
+    cancel_covid_update("run test")
+    assert data is None, "Test for return type of run_covid_update: failed"
+
+
 def test_cancel_covid_update() -> None:
     """
     This function is used to test the function cancel_covid_update.
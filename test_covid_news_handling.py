@@ -4,6 +4,8 @@ This is the test module with test functions to test the functions in covid_news_
 Each function is tested with some test cases and the return type is tested as well.
 """
 
+import pytest
+import covid_news_handling
 from covid_news_handling import *
 
 
@@ -30,6 +32,52 @@ def test_update_news() -> None:
     assert isinstance(data, list), "Test for return type of news_API_request: failed"
 
 
+def test_load_deleted_articles(tmp_path, monkeypatch) -> None:
+    """
+    This function is used to test the function load_deleted_articles.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("covid_news_handling.deleted_articles", None)
+    (tmp_path / "deleted_articles.txt").write_text("A\nB\nA\n")
+    data = load_deleted_articles()
+    assert data == {"A", "B"}, "Test for deleted titles loaded: failed"
+    assert (tmp_path / "deleted_articles.txt").read_text().count("A") == 1, \
+        "Test for compaction of repeated titles: failed"
+    assert isinstance(data, set), "Test for return type of load_deleted_articles: failed"
+
+
+def test_delete_article(tmp_path, monkeypatch) -> None:
+    """
+    This function is used to test the function delete_article.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("covid_news_handling.deleted_articles", None)
+    data = delete_article("A")
+    delete_article("A")
+    delete_article("B")
+    assert data is None, "Test for return type of delete_article: failed"
+    assert (tmp_path / "deleted_articles.txt").read_text() == "A\nB\n", \
+        "Test for titles appended to file once: failed"
+    assert "B" in load_deleted_articles(), "Test for deleted title: failed"
+
+
+def test_compact_deleted_articles(tmp_path, monkeypatch) -> None:
+    """
+    This function is used to test the function compact_deleted_articles.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("covid_news_handling.deleted_articles", {"A", "B"})
+    # C was deleted by another process after this process loaded the file
+    (tmp_path / "deleted_articles.txt").write_text("A\nB\nA\nC\n")
+    data = compact_deleted_articles()
+    assert (tmp_path / "deleted_articles.txt").read_text() == "A\nB\nC\n", \
+        "Test for compaction keeping titles appended since loading: failed"
+    assert "C" in covid_news_handling.deleted_articles, "Test for appended title loaded: failed"
+    assert sorted(path.name for path in tmp_path.iterdir()) == \
+        ["deleted_articles.txt", "deleted_articles.txt.lock"], "Test for no file left: failed"
+    assert data is None, "Test for return type of compact_deleted_articles: failed"
+
+
 def test_schedule_news_updates() -> None:
     """
     This function is used to test the function schedule_news_updates.
@@ -45,11 +93,28 @@ def test_get_news_articles() -> None:
     This function is used to test the function get_covid_data.
     """
     data = get_news_articles()
-    value = data[0]["title"]
+    value = data[0].title
     assert isinstance(data, list), "Test for return type of get_covid_data: failed"
     assert isinstance(value, str), "Test that returned data is in the correct form: failed"
 
 
+def test_run_news_update(monkeypatch) -> None:
+    """
+    This function is used to test the function run_news_update.
+    """
+    ran = []
+    monkeypatch.setattr("covid_news_handling.update_news",
+                        lambda covid_terms: ran.append(covid_terms))
+    updates["run test"] = None
+    data = run_news_update("run test", "Covid")
+    assert ran and "run test" not in updates, "Test for update run and removed: failed"
+    schedule_news_updates("10:10", "run test")
+    run_news_update("run test", "Covid")
+    assert "run test" in updates, "Test for update of the same name scheduled since kept: failed"
+    cancel_news_update("run test")
+    assert data is None, "Test for return type of run_news_update: failed"
+
+
 def test_cancel_news_update() -> None:
     """
     This function is used to test the function cancel_covid_update.
@@ -57,3 +122,149 @@ def test_cancel_news_update() -> None:
     data = cancel_news_update("update test")
     assert data is None, "Test for return type of cancel_news_update: failed"
     assert len(updates) == 0, "Test for cancellation of an update named update test: failed"
+
+
+@pytest.fixture
+def empty_pool(tmp_path, monkeypatch):
+    """
+    This fixture gives the test an empty pool and displayed articles, no deleted articles and a
+    deleted articles file of its own, with the pool never topped up in the background.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("covid_news_handling.deleted_articles", None)
+    monkeypatch.setattr("covid_news_handling.deleted_index", NearDuplicateIndex())
+    monkeypatch.setattr("covid_news_handling.displayed_articles", [])
+    monkeypatch.setattr("covid_news_handling.article_pool", deque())
+    monkeypatch.setitem(config_data, "Article Pool Watermark", 0)
+
+
+def test_replace_deleted_articles(empty_pool) -> None:
+    """
+    This function is used to test the functions refill_article_pool and replace_deleted_articles.
+    """
+    refill_article_pool([Article(title) for title in "ABCDE"], 1)
+    assert [article.title for article in get_news_articles()] == ["A", "B", "C"], \
+        "Test for first articles displayed: failed"
+    delete_article("D")
+    data = delete_article("A")
+    assert data is None, "Test for return type of delete_article: failed"
+    assert [article.title for article in get_news_articles()] == ["B", "C", "E"], \
+        "Test for deleted articles skipped in the pool: failed"
+    assert len(covid_news_handling.article_pool) == 0, \
+        "Test for articles taken from the pool: failed"
+
+
+def test_top_up_article_pool(empty_pool, monkeypatch) -> None:
+    """
+    This function is used to test the function top_up_article_pool.
+    """
+    monkeypatch.setattr("covid_news_handling.deleted_articles", {"D"})
+    monkeypatch.setattr("covid_news_handling.news_API_request",
+                        lambda covid_terms, page=1, language=None: [Article(title)
+                                                                    for title in "CDEF"])
+    monkeypatch.setattr("dashboard_cache.save_articles", lambda articles: 1)
+    refill_article_pool([Article("A"), Article("C")], 1)
+    monkeypatch.setattr("covid_news_handling.current_articles", [Article("A"), Article("C")])
+    top_up_lock.acquire()
+    data = top_up_article_pool("Covid", 2, covid_news_handling.pool_generation)
+    assert data is None, "Test for return type of top_up_article_pool: failed"
+    assert [article.title for article in get_news_articles()] == ["A", "C", "E"], \
+        "Test for new articles displayed: failed"
+    assert [article.title for article in covid_news_handling.article_pool] == ["F"], \
+        "Test for new articles pooled: failed"
+    assert not top_up_lock.locked(), "Test for top up lock released: failed"
+
+
+def test_retry_top_up(empty_pool, monkeypatch) -> None:
+    """
+    This function is used to test the retrying of failed top ups by the functions
+    top_up_article_pool and retry_top_up.
+    """
+    scheduled = []
+    monkeypatch.setattr("covid_news_handling.schedule_job",
+                        lambda name, run_at, action: scheduled.append(run_at))
+    monkeypatch.setattr("covid_news_handling.top_up_failures", 0)
+    monkeypatch.setattr("covid_news_handling.top_up_retry_at", 0.0)
+    monkeypatch.setattr("covid_news_handling.pool_exhausted", False)
+
+    def fail(covid_terms, page=1, language=None):
+        raise requests.ConnectionError("failed")
+
+    monkeypatch.setattr("covid_news_handling.news_API_request", fail)
+    top_up_lock.acquire()
+    top_up_article_pool("Covid", 2, covid_news_handling.pool_generation)
+    assert not covid_news_handling.pool_exhausted, \
+        "Test for pool not exhausted by a failure: failed"
+    assert len(scheduled) == 1 and scheduled[0] > time.time(), "Test for retry scheduled: failed"
+    monkeypatch.setattr("covid_news_handling.collapse_near_duplicates",
+                        lambda articles, index: 1 / 0)
+    monkeypatch.setattr("covid_news_handling.news_API_request",
+                        lambda covid_terms, page=1, language=None: [Article("A")])
+    top_up_lock.acquire()
+    top_up_article_pool("Covid", 2, covid_news_handling.pool_generation)
+    assert not top_up_lock.locked(), "Test for top up lock released after any error: failed"
+    assert covid_news_handling.top_up_failures == 2 and scheduled[1] - scheduled[0] > 0, \
+        "Test for backoff after failures in a row: failed"
+    data = retry_top_up()
+    assert data is None, "Test for return type of retry_top_up: failed"
+
+
+def test_aggregate_news(monkeypatch) -> None:
+    """
+    This function is used to test the function aggregate_news.
+    """
+    monkeypatch.setitem(config_data, "Extra News Queries", [{"terms": "Vaccine", "language": "fr"}])
+    monkeypatch.setattr("covid_news_handling.news_API_request", lambda covid_terms, page=1,
+                        language=None: [Article(covid_terms + " " + language),
+                                        Article("Shared", url="https://example.com/a")])
+    data = aggregate_news("Covid")
+    assert [article.title for article in data] == ["Shared", "Covid en", "Vaccine fr"], \
+        "Test for articles of every query merged and ranked: failed"
+    assert isinstance(data, list), "Test for return type of aggregate_news: failed"
+
+
+def test_update_news_page(empty_pool, monkeypatch) -> None:
+    """
+    This function is used to test the page recorded by the function update_news.
+    """
+    titles = {"Page test": ["Schools reopen after the winter break", "Hospital admissions fall"],
+              "Vaccine": ["Booster queues grow at pharmacies", "Travel rules eased for students"]}
+    monkeypatch.setitem(config_data, "News Page Size", 2)
+    monkeypatch.setitem(config_data, "Extra News Queries", [{"terms": "Vaccine", "language": "fr"}])
+    monkeypatch.setattr("covid_news_handling.news_API_request", lambda covid_terms, page=1,
+                        language=None: [Article(title) for title in titles[covid_terms]])
+    monkeypatch.setattr("dashboard_cache.save_articles", lambda articles: 1)
+    for name in ("current_articles", "articles_index", "news_terms", "news_page"):
+        monkeypatch.setattr("covid_news_handling." + name, getattr(covid_news_handling, name))
+    data = update_news("Page test")
+    assert len(data) == 4, "Test for a page of each query gathered: failed"
+    assert covid_news_handling.news_page == 1, \
+        "Test for page recorded however many queries are merged: failed"
+    assert isinstance(data, list), "Test for return type of update_news: failed"
+
+
+def test_collapse_near_duplicates(empty_pool, monkeypatch) -> None:
+    """
+    This function is used to test the functions collapse_near_duplicates and delete_article.
+    """
+    monkeypatch.setattr("covid_news_handling.deleted_articles", {"Booster jabs for all adults"})
+    story = "UK records 50,000 new Covid cases as Omicron spreads"
+    description = "The UK has recorded 50,000 new cases, the highest daily figure since January."
+    booster = "Every adult in England will be offered a booster by the end of January."
+    articles = [Article(story + " - Copy", description),
+                Article("Booster jabs for all adults", booster),
+                Article(story, description),
+                Article("Booster jabs for all adults - Sky News", booster),
+                Article("Schools to reopen", "Pupils return next week")]
+    data = collapse_near_duplicates(articles, NearDuplicateIndex())
+    assert [article.title for article in data] == [story + " - Copy", "Schools to reopen"], \
+        "Test for near duplicates of deleted and earlier articles removed: failed"
+    pooled = [articles[2], articles[4], Article("Football fans return to stadiums"),
+              articles[0], Article("Travel rules eased")]
+    monkeypatch.setattr("covid_news_handling.current_articles", pooled)
+    refill_article_pool(pooled, 1)
+    delete_article(story)
+    assert [article.title for article in get_news_articles()] == \
+        ["Schools to reopen", "Football fans return to stadiums", "Travel rules eased"], \
+        "Test for near duplicates of a deleted article removed: failed"
+    assert isinstance(data, list), "Test for return type of collapse_near_duplicates: failed"
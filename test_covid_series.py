@@ -0,0 +1,150 @@
+"""
+This is the test module with test functions to test the functions in covid_series.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from covid_series import *
+
+records = [
+    {"areaName": "Exeter", "date": "2021-12-07", "newCasesByPublishDate": 70},
+    {"areaName": "Exeter", "date": "2021-12-06", "newCasesByPublishDate": 60},
+    {"areaName": "Exeter", "date": "2021-12-04", "newCasesByPublishDate": 40},
+    {"areaName": "Exeter", "date": "2021-12-03", "newCasesByPublishDate": None},
+]
+
+
+def test_from_records() -> None:
+    """
+    This function is used to test the function CovidSeries.from_records.
+    """
+    series = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    assert series.area_name == "Exeter", "Test for area name taken from records: failed"
+    assert len(series) == 5, "Test for dense length of series: failed"
+    assert series.start == date(2021, 12, 3), "Test for start of series: failed"
+    assert series.end == date(2021, 12, 7), "Test for end of series: failed"
+    assert isinstance(series, CovidSeries), "Test for return type of from_records: failed"
+
+
+def test_value() -> None:
+    """
+    This function is used to test the function CovidSeries.value.
+    """
+    series = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    assert series.value("newCasesByPublishDate", "2021-12-06") == 60, "Test for value: failed"
+    assert series.value("newCasesByPublishDate", "2021-12-05") is None, "Test for gap: failed"
+    assert series.value("newCasesByPublishDate", "2021-12-01") is None, "Test for bounds: failed"
+    assert isinstance(series.value("newCasesByPublishDate", date(2021, 12, 7)),
+                      int), "Test for return type of value: failed"
+
+
+def test_window_sum() -> None:
+    """
+    This function is used to test the function CovidSeries.window_sum.
+    """
+    series = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    assert series.window_sum("newCasesByPublishDate", "2021-12-07", 2) == 130, \
+        "Test for window sum: failed"
+    assert series.window_sum("newCasesByPublishDate", "2021-12-07", 7) == 170, \
+        "Test for window sum running past the start: failed"
+    assert series.window_sum("newCasesByPublishDate", "2021-12-10", 3) == 0, \
+        "Test for window sum past the end: failed"
+
+
+def test_append() -> None:
+    """
+    This function is used to test the function CovidSeries.append.
+    """
+    series = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    series.window_sum("newCasesByPublishDate", "2021-12-07", 2)
+    data = series.append("2021-12-09", {"newCasesByPublishDate": 90})
+    assert data is None, "Test for return type of append: failed"
+    assert len(series) == 7, "Test for gap filled by append: failed"
+    assert series.window_sum("newCasesByPublishDate", "2021-12-09", 3) == 160, \
+        "Test for prefix sums refreshed by append: failed"
+    assert series.latest_date("newCasesByPublishDate") == date(2021, 12, 9), \
+        "Test for latest date: failed"
+
+
+def test_align_series() -> None:
+    """
+    This function is used to test the function align_series.
+    """
+    local = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    national = CovidSeries.from_records(
+        [{"date": "2021-12-08", "newCasesByPublishDate": 800},
+         {"date": "2021-12-06", "newCasesByPublishDate": 600}], ["newCasesByPublishDate"])
+    start, columns = align_series([local, national], ["newCasesByPublishDate"] * 2)
+    assert start == date(2021, 12, 3), "Test for start of aligned days: failed"
+    assert len(columns[0]) == len(columns[1]) == 6, "Test for common length: failed"
+    assert columns[1][3] == 600 and columns[0][3] == 60, "Test for alignment by date: failed"
+    assert isinstance(columns, list), "Test for return type of align_series: failed"
+
+
+def test_missing_days() -> None:
+    """
+    This function is used to test the function missing_days.
+    """
+    local = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    national = CovidSeries.from_records(
+        [{"date": "2021-12-04", "newCasesByPublishDate": 400},
+         {"date": "2021-12-03", "newCasesByPublishDate": 300}], ["newCasesByPublishDate"])
+    data = missing_days(*align_series([local, national], ["newCasesByPublishDate"] * 2))
+    assert data[0] == (date(2021, 12, 3), [0]), "Test for missing local day: failed"
+    assert data[1] == (date(2021, 12, 5), [0, 1]), "Test for day missing from both: failed"
+    assert len(data) == 4, "Test for number of days missing data: failed"
+    assert isinstance(data, list), "Test for return type of missing_days: failed"
+
+
+def test_latest_common_day() -> None:
+    """
+    This function is used to test the function latest_common_day.
+    """
+    local = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    national = CovidSeries.from_records(
+        [{"date": "2021-12-06", "newCasesByPublishDate": 600}], ["newCasesByPublishDate"])
+    data = latest_common_day([local, national], ["newCasesByPublishDate"] * 2)
+    assert data == date(2021, 12, 6), "Test for national published a day later: failed"
+    assert latest_common_day([local, CovidSeries("", ["newCasesByPublishDate"])],
+                             ["newCasesByPublishDate"] * 2) is None, \
+        "Test for no common day: failed"
+    assert isinstance(data, date), "Test for return type of latest_common_day: failed"
+
+
+def test_merge_records() -> None:
+    """
+    This function is used to test the function CovidSeries.merge_records.
+    """
+    series = CovidSeries.from_records(records, ["newCasesByPublishDate"])
+    original = series.copy()
+    data = series.merge_records([{"date": "2021-12-08", "newCasesByPublishDate": 80},
+                                 {"date": "2021-12-07", "newCasesByPublishDate": 75}])
+    assert data is None, "Test for return type of merge_records: failed"
+    assert series.end == date(2021, 12, 8), "Test for newer day appended: failed"
+    assert series.value("newCasesByPublishDate", "2021-12-07") == 75, \
+        "Test for corrected day replaced: failed"
+    assert original.value("newCasesByPublishDate", "2021-12-07") == 70, \
+        "Test for copy left unchanged: failed"
+    assert original == CovidSeries.from_records(records, ["newCasesByPublishDate"]), \
+        "Test for equality of series with the same data: failed"
+
+
+def test_series_builder() -> None:
+    """
+    This function is used to test the class SeriesBuilder.
+    """
+    builder = SeriesBuilder("Exeter", ["newCasesByPublishDate"])
+    for record in records:
+        builder.add(date.fromisoformat(record["date"]).toordinal(),
+                    [record["newCasesByPublishDate"] or MISSING])
+    data = builder.build()
+    assert data == CovidSeries.from_records(records, ["newCasesByPublishDate"], "Exeter"), \
+        "Test for series built day by day: failed"
+    builder = SeriesBuilder("Exeter", ["newCasesByPublishDate"])
+    for day, value in ((5, 50.0), (3, 30.0), (6, 60.0), (4, 40.0)):
+        builder.add(date(2021, 12, day).toordinal(), [value])
+    data = builder.build()
+    assert data.start == date(2021, 12, 3) and len(data) == 4, "Test for days out of order: failed"
+    assert data.window_sum("newCasesByPublishDate", "2021-12-06", 4) == 180, \
+        "Test for values placed by day: failed"
+    assert isinstance(data, CovidSeries), "Test for return type of SeriesBuilder.build: failed"
@@ -0,0 +1,47 @@
+"""
+This is the test module with test functions to test the functions in dashboard_api.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from dashboard_api import *
+from dashboard_snapshot import DashboardSnapshot
+from types import MappingProxyType
+
+current_snapshot = DashboardSnapshot(
+    (1, 1), "Exeter", "England", 50, 998, 70, 700,
+    (MappingProxyType({"title": "Title", "content": "Description"}),))
+updates = [{"title": "test - News", "content": "Update of News data at: 10:10", "kind": "News"}]
+
+
+def test_get_resource() -> None:
+    """
+    This function is used to test the function get_resource.
+    """
+    data = get_resource("metrics", current_snapshot, updates)
+    assert json.loads(data[0])["local"]["7day_infections"] == 70, "Test for metrics body: failed"
+    assert get_resource("metrics", current_snapshot, updates)[1] == data[1], \
+        "Test for unchanged ETag: failed"
+    assert get_resource("metrics", current_snapshot._replace(version=(2, 1), deaths_total=999),
+                        updates)[1] != data[1], "Test for ETag of changed data: failed"
+    assert json.loads(get_resource("updates", current_snapshot, updates)[0]) == \
+        [{"title": "test - News", "content": "Update of News data at: 10:10"}], \
+        "Test for updates body: failed"
+    assert json.loads(get_resource("news", current_snapshot, [])[0])[0]["title"] == "Title", \
+        "Test for news body: failed"
+    assert get_resource("missing", current_snapshot, updates) is None, \
+        "Test for unknown resource: failed"
+    assert isinstance(data, tuple), "Test for return type of get_resource: failed"
+
+
+def test_etag_matches() -> None:
+    """
+    This function is used to test the function etag_matches.
+    """
+    data = etag_matches('"abc"', '"abc"')
+    assert data, "Test for matching ETag: failed"
+    assert etag_matches('"xyz", W/"abc"', '"abc"'), "Test for list of weak ETags: failed"
+    assert etag_matches("*", '"abc"'), "Test for any ETag: failed"
+    assert not etag_matches('"xyz"', '"abc"'), "Test for different ETag: failed"
+    assert not etag_matches(None, '"abc"'), "Test for no header: failed"
+    assert isinstance(data, bool), "Test for return type of etag_matches: failed"
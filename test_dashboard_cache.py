@@ -0,0 +1,101 @@
+"""
+This is the test module with test functions to test the functions in dashboard_cache.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+import pytest
+import dashboard_cache
+from dashboard_cache import *
+
+
+@pytest.fixture(autouse=True)
+def restore_connection(monkeypatch):
+    """
+    This fixture closes the cache each test opens and restores the connection in use before it, such
+    that tests of other modules run afterwards don't use a deleted cache file.
+    """
+    previous = dashboard_cache.connection
+    monkeypatch.setattr("dashboard_cache.connection", previous)
+    monkeypatch.setattr("dashboard_cache.connection_pid", dashboard_cache.connection_pid)
+    yield
+    if dashboard_cache.connection is not previous:
+        dashboard_cache.connection.close()
+
+
+def test_open_cache(tmp_path) -> None:
+    """
+    This function is used to test the function open_cache.
+    """
+    data = open_cache(str(tmp_path / "cache.db"))
+    assert (tmp_path / "cache.db").exists(), "Test for creation of cache file: failed"
+    assert isinstance(data, sqlite3.Connection), "Test for return type of open_cache: failed"
+
+
+def test_save_covid_data(tmp_path) -> None:
+    """
+    This function is used to test the functions save_covid_data and load_covid_data.
+    """
+    open_cache(str(tmp_path / "cache.db"))
+    assert load_covid_data() == {}, "Test for empty cache: failed"
+    covid_data = {"local": CovidSeries.from_records(
+        [{"areaName": "Exeter", "date": "2021-12-07", "newCasesByPublishDate": 70},
+         {"areaName": "Exeter", "date": "2021-12-05", "newCasesByPublishDate": 50}],
+        ["newCasesByPublishDate"])}
+    data = save_covid_data(covid_data)
+    assert data == get_version("covid") == 1, "Test for version of saved Covid data: failed"
+    assert isinstance(data, int), "Test for return type of save_covid_data: failed"
+    assert load_covid_data() == covid_data, "Test for Covid data loaded from cache: failed"
+    open_cache(str(tmp_path / "cache.db"))
+    assert load_covid_data() == covid_data, "Test for Covid data persisted to file: failed"
+
+
+def test_save_articles(tmp_path) -> None:
+    """
+    This function is used to test the functions save_articles and load_articles.
+    """
+    open_cache(str(tmp_path / "cache.db"))
+    assert load_articles() == [], "Test for empty cache: failed"
+    articles = [Article("Title", "Description", "url")]
+    data = save_articles(articles)
+    assert data == get_version("articles") == 1, "Test for version of saved articles: failed"
+    assert isinstance(data, int), "Test for return type of save_articles: failed"
+    assert load_articles() == articles, "Test for articles loaded from cache: failed"
+    assert isinstance(load_articles(), list), "Test for return type of load_articles: failed"
+
+
+def test_get_version(tmp_path) -> None:
+    """
+    This function is used to test the function get_version.
+    """
+    open_cache(str(tmp_path / "cache.db"))
+    data = get_version("articles")
+    assert data == 0, "Test for version of unsaved data: failed"
+    save_articles([])
+    save_articles([])
+    assert get_version("articles") == 2, "Test for version bumped by each save: failed"
+    assert get_version("covid") == 0, "Test for versions kept separately: failed"
+    assert isinstance(data, int), "Test for return type of get_version: failed"
+
+
+def test_save_update(tmp_path) -> None:
+    """
+    This function is used to test the functions save_update, delete_update and load_updates.
+    """
+    open_cache(str(tmp_path / "cache.db"))
+    assert load_updates() == [], "Test for no updates: failed"
+    update = {"title": "Morning - Covid", "content": "Update of Covid data at: 09:00",
+              "kind": "Covid", "update_time": "09:00", "repeat": True, "run_at": None}
+    data = save_update(update)
+    save_update(dict(update, title="Morning - News", kind="News", run_at=1638349200.5))
+    assert load_updates()[0] == update, "Test for update loaded from cache: failed"
+    assert load_updates()[1]["run_at"] == 1638349200.5, \
+        "Test for time of update requested without a time: failed"
+    assert len(load_updates()) == 2, "Test for updates kept in order: failed"
+    with pytest.raises(sqlite3.IntegrityError):
+        save_update(dict(update, content="Update of Covid data at: 10:00"))
+    assert load_updates()[0] == update, "Test for update of the same title kept: failed"
+    assert delete_update("Morning - Covid") == data + 2, "Test for version of updates: failed"
+    assert [record["title"] for record in load_updates()] == ["Morning - News"], \
+        "Test for removal of update: failed"
+    assert isinstance(data, int), "Test for return type of save_update: failed"
@@ -0,0 +1,38 @@
+"""
+This is the test module with test functions to test the functions in dashboard_events.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from dashboard_events import *
+from dashboard_snapshot import DashboardSnapshot
+
+current_snapshot = DashboardSnapshot((1, 1), "Exeter", "England", 50, 998, 70, 700, ())
+
+
+def test_changed_events() -> None:
+    """
+    This function is used to test the function changed_events.
+    """
+    sent = {}
+    data = changed_events(sent, current_snapshot, [])
+    assert data.count(b"event: ") == 3, "Test for every resource sent at first: failed"
+    assert changed_events(sent, current_snapshot, []) == b"", "Test for no changes: failed"
+    updates = [{"title": "test - News", "content": "Update of News data at: 10:10"}]
+    data = changed_events(sent, current_snapshot, updates)
+    assert data.startswith(b"event: updates\nid: "), "Test for only changed resource sent: failed"
+    assert data.count(b"event: ") == 1, "Test for a single event: failed"
+    assert isinstance(data, bytes), "Test for return type of changed_events: failed"
+
+
+def test_wait_for_change() -> None:
+    """
+    This function is used to test the functions notify_change and wait_for_change.
+    """
+    count = change_count
+    data = wait_for_change(count, 0.01)
+    assert data >= count, "Test for return after timeout: failed"
+    count = data
+    threading.Timer(0.05, notify_change).start()
+    assert wait_for_change(count, 5) > count, "Test for wake on change: failed"
+    assert isinstance(data, int), "Test for return type of wait_for_change: failed"
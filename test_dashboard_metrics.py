@@ -0,0 +1,45 @@
+"""
+This is the test module with test functions to test the functions in dashboard_metrics.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from dashboard_metrics import *
+
+
+def test_timed() -> None:
+    """
+    This function is used to test the function timed.
+    """
+    @timed("test_function", "a test function")
+    def function(fail: bool) -> int:
+        if fail:
+            raise ValueError
+        return 1
+
+    data = function(False)
+    try:
+        function(True)
+    except ValueError:
+        pass
+    assert histograms[("test_function_seconds", ())].count == 2, \
+        "Test for calls measured: failed"
+    assert counters[("test_function_errors_total", ())] == 1, "Test for errors counted: failed"
+    assert isinstance(data, int), "Test for return type of timed function: failed"
+
+
+def test_render_metrics() -> None:
+    """
+    This function is used to test the function render_metrics.
+    """
+    observe("test_render_seconds", 0.3, kind="News")
+    increment("test_render_total", status="ok")
+    data = render_metrics()
+    assert 'test_render_seconds_bucket{kind="News",le="0.25"} 0' in data, \
+        "Test for bucket below measurement: failed"
+    assert 'test_render_seconds_bucket{kind="News",le="+Inf"} 1' in data, \
+        "Test for cumulative bucket: failed"
+    assert 'test_render_seconds_count{kind="News"} 1' in data, "Test for count: failed"
+    assert 'test_render_total{status="ok"} 1' in data, "Test for counter: failed"
+    assert "# TYPE test_render_seconds histogram" in data, "Test for type line: failed"
+    assert isinstance(data, str), "Test for return type of render_metrics: failed"
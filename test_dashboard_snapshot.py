@@ -0,0 +1,63 @@
+"""
+This is the test module with test functions to test the functions in dashboard_snapshot.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from dashboard_snapshot import *
+from covid_series import CovidSeries
+from news_article import Article
+
+day = date.today()
+covid_data = {
+    "local": CovidSeries.from_records(
+        [{"areaName": "Exeter", "date": str(day - timedelta(i)), "newCasesByPublishDate": 10}
+         for i in range(0, 10)], ["newCasesByPublishDate"]),
+    "national": CovidSeries.from_records(
+        [{"areaName": "England", "date": str(day - timedelta(i)), "newCasesByPublishDate": 100,
+          "hospitalCases": 50, "cumDeaths60DaysByDeathDate": 1000 - i} for i in range(0, 10)],
+        ["newCasesByPublishDate", "hospitalCases", "cumDeaths60DaysByDeathDate"])
+}
+articles = [Article("Title " + str(i), "Description", "url")
+            for i in range(0, 5)]
+
+
+def test_build_snapshot() -> None:
+    """
+    This function is used to test the function build_snapshot.
+    """
+    data = build_snapshot(covid_data, articles, (1, 1))
+    assert data.location == "Exeter", "Test for local area name: failed"
+    assert data.local_7day_infections == 70, "Test for local 7 day infections: failed"
+    assert data.national_7day_infections == 700, "Test for national 7 day infections: failed"
+    assert data.deaths_total == 998, "Test for total deaths: failed"
+    assert len(data.news_articles) == 3, "Test for number of displayed articles: failed"
+    assert data.trends[0]["total"] == 70, "Test for local trend: failed"
+    assert data.trends[2]["text"].startswith("England 7-day hospitalCases: 350, 50.0 a day"), \
+        "Test for text of trend: failed"
+    assert isinstance(data, DashboardSnapshot), "Test for return type of build_snapshot: failed"
+
+
+def test_render_snapshot() -> None:
+    """
+    This function is used to test the function render_snapshot.
+    """
+    renders = []
+
+    def render(current_snapshot, updates):
+        renders.append(current_snapshot.version)
+        return str(current_snapshot.version) + str(len(updates))
+
+    current_snapshot = build_snapshot(covid_data, articles, (2, 2))
+    updates = [{"title": "test", "content": "Update of News data at: 10:10"}]
+    data = render_snapshot(current_snapshot, updates, render)
+    assert render_snapshot(current_snapshot, updates, render) == data, \
+        "Test for cached page: failed"
+    assert len(renders) == 1, "Test for page only rendered once: failed"
+    render_snapshot(current_snapshot, [], render)
+    assert len(renders) == 2, "Test for page rendered again for new updates: failed"
+    assert render_snapshot(current_snapshot, [], lambda *args: "other") == "other", \
+        "Test for page of another render function: failed"
+    assert render_cache[render][1] == str((2, 2)) + "0", \
+        "Test for only the latest page of a render function kept: failed"
+    assert isinstance(data, str), "Test for return type of render_snapshot: failed"
@@ -0,0 +1,73 @@
+"""
+This is the test module with test functions to test the functions in fake_data_sources.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from fake_data_sources import *
+import covid_data_handler
+
+
+def fake_session(adapter: FakeDataSourceAdapter) -> requests.Session:
+    """
+    This function is used to create a session whose requests are answered by the given adapter.
+    """
+    session = requests.Session()
+    session.mount(covid_host, adapter)
+    session.mount(news_host, adapter)
+    return session
+
+
+def test_send(tmp_path) -> None:
+    """
+    This function is used to test the function FakeDataSourceAdapter.send.
+    """
+    session = fake_session(FakeDataSourceAdapter(str(tmp_path), page_size=10,
+                                                 synthetic_days=15))
+    params = {"filters": "areaType=ltla;areaName=Exeter", "page": 2,
+              "structure": json.dumps({"date": "date", "cases": "newCasesByPublishDate"})}
+    data = session.get(covid_host + "/v1/data", params=params)
+    assert data.status_code == 200, "Test for status of Covid page: failed"
+    assert len(data.json()["data"]) == 5, "Test for last page of Covid data: failed"
+    assert set(data.json()["data"][0]) == {"date", "cases"}, "Test for structure: failed"
+    params["page"] = 3
+    assert session.get(covid_host + "/v1/data", params=params).status_code == 204, \
+        "Test for no content after the last page: failed"
+    (tmp_path / "news.json").write_text(json.dumps({"articles": [{"title": "Recorded"}]}))
+    news = session.get(news_host + "/v2/everything?q=Covid").json()
+    assert news["articles"] == [{"title": "Recorded"}], "Test for recorded payload: failed"
+    assert isinstance(data, requests.Response), "Test for return type of send: failed"
+
+
+def test_injected_errors(tmp_path) -> None:
+    """
+    This function is used to test the error, failure and throttling injection of the adapter.
+    """
+    session = fake_session(FakeDataSourceAdapter(str(tmp_path), error_rate=1))
+    data = session.get(news_host + "/v2/everything")
+    assert data.status_code == 503, "Test for injected error: failed"
+    session = fake_session(FakeDataSourceAdapter(str(tmp_path), failure_rate=1))
+    try:
+        session.get(news_host + "/v2/everything")
+        failed = False
+    except requests.ConnectionError:
+        failed = True
+    assert failed, "Test for injected connection failure: failed"
+    session = fake_session(FakeDataSourceAdapter(str(tmp_path), requests_per_second=2))
+    statuses = [session.get(news_host + "/v2/everything").status_code for _ in range(4)]
+    assert statuses == [200, 200, 429, 429], "Test for throttling: failed"
+    assert isinstance(data, requests.Response), "Test for return type of send: failed"
+
+
+def test_install_fake_data_sources(tmp_path, monkeypatch) -> None:
+    """
+    This function is used to test the function install_fake_data_sources.
+    """
+    monkeypatch.setattr("covid_data_handler.session", requests.Session())
+    monkeypatch.setattr("covid_news_handling.session", requests.Session())
+    data = install_fake_data_sources(FakeDataSourceAdapter(str(tmp_path), synthetic_days=30))
+    batch_data, _ = covid_data_handler.fetch_covid_batch(
+        [("Exeter", "ltla")], {"ltla": ["newCasesByPublishDate"]})
+    assert len(batch_data[("Exeter", "ltla")]) == 30, "Test for data from stand in API: failed"
+    assert isinstance(data, FakeDataSourceAdapter), \
+        "Test for return type of install_fake_data_sources: failed"
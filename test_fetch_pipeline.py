@@ -0,0 +1,179 @@
+"""
+This is the test module with test functions to test the functions in fetch_pipeline.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from fetch_pipeline import *
+
+
+def test_single_flight() -> None:
+    """
+    This function is used to test the function single_flight.
+    """
+    calls = []
+    release = threading.Event()
+
+    @single_flight
+    def fetch(terms: str = "Covid") -> list:
+        calls.append(terms)
+        release.wait(5)
+        return [terms]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fetch())) for _ in range(0, 5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == ["Covid"], "Test for concurrent calls sharing one call: failed"
+    assert results == [["Covid"]] * 5, "Test for shared result: failed"
+    assert fetch("Covid") == ["Covid"] and len(calls) == 1, \
+        "Test for recent result reused within the minimum refresh interval: failed"
+    fetch("Tesla")
+    assert calls == ["Covid", "Tesla"], "Test for different arguments not shared: failed"
+
+
+def test_single_flight_expiry(monkeypatch) -> None:
+    """
+    This function is used to test that the function single_flight drops expired results.
+    """
+    monkeypatch.setitem(config_data, "Minimum Refresh Seconds", 0.05)
+
+    @single_flight
+    def fetch(page: int) -> list:
+        return [page]
+
+    fetch(1)
+    time.sleep(0.1)
+    fetch(2)
+    keys = [key for key in completed if key[0] == fetch.__qualname__]
+    assert keys == [(fetch.__qualname__, repr({"page": 2}))], \
+        "Test for expired result dropped: failed"
+
+
+def test_single_flight_error() -> None:
+    """
+    This function is used to test that errors are shared by the function single_flight.
+    """
+
+    @single_flight
+    def fetch() -> None:
+        raise ValueError("failed")
+
+    try:
+        fetch()
+        raised = False
+    except ValueError:
+        raised = True
+    assert raised, "Test for error raised to caller: failed"
+    assert not in_flight, "Test for failed call removed from in flight calls: failed"
+
+
+def test_resilient_get(monkeypatch) -> None:
+    """
+    This function is used to test the function resilient_get.
+    """
+    from fake_data_sources import FakeDataSourceAdapter, news_host
+    monkeypatch.setitem(config_data, "Retry Backoff Seconds", 0.001)
+    monkeypatch.setitem(config_data, "Circuit Failure Threshold", 2)
+    monkeypatch.setitem(config_data["Fetch Timeouts"], "test", [1, 1])
+    monkeypatch.setattr("fetch_pipeline.breakers", {})
+    session = requests.Session()
+    session.mount(news_host, FakeDataSourceAdapter())
+    data = resilient_get(session, news_host + "/v2/everything", "test")
+    assert data.status_code == 200, "Test for successful request: failed"
+    adapter = FakeDataSourceAdapter(error_rate=1)
+    session.mount(news_host, adapter)
+    for _ in range(2):
+        try:
+            resilient_get(session, news_host + "/v2/everything", "test")
+            raised = False
+        except requests.HTTPError:
+            raised = True
+        assert raised, "Test for error raised after retries: failed"
+    try:
+        resilient_get(session, news_host + "/v2/everything", "test")
+        raised = False
+    except CircuitOpenError:
+        raised = True
+    assert raised, "Test for circuit opened after repeated failures: failed"
+    monkeypatch.setitem(config_data, "Circuit Reset Seconds", 0)
+    adapter.error_rate = 0
+    resilient_get(session, news_host + "/v2/everything", "test")
+    assert get_breaker("test").opened_at is None, "Test for circuit closed by trial: failed"
+
+    def cut_short(url: str, params: dict = None, timeout=None) -> None:
+        raise requests.exceptions.ChunkedEncodingError("cut short")
+
+    for _ in range(2):
+        get_breaker("test").record_failure()
+    monkeypatch.setattr(session, "get", cut_short)
+    try:
+        resilient_get(session, news_host + "/v2/everything", "test")
+        raised = False
+    except requests.exceptions.ChunkedEncodingError:
+        raised = True
+    assert raised and not get_breaker("test").trial, "Test for failed trial ended: failed"
+    assert isinstance(data, requests.Response), "Test for return type of resilient_get: failed"
+
+
+def test_serve_stale() -> None:
+    """
+    This function is used to test the function serve_stale.
+    """
+    held = []
+
+    @serve_stale(lambda: held)
+    def fetch() -> list:
+        raise requests.ConnectionError("failed")
+
+    try:
+        fetch()
+        raised = False
+    except requests.ConnectionError:
+        raised = True
+    assert raised, "Test for error raised with no good data: failed"
+    held.append("article")
+    data = fetch()
+    assert data == ["article"], "Test for last good data served: failed"
+
+    @serve_stale(lambda: held)
+    def parse(error: Exception) -> list:
+        raise error
+
+    assert parse(MalformedResponseError("no articles")) == ["article"], \
+        "Test for last good data served for a malformed response: failed"
+    try:
+        parse(KeyError("articles"))
+        raised = False
+    except KeyError:
+        raised = True
+    assert raised, "Test for other errors raised: failed"
+    assert isinstance(data, list), "Test for return type of serve_stale function: failed"
+
+
+def test_response_field() -> None:
+    """
+    This function is used to test the function response_field.
+    """
+    response = requests.Response()
+    response._content = b'{"data": [1, 2]}'
+    data = response_field(response, "data", "test")
+    assert data == [1, 2], "Test for value of field: failed"
+    try:
+        response_field(response, "articles", "test")
+        raised = False
+    except MalformedResponseError:
+        raised = True
+    assert raised, "Test for missing field: failed"
+    response._content = b"<html>"
+    try:
+        response_field(response, "data", "test")
+        raised = False
+    except json.JSONDecodeError:
+        raised = True
+    assert raised, "Test for body which isn't JSON: failed"
+    assert isinstance(data, list), "Test for return type of response_field: failed"
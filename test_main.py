@@ -4,12 +4,89 @@ This is the test module with test functions to test the functions in main.py
 Each function is tested with some test cases and the return type is tested as well.
 """
 
+import pytest
 from main import *
+import covid_news_handling
+import dashboard_cache
+import update_scheduler
 
-def test_remove_update_toast() -> None:
+
+# The app's requests are answered by the stand in APIs rather than the network
+pytestmark = pytest.mark.usefixtures("fake_sources")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """
+    This fixture points the cache at a new file for the test, restoring the connection in use before
+    it afterwards, such that the test neither changes the app's cache nor depends on other tests.
+    """
+    monkeypatch.setattr("dashboard_cache.connection", dashboard_cache.connection)
+    monkeypatch.setattr("dashboard_cache.connection_pid", dashboard_cache.connection_pid)
+    monkeypatch.setattr("main.updates_version", None)
+    connection = dashboard_cache.open_cache(str(tmp_path / "cache.db"))
+    yield connection
+    connection.close()
+
+
+def test_remove_update_toast(cache) -> None:
     """
     This function is used to test the function remove_update_toast.
     """
+    updates.add(UpdateRecord("test_update", "Update of News data at: 18:45", "News", "18:45", False))
     data = remove_update_toast("test_update", "18.45")
     assert data is None, "Test for return type of remove_update_toast: failed"
-    assert len(updates) == 0, "Test for proper removal of updates: failed"
+    assert "test_update" not in updates, "Test for proper removal of updates: failed"
+
+
+def test_stream_events(cache, tmp_path, monkeypatch) -> None:
+    """
+    This function is used to test the function stream_events.
+    """
+    monkeypatch.setitem(update_scheduler.config_data, "Scheduler Lock File",
+                        str(tmp_path / "scheduler.lock"))
+    # The initial data isn't gathered, as it would be saved after the test's cache is closed
+    monkeypatch.setattr("main.started", True)
+    data = next(stream_events())
+    assert b"event: metrics" in data and b"event: news" in data, "Test for resources sent: failed"
+    if not config_data["Push Updates"]:
+        assert app.test_client().get("/events").status_code == 404, \
+            "Test for stream refused with push updates disabled: failed"
+    assert isinstance(data, bytes), "Test for return type of stream_events: failed"
+
+
+def test_handle_dashboard_request(cache) -> None:
+    """
+    This function is used to test the function handle_dashboard_request.
+    """
+    data = handle_dashboard_request({"two": "registry test", "update": "23:59", "news": "news"})
+    assert data is None, "Test for return type of handle_dashboard_request: failed"
+    assert "registry test - News" in updates, "Test for addition of update: failed"
+    handle_dashboard_request({"two": "registry test", "update": "23:58", "covid-data": "covid"})
+    assert "registry test - Covid" not in updates, "Test for duplicate update name: failed"
+    handle_dashboard_request({"update_item": "registry test - News"})
+    assert "registry test - News" not in updates, "Test for cancellation of update: failed"
+    # An update of the same title shared by another process since this one last loaded updates
+    dashboard_cache.save_update({"title": "shared test - Covid", "kind": "Covid",
+                                 "content": "Update of Covid data at: 10:00",
+                                 "update_time": "10:00", "repeat": False, "run_at": None})
+    handle_dashboard_request({"two": "shared test", "update": "23:57", "covid-data": "covid"})
+    assert updates.get("shared test - Covid").update_time == "10:00", \
+        "Test for update shared by another process kept: failed"
+    handle_dashboard_request({"update_item": "shared test - Covid"})
+
+
+def test_schedule_update(monkeypatch) -> None:
+    """
+    This function is used to test the function schedule_update.
+    """
+    monkeypatch.setattr("covid_news_handling.update_news", lambda covid_terms: None)
+    # An update requested without a time which reaches the scheduler owner a moment later
+    run_at = time.time() - 1
+    record = UpdateRecord("immediate test - News", "Repeating update of News data at: 00:00:00",
+                          "News", time.strftime("%H:%M:%S", time.gmtime(run_at)), True, run_at)
+    data = schedule_update(record)
+    assert covid_news_handling.updates[record.title].time == run_at, \
+        "Test for update requested without a time run at once: failed"
+    cancel_news_update(record.title)
+    assert data is None, "Test for return type of schedule_update: failed"
@@ -0,0 +1,74 @@
+"""
+This is the test module with test functions to test the functions in near_duplicates.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from near_duplicates import *
+
+story = ("UK records 50,000 new Covid cases as Omicron spreads",
+         "The UK has recorded 50,000 new cases of Covid-19, the highest figure since January.")
+copy = ("UK records 50,000 new Covid cases as Omicron spreads - BBC News",
+        "The UK has recorded 50,000 new cases of Covid-19, the highest figure since January")
+other = ("Omicron: booster jabs offered to all adults by end of January",
+         "Every adult in England will be offered a booster by the end of January, the PM says.")
+
+
+def test_signature() -> None:
+    """
+    This function is used to test the functions signature and similarity.
+    """
+    data = signature(*story)
+    assert len(data) == bands * rows, "Test for length of signature: failed"
+    assert similarity(data, signature(*story)) == 1, "Test for identical articles: failed"
+    assert similarity(data, signature(*copy)) >= config_data["Near Duplicate Similarity"], \
+        "Test for syndicated copy similar: failed"
+    assert similarity(data, signature(*other)) < config_data["Near Duplicate Similarity"], \
+        "Test for different story dissimilar: failed"
+    assert isinstance(data, tuple), "Test for return type of signature: failed"
+
+
+def test_band_layout() -> None:
+    """
+    This function is used to test the function band_layout.
+    """
+    data = band_layout(0.6)
+    assert data[0] * data[1] <= signature_limit, "Test for signature within limit: failed"
+    shared = 0.6 ** data[1]
+    assert 1 - (1 - shared) ** data[0] - data[0] * shared * (1 - shared) ** (data[0] - 1) >= \
+        bucket_recall, "Test for recall of articles sharing two buckets at threshold: failed"
+    assert band_layout(0.9)[1] > data[1], "Test for more rows at higher threshold: failed"
+    assert band_layout(0) == (signature_limit, 1), "Test for single value bands: failed"
+    assert isinstance(data, tuple), "Test for return type of band_layout: failed"
+
+
+def test_sketch() -> None:
+    """
+    This function is used to test the functions sketch and sketch_similarity.
+    """
+    data = sketch(*story)
+    assert len(data.band_keys) == bands, "Test for band key per band: failed"
+    assert sketch_similarity(data.values, sketch(*story).values) == 1, \
+        "Test for identical articles: failed"
+    for article in (copy, other):
+        assert sketch_similarity(data.values, sketch(*article).values) == \
+            similarity(signature(*story), signature(*article)), \
+            "Test for similarity matching that of the full signatures: failed"
+    assert isinstance(data, Sketch), "Test for return type of sketch: failed"
+
+
+def test_match() -> None:
+    """
+    This function is used to test the functions add and match.
+    """
+    index = NearDuplicateIndex()
+    index.add(story[0], sketch(*story))
+    data = index.match(sketch(*copy))
+    assert data == story[0], "Test for near duplicate found: failed"
+    assert index.match(sketch(*other)) is None, "Test for different story not found: failed"
+    index.add(story[0], sketch(*other))
+    assert len(index) == 1, "Test for article added once: failed"
+    index.add(other[0], sketch(*other))
+    assert index.match(sketch(*other)) == other[0], \
+        "Test for article found once added after not being found: failed"
+    assert isinstance(data, str), "Test for return type of match: failed"
@@ -0,0 +1,54 @@
+"""
+This is the test module with test functions to test the functions in news_aggregation.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from news_aggregation import *
+
+
+def test_article_keys() -> None:
+    """
+    This function is used to test the functions article_keys, normalise_url and normalise_title.
+    """
+    data = article_keys(Article("Covid: cases rise!", url="https://www.example.com/a/?b=1"))
+    assert data == article_keys(Article("COVID cases  rise", url="http://example.com/a")), \
+        "Test for copies of an article matched: failed"
+    assert article_keys(Article("Other"))[0] not in data, "Test for other article: failed"
+    assert article_keys(Article("")) == [], "Test for article with no URL or title: failed"
+    assert isinstance(data, list), "Test for return type of article_keys: failed"
+
+
+def test_merge_rankings() -> None:
+    """
+    This function is used to test the function merge_rankings.
+    """
+    first = [Article("A"), Article("B"), Article("C")]
+    second = [Article("D"), Article("c.")]
+    data = merge_rankings([first, second])
+    assert [article.title for article in data] == ["C", "A", "D", "B"], \
+        "Test for articles found by both queries ranked first: failed"
+    assert merge_rankings([]) == [], "Test for no queries: failed"
+    assert isinstance(data, list), "Test for return type of merge_rankings: failed"
+
+
+def test_run_queries() -> None:
+    """
+    This function is used to test the function run_queries.
+    """
+    def fetch(terms, page, language):
+        if terms == "fail":
+            raise ValueError(terms)
+        return [Article(terms + language + str(page))]
+
+    queries = [{"terms": "a", "language": "en"}, {"terms": "fail", "language": "en"},
+               {"terms": "b", "language": "de"}]
+    data = run_queries(fetch, queries, 2)
+    assert data == [[Article("aen2")], [Article("bde2")]], \
+        "Test for results of successful queries in order: failed"
+    try:
+        run_queries(fetch, [queries[1]])
+        assert False, "Test for error of every query failing raised: failed"
+    except ValueError:
+        pass
+    assert isinstance(data, list), "Test for return type of run_queries: failed"
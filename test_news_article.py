@@ -0,0 +1,42 @@
+"""
+This is the test module with test functions to test the functions in news_article.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from news_article import *
+
+article = {"source": {"id": None, "name": "BBC News"}, "author": "BBC News",
+           "title": "UK records 50,000 new Covid cases",
+           "description": "The highest since January.",
+           "url": "https://www.bbc.co.uk/news/uk-1", "urlToImage": None,
+           "publishedAt": "2021-12-01T00:00:00Z", "content": "The UK has recorded..."}
+
+
+def test_from_json() -> None:
+    """
+    This function is used to test the function from_json.
+    """
+    data = Article.from_json(article)
+    assert data.title == "UK records 50,000 new Covid cases", "Test for title: failed"
+    assert data.source == "BBC News", "Test for source: failed"
+    assert data.content == "The highest since January.\n" + "Article from: " + article["url"], \
+        "Test for displayed content: failed"
+    assert not hasattr(data, "__dict__"), "Test for article held without a dictionary: failed"
+    assert Article.from_json({"title": "Title", "description": None, "url": "url"}).content == \
+        "\nArticle from: url", "Test for article without description: failed"
+    assert isinstance(data, Article), "Test for return type of from_json: failed"
+
+
+def test_to_json() -> None:
+    """
+    This function is used to test the function to_json.
+    """
+    data = Article.from_json(article).to_json()
+    assert data == {"source": {"name": "BBC News"}, "title": article["title"],
+                    "description": article["description"], "url": article["url"]}, \
+        "Test for fields kept: failed"
+    assert Article.from_json(data) == Article.from_json(article), "Test for round trip: failed"
+    assert len({Article.from_json(data), Article.from_json(article)}) == 1, \
+        "Test for equal articles hashed alike: failed"
+    assert isinstance(data, dict), "Test for return type of to_json: failed"
@@ -0,0 +1,54 @@
+"""
+This is the test module with test functions to test the functions in update_registry.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from update_registry import *
+
+record = UpdateRecord("Morning - Covid", "Update of Covid data at: 10:10", "Covid", "10:10", False)
+
+
+def test_add() -> None:
+    """
+    This function is used to test the function add.
+    """
+    registry = UpdateRegistry()
+    data = registry.add(record)
+    assert data is True, "Test for addition of update: failed"
+    assert registry.add(record._replace(content="Other")) is False, \
+        "Test for duplicate title rejected: failed"
+    assert "Morning - Covid" in registry and len(registry) == 1, "Test for lookup by title: failed"
+    assert registry.get("Morning - Covid") == record, "Test for record kept: failed"
+    assert isinstance(data, bool), "Test for return type of add: failed"
+
+
+def test_remove() -> None:
+    """
+    This function is used to test the functions remove and set_job.
+    """
+    registry = UpdateRegistry()
+    registry.add(record)
+    registry.set_job("Morning - Covid", ("Covid", "Morning - Covid"))
+    data = registry.remove("Morning - Covid")
+    assert data.job == ("Covid", "Morning - Covid"), "Test for job of removed update: failed"
+    assert registry.remove("Morning - Covid") is None, "Test for removal of missing update: failed"
+    assert len(registry) == 0, "Test for proper removal of update: failed"
+    assert isinstance(data, UpdateRecord), "Test for return type of remove: failed"
+
+
+def test_toasts() -> None:
+    """
+    This function is used to test the function toasts.
+    """
+    registry = UpdateRegistry()
+    registry.add(record)
+    data = registry.toasts()
+    assert data[0] == [{"title": "Morning - Covid", "content": "Update of Covid data at: 10:10"}], \
+        "Test for toasts of updates: failed"
+    registry.set_job("Morning - Covid", ("Covid", "Morning - Covid"))
+    assert registry.toasts() == data, "Test for toasts unchanged by scheduling: failed"
+    registry.remove("Morning - Covid")
+    assert registry.toasts()[0] == [] and registry.toasts()[1] != data[1], \
+        "Test for toasts rebuilt on change: failed"
+    assert isinstance(data, tuple), "Test for return type of toasts: failed"
@@ -0,0 +1,115 @@
+"""
+This is the test module with test functions to test the functions in update_scheduler.py
+
+Each function is tested with some test cases and the return type is tested as well.
+"""
+
+from update_scheduler import *
+
+
+def test_next_time_at() -> None:
+    """
+    This function is used to test the function next_time_at.
+    """
+    data = next_time_at("10:10")
+    assert time.time() < data <= time.time() + 24 * 3600, "Test for time within a day: failed"
+    assert time.gmtime(data).tm_hour == 10 and time.gmtime(data).tm_min == 10, \
+        "Test for matching time of day: failed"
+    assert time.gmtime(next_time_at("10:10:30")).tm_sec == 30, "Test for seconds: failed"
+    assert isinstance(data, float), "Test for return type of next_time_at: failed"
+
+
+def test_schedule_job() -> None:
+    """
+    This function is used to test the function schedule_job.
+    """
+    ran = threading.Event()
+    data = schedule_job("test job", time.time() + 0.05, ran.set)
+    assert "test job" in jobs, "Test for addition of job: failed"
+    assert ran.wait(5), "Test for job run by the dispatcher: failed"
+    assert "test job" not in jobs, "Test for removal of job once run: failed"
+    assert isinstance(data, sched.Event), "Test for return type of schedule_job: failed"
+
+
+def test_dispatch_job() -> None:
+    """
+    This function is used to test the function dispatch_job.
+    """
+    release = threading.Event()
+    ran = threading.Event()
+    schedule_job("test slow job", time.time(), release.wait, argument=(5,))
+    schedule_job("test job", time.time() + 0.05, ran.set)
+    assert ran.wait(2), "Test for job run while a slow job runs: failed"
+    release.set()
+    schedule_job("test job", time.time() + 60, ran.set)
+    # An earlier job of the same name falling due after being replaced
+    replaced = threading.Event()
+    data = dispatch_job("test job", replaced.set, (), number=-1)
+    assert "test job" in jobs, "Test for job replaced by one of the same name kept: failed"
+    assert replaced.wait(2), "Test for replaced job still run: failed"
+    cancel_job("test job")
+    assert data is None, "Test for return type of dispatch_job: failed"
+
+
+def test_cancel_job() -> None:
+    """
+    This function is used to test the function cancel_job.
+    """
+    ran = threading.Event()
+    schedule_job("test job", time.time() + 0.1, ran.set)
+    data = cancel_job("test job")
+    assert data is None, "Test for return type of cancel_job: failed"
+    assert "test job" not in jobs, "Test for removal of job: failed"
+    assert not ran.wait(0.3), "Test for cancelled job not run: failed"
+
+
+def test_schedule_interval_job() -> None:
+    """
+    This function is used to test the function schedule_interval_job.
+    """
+    runs = []
+    data = schedule_interval_job("test repeating job", 0.001, runs.append, argument=(1,))
+    time.sleep(0.5)
+    cancel_job("test repeating job")
+    count = len(runs)
+    assert count >= 2, "Test for job run repeatedly: failed"
+    time.sleep(0.2)
+    assert len(runs) == count, "Test for cancellation of repeating job: failed"
+    assert isinstance(data, sched.Event), "Test for return type of schedule_interval_job: failed"
+
+
+def test_schedule_daily_job() -> None:
+    """
+    This function is used to test the function schedule_daily_job.
+    """
+    data = schedule_daily_job("test daily job", "10:10", lambda: None, jitter=5)
+    assert jobs["test daily job"].argument[3] == Recurrence(24 * 3600, 5), \
+        "Test for daily recurrence: failed"
+    assert 0 <= data.time - next_time_at("10:10") <= 5, "Test for jitter bounds: failed"
+    cancel_job("test daily job")
+    run_at = time.time() - 2
+    data = schedule_daily_job("test daily job", time.strftime("%H:%M:%S", time.gmtime(run_at)),
+                              lambda: None, run_at=run_at)
+    assert data.time == run_at, "Test for first run at the given time, though passed: failed"
+    cancel_job("test daily job")
+    assert isinstance(data, sched.Event), "Test for return type of schedule_daily_job: failed"
+
+
+def test_claim_scheduler(tmp_path, monkeypatch) -> None:
+    """
+    This function is used to test the functions claim_scheduler and is_scheduler_owner.
+    """
+    monkeypatch.setattr("update_scheduler.owner_file", None)
+    lock_file = str(tmp_path / "scheduler.lock")
+    data = claim_scheduler(lock_file)
+    assert data and is_scheduler_owner(), "Test for scheduler claimed: failed"
+    if fcntl is not None:
+        other_file = open(lock_file, "a")
+        try:
+            fcntl.flock(other_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            locked = False
+        except OSError:
+            locked = True
+        other_file.close()
+        assert locked, "Test for scheduler held by a single owner: failed"
+    assert isinstance(data, bool), "Test for return type of claim_scheduler: failed"
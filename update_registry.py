@@ -0,0 +1,149 @@
+"""
+This module holds the scheduled updates shown on the dashboard in a registry keyed by title, such
+that looking an update up, detecting a duplicate title and cancelling or removing an update each
+take a single dictionary operation however many updates are scheduled. The toasts displayed on the
+dashboard are built from the registry only when it changes, and its version lets rendered pages and
+API responses be reused without comparing every update.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+"""
+
+import logging
+import threading
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateRecord(NamedTuple):
+    """
+    A record of a scheduled update.
+
+    Attributes:
+        title (str): The title of the update's toast, e.g. Morning - Covid
+        content (str): The content of the update's toast
+        kind (str): The kind of the update, either Covid or News
+        update_time (str): The time of day the update is run at in the form 12:15
+        repeat (bool): Whether the update is repeated daily
+        run_at (float): The time of the update's first run in seconds since the epoch for updates
+            requested without a time, None for those run at the next update_time
+        job: The name of the update's job in this process' scheduler, None should the update not
+            be scheduled by this process
+    """
+    title: str
+    content: str
+    kind: str
+    update_time: str
+    repeat: bool
+    run_at: float = None
+    job: tuple = None
+
+
+class UpdateRegistry:
+    """
+    The scheduled updates keyed by their titles, in the order they were added.
+
+    Attributes:
+        records (dict): A dictionary mapping the title of each update to its record
+        version (int): A count of the changes made to the registry
+        lock (threading.Lock): A lock preventing the registry being changed concurrently
+    """
+
+    def __init__(self) -> None:
+        self.records = {}
+        self.version = 0
+        self.lock = threading.Lock()
+        self._toasts = []
+        self._toasts_version = 0
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, title: str) -> bool:
+        return title in self.records
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.records.values()))
+
+    def get(self, title: str) -> UpdateRecord:
+        """
+        A function that gives the record of an update.
+
+        Args:
+            title (str): The title of the update
+
+        Returns:
+            record (UpdateRecord): The update's record, None should there be no such update
+        """
+        return self.records.get(title)
+
+    def add(self, record: UpdateRecord) -> bool:
+        """
+        A function that adds an update to the registry unless its title is already in use.
+
+        Args:
+            record (UpdateRecord): The update's record
+
+        Returns:
+            added (bool): Whether the update was added, False should its title be a duplicate
+        """
+        with self.lock:
+            if record.title in self.records:
+                logger.warning("Duplicate update title: %s", record.title)
+                return False
+            self.records[record.title] = record
+            self.version += 1
+        return True
+
+    def set_job(self, title: str, job) -> None:
+        """
+        A function that records the name of the scheduler job running an update.
+
+        Args:
+            title (str): The title of the update
+            job: The name of the update's job, None should it no longer be scheduled
+
+        Returns:
+            None
+        """
+        with self.lock:
+            record = self.records.get(title)
+            if record is not None:
+                self.records[title] = record._replace(job=job)
+
+    def remove(self, title: str) -> UpdateRecord:
+        """
+        A function that removes an update from the registry.
+
+        Args:
+            title (str): The title of the update
+
+        Returns:
+            record (UpdateRecord): The removed update's record, None should there be no such update
+        """
+        with self.lock:
+            record = self.records.pop(title, None)
+            if record is not None:
+                self.version += 1
+        return record
+
+    def toasts(self) -> tuple:
+        """
+        A function that gives the toasts of the updates as displayed on the dashboard, rebuilt only
+        should the registry have changed, along with the version they were built from.
+
+        Args:
+            None
+
+        Returns:
+            toasts (list): A list of dictionaries containing the title and content of each update
+            version (int): The version of the registry the toasts were built from
+        """
+        with self.lock:
+            if self._toasts_version != self.version:
+                self._toasts = [{"title": record.title, "content": record.content}
+                                for record in self.records.values()]
+                self._toasts_version = self.version
+            return self._toasts, self.version
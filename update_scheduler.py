@@ -0,0 +1,365 @@
+"""
+This module provides the single scheduler shared by the whole project. Jobs are held by name in one
+sched queue ordered by their wall clock time. A background dispatcher thread hands each job to a
+pool of worker threads as it becomes due, such that scheduled updates never run within, or wait
+upon, a user's request, and a slow job, such as a request being retried, never holds up the others.
+Jobs may recur, either daily at a time of day or every given number of minutes, in which case the
+next run is queued from the previous scheduled time as each run falls due.
+Where the dashboard is served by several worker processes only one of them, the scheduler owner,
+runs the scheduled updates; ownership is held through a lock on the configured scheduler lock file,
+which is released when the owner exits such that another process can take over.
+
+Attributes:
+    logger (logging): An instance of the project's logging
+    jobs (dict): A dictionary mapping the name of each scheduled job to its sched event
+    job_numbers (itertools.count): A count giving each scheduled job a unique number, such that a
+        job can tell whether it has since been replaced by another of the same name
+    wake (threading.Event): An event set whenever the queue changes to wake the dispatcher
+    schedule (sched): The project's scheduler, timed by the wall clock
+    dispatcher (threading.Thread): The thread handing due jobs to the workers, None until first
+        started
+    workers (ThreadPoolExecutor): The pool of threads running due jobs, None until first started
+    lock (threading.Lock): A lock preventing the jobs, dispatcher and workers being changed
+        concurrently
+    owner_file (file): The scheduler lock file held open while this process owns the scheduler,
+        None should it not
+    config_data (dict): A dictionary containing all the configurable variables from the config file
+"""
+
+import logging
+import json
+import itertools
+import os
+import random
+import sched
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from dashboard_metrics import describe, observe, increment
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+jobs = {}
+job_numbers = itertools.count()
+wake = threading.Event()
+dispatcher = None
+workers = None
+lock = threading.Lock()
+owner_file = None
+with open('config.json', 'r') as f:
+    config_data = json.load(f)
+describe("scheduled_job_seconds", "Duration of scheduled jobs")
+describe("scheduled_job_lag_seconds", "Delay between a job falling due and it being run")
+describe("scheduled_job_errors_total", "Errors raised by scheduled jobs")
+
+
+def wait_for_next_job(delay: float) -> None:
+    """
+    A function used by the scheduler to wait until its next job is due, returning early should the
+    queue change in the meantime such that an earlier job can be run on time.
+
+    Args:
+        delay (float): The time in seconds until the next job is due
+
+    Returns:
+        None
+    """
+    if wake.wait(delay):
+        wake.clear()
+
+
+schedule = sched.scheduler(time.time, wait_for_next_job)
+
+
+class Recurrence(NamedTuple):
+    """
+    A record of how often a recurring job is run.
+
+    Attributes:
+        interval (float): The time in seconds between runs
+        jitter (float): The most time in seconds each run may be randomly delayed by, used to
+            spread out jobs which would otherwise all run at once
+    """
+    interval: float
+    jitter: float = 0
+
+
+def next_time_at(update_interval: str) -> float:
+    """
+    A function that gives the next time of day, in UTC, matching the given hours, minutes and
+    optionally seconds. Times of day which have already passed today are given for tomorrow.
+
+    Args:
+        update_interval (str): The time of day in the form 12:15 or 12:15:30
+
+    Returns:
+        run_at (float): The matching time in seconds since the epoch
+    """
+    parts = [int(part) for part in update_interval.split(":")]
+    hour, minute, second = (parts + [0])[:3]
+    now = time.time()
+    run_at = now - now % (24 * 3600) + hour * 3600 + minute * 60 + second
+    if run_at <= now:
+        run_at += 24 * 3600
+    return run_at
+
+
+def dispatch_job(name, action, argument: tuple, recurrence: Recurrence = None,
+                 run_at: float = None, number: int = None) -> None:
+    """
+    A function run by the dispatcher as a job falls due, which hands the job to the workers to be
+    run. A recurring job has its next run queued, while any other job is removed from the jobs
+    unless it has since been replaced by another of the same name.
+
+    Args:
+        name: The name of the job
+        action (function): The function to be run
+        argument (tuple): The arguments to be passed to the function
+        recurrence (Recurrence): How often the job recurs; defaults to the job not recurring
+        run_at (float): The time the job was scheduled for, before any jitter was added
+        number (int): The unique number the job was given when scheduled
+
+    Returns:
+        None
+    """
+    if recurrence is None:
+        with lock:
+            event = jobs.get(name)
+            if event is not None and event.argument[5] == number:
+                del jobs[name]
+    else:
+        # Counts on from the scheduled time rather than the current time to prevent drift,
+        # skipping any runs which have been missed
+        next_run_at = run_at + recurrence.interval
+        now = time.time()
+        if next_run_at <= now:
+            next_run_at += (now - next_run_at) // recurrence.interval * recurrence.interval
+            next_run_at += recurrence.interval
+        schedule_job(name, next_run_at, action, argument, recurrence)
+    workers.submit(run_job, name, action, argument, run_at)
+
+
+def run_job(name, action, argument: tuple, run_at: float = None) -> None:
+    """
+    A function run by a worker which runs a due job, logging rather than raising any error such
+    that one failing job doesn't affect the others.
+
+    Args:
+        name: The name of the job
+        action (function): The function to be run
+        argument (tuple): The arguments to be passed to the function
+        run_at (float): The time the job was scheduled for, before any jitter was added
+
+    Returns:
+        None
+    """
+    logger.info("Running job %s", name)
+    # Jobs are measured by their kind, e.g. Covid or News, rather than by their unique names
+    kind = name[0] if isinstance(name, tuple) else str(name)
+    start = time.perf_counter()
+    if run_at is not None:
+        observe("scheduled_job_lag_seconds", max(time.time() - run_at, 0), kind=kind)
+    try:
+        action(*argument)
+    except Exception:
+        logger.exception("Job %s failed", name)
+        increment("scheduled_job_errors_total", kind=kind)
+    observe("scheduled_job_seconds", time.perf_counter() - start, kind=kind)
+
+
+def schedule_job(name, run_at: float, action, argument: tuple = (),
+                 recurrence: Recurrence = None) -> sched.Event:
+    """
+    A function that schedules a job to be run by the dispatcher at the given time, replacing any
+    job already scheduled with the same name.
+
+    Args:
+        name: The name of the job, any hashable value unique to it
+        run_at (float): The time for the job to be run in seconds since the epoch
+        action (function): The function to be run
+        argument (tuple): The arguments to be passed to the function
+        recurrence (Recurrence): How often the job recurs; defaults to the job not recurring
+
+    Returns:
+        event (sched.Event): The scheduled event
+    """
+    logger.info("Job %s scheduled for %s", name, time.strftime("%H:%M:%S", time.gmtime(run_at)))
+    delay = random.uniform(0, recurrence.jitter) if recurrence and recurrence.jitter else 0
+    with lock:
+        if name in jobs:
+            try:
+                schedule.cancel(jobs[name])
+            except ValueError:
+                pass
+        event = schedule.enterabs(run_at + delay, 1, dispatch_job,
+                                  argument=(name, action, argument, recurrence, run_at,
+                                            next(job_numbers)))
+        jobs[name] = event
+    start_dispatcher()
+    wake.set()
+    return event
+
+
+def schedule_daily_job(name, update_interval: str, action, argument: tuple = (),
+                       jitter: float = 0, run_at: float = None) -> sched.Event:
+    """
+    A function that schedules a job to be run every day at the given time of day, in UTC.
+
+    Args:
+        name: The name of the job, any hashable value unique to it
+        update_interval (str): The time of day in the form 12:15 or 12:15:30
+        action (function): The function to be run
+        argument (tuple): The arguments to be passed to the function
+        jitter (float): The most time in seconds each run may be randomly delayed by
+        run_at (float): The time of the first run in seconds since the epoch, run at once should it
+            have passed; defaults to the next time matching update_interval
+
+    Returns:
+        event (sched.Event): The scheduled event for the first run
+    """
+    if run_at is None:
+        run_at = next_time_at(update_interval)
+    return schedule_job(name, run_at, action, argument, Recurrence(24 * 3600, jitter))
+
+
+def schedule_interval_job(name, minutes: float, action, argument: tuple = (),
+                          jitter: float = 0) -> sched.Event:
+    """
+    A function that schedules a job to be run every given number of minutes, starting that number
+    of minutes from now.
+
+    Args:
+        name: The name of the job, any hashable value unique to it
+        minutes (float): The number of minutes between runs
+        action (function): The function to be run
+        argument (tuple): The arguments to be passed to the function
+        jitter (float): The most time in seconds each run may be randomly delayed by
+
+    Returns:
+        event (sched.Event): The scheduled event for the first run
+    """
+    return schedule_job(name, time.time() + minutes * 60, action, argument,
+                        Recurrence(minutes * 60, jitter))
+
+
+def cancel_job(name) -> None:
+    """
+    A function used to cancel a scheduled job. Jobs which have already run are ignored.
+
+    Args:
+        name: The name of the job to be cancelled
+
+    Returns:
+        None
+    """
+    logger.info("Job %s cancelled", name)
+    with lock:
+        event = jobs.pop(name, None)
+        if event is not None:
+            try:
+                schedule.cancel(event)
+            except ValueError:
+                pass
+    wake.set()
+
+
+def is_scheduled(name) -> bool:
+    """
+    A function that gives whether a job is scheduled. A job which doesn't recur is no longer
+    scheduled once it has fallen due, unless another of the same name has since been scheduled.
+
+    Args:
+        name: The name of the job
+
+    Returns:
+        scheduled (bool): Whether the job is scheduled
+    """
+    with lock:
+        return name in jobs
+
+
+def run_dispatcher() -> None:
+    """
+    A function run by the dispatcher thread which hands jobs to the workers as they become due and
+    otherwise waits for new jobs to be scheduled.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    while True:
+        schedule.run()
+        wake.wait()
+        wake.clear()
+
+
+def start_dispatcher() -> threading.Thread:
+    """
+    A function that starts the dispatcher thread, and the workers it hands jobs to, should they not
+    already be running.
+
+    Args:
+        None
+
+    Returns:
+        dispatcher (threading.Thread): The dispatcher thread
+    """
+    global dispatcher
+    global workers
+    with lock:
+        if workers is None:
+            workers = ThreadPoolExecutor(max_workers=config_data["Scheduler Workers"],
+                                         thread_name_prefix="scheduler-worker")
+        if dispatcher is None or not dispatcher.is_alive():
+            logger.info("Starting scheduler dispatcher")
+            dispatcher = threading.Thread(target=run_dispatcher, name="scheduler", daemon=True)
+            dispatcher.start()
+    return dispatcher
+
+
+def claim_scheduler(lock_file: str = None) -> bool:
+    """
+    A function that attempts to make this process the scheduler owner, the one process which runs
+    the scheduled updates. Where file locks aren't supported every process is taken to be the only
+    one and so owns the scheduler.
+
+    Args:
+        lock_file (str): The name of the lock file; defaults to the configured Scheduler Lock File
+
+    Returns:
+        owner (bool): Whether this process owns the scheduler
+    """
+    global owner_file
+    if owner_file is not None:
+        return True
+    if lock_file is None:
+        lock_file = config_data["Scheduler Lock File"]
+    claimed_file = open(lock_file, "a")
+    if fcntl is not None:
+        try:
+            fcntl.flock(claimed_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            claimed_file.close()
+            return False
+    logger.info("Process %s now owns the scheduler", os.getpid())
+    owner_file = claimed_file
+    return True
+
+
+def is_scheduler_owner() -> bool:
+    """
+    A function that gives whether this process owns the scheduler.
+
+    Args:
+        None
+
+    Returns:
+        owner (bool): Whether this process owns the scheduler
+    """
+    return owner_file is not None